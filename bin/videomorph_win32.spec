@@ -13,6 +13,7 @@ added_files = [('../VERSION', ''),
                ('../share/videomorph/profiles/customized.xml', 'share/videomorph/profiles'),
                ('../share/videomorph/profiles/default.xml', 'share/videomorph/profiles'),
                ('../share/videomorph/sounds/successful.wav', 'share/videomorph/sounds'),
+               ('../share/videomorph/resources/videomorph.rcc', 'share/videomorph/resources'),
                ('../share/doc/videomorph/manual/manual_en.pdf', 'share/doc/videomorph/manual'),
                ('../share/doc/videomorph/manual/manual_es.pdf', 'share/doc/videomorph/manual'),
                ('../share/videomorph/translations/videomorph_es.qm', 'share/videomorph/translations'),
@@ -1,4 +1,4 @@
 #!/bin/bash
 
-# Generate the videomorph_qrc.py file from videomorph.qrc
-pyrcc5 -o ../videomorph/forms/videomorph_qrc.py videomorph.qrc
+# Generate the binary videomorph.rcc file from videomorph.qrc
+rcc -binary -o ../share/videomorph/resources/videomorph.rcc videomorph.qrc
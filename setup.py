@@ -62,7 +62,9 @@ COMMONS = dict(name=APP_NAME.lower(),
                keywords='multimedia, video conversion, common video formats')
 
 COMMONS_SETUPTOOLS = dict(
-    entry_points={'gui_scripts': ['videomorph = videomorph.main:main']})
+    entry_points={'gui_scripts': ['videomorph = videomorph.main:main'],
+                  'console_scripts': [
+                      'videomorph-cli = videomorph.converter.console:main']})
 
 
 LINUX_DATA_FILES = dict(
@@ -78,6 +80,9 @@ LINUX_DATA_FILES = dict(
         # App translation file
         (SYS_PATHS.i18n,
          [VM_PATHS.i18n + '/videomorph_es.qm']),
+        # App resources (icons)
+        (SYS_PATHS.resources,
+         [VM_PATHS.resources + '/videomorph.rcc']),
         # Default conversion profiles
         (SYS_PATHS.profiles,
          [VM_PATHS.profiles + '/default.xml',
@@ -107,6 +112,9 @@ WIN32_DATA_FILES = dict(
         # App translation file
         (SYS_PATHS.i18n,
          [VM_PATHS.i18n + '/videomorph_es.qm']),
+        # App resources (icons)
+        (SYS_PATHS.resources,
+         [VM_PATHS.resources + '/videomorph.rcc']),
         # Default conversion profiles
         (SYS_PATHS.profiles,
          [VM_PATHS.profiles + '/default.xml',
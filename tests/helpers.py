@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+# File name: helpers.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides support code shared by the tests."""
+
+import asyncio
+import sys
+import tempfile
+from os import chmod
+from os.path import join as join_path
+
+from videomorph.converter.engine import PROGRESS_ARGS
+
+# Fake prober hanging until it's killed
+HANGING_PROBER = '#!/bin/sh\nexec sleep 60\n'
+
+# Fake prober, logging its arguments to the file given and printing the
+# info of a video with a h264 and an aac streams
+LOGGING_PROBER = """#!/bin/sh
+echo "$@" >> '{0}'
+case "$*" in
+*-show_streams*)
+    echo '{{"format": {{"filename": "video", "duration": "60.0"}},
+"streams": [{{"codec_type": "video", "codec_name": "h264"}},
+{{"codec_type": "audio", "codec_name": "aac"}}]}}';;
+*)
+    echo '{{"format": {{"filename": "video", "duration": "60.0"}}}}';;
+esac
+"""
+
+# Fake conversion library, running its arguments after the progress
+# options with the Python interpreter
+PYTHON_LIBRARY = """#!/bin/sh
+shift {0}
+exec {1} "$@"
+""".format(len(PROGRESS_ARGS), sys.executable)
+
+
+def ts_packet(pcr=None):
+    """Return a MPEG-TS packet, with a PCR if given."""
+    if pcr is None:
+        return bytes([0x47, 0x01, 0x00, 0x10]) + b'\xff' * 184
+    adaptation = bytes([7, 0x10,
+                        (pcr >> 25) & 0xFF, (pcr >> 17) & 0xFF,
+                        (pcr >> 9) & 0xFF, (pcr >> 1) & 0xFF,
+                        (pcr & 1) << 7, 0])
+    return (bytes([0x47, 0x01, 0x00, 0x30]) + adaptation +
+            b'\xff' * (184 - len(adaptation)))
+
+
+def python_cmd(script):
+    """Return a build_cmd function running a Python script."""
+    return lambda threads: ['-c', script]
+
+
+class FakeExecutables:
+    """A temporary directory of fake executables, e.g. ffmpeg and ffprobe.
+
+    Other temporary files of a test can be written to it too. It's removed
+    by cleanup(), or when leaving the context if used in a with statement.
+    """
+
+    def __init__(self):
+        """Class initializer."""
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = self._tmp_dir.name
+
+    def __enter__(self):
+        """Return the directory as the context value."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Remove the directory."""
+        self.cleanup()
+
+    def join(self, *names):
+        """Return the path of a file in the directory."""
+        return join_path(self.path, *names)
+
+    def add(self, name, script):
+        """Write an executable script to the directory, return its path."""
+        path = self.join(name)
+        with open(path, 'w') as script_file:
+            script_file.write(script)
+        chmod(path, 0o755)
+
+        return path
+
+    def cleanup(self):
+        """Remove the directory."""
+        self._tmp_dir.cleanup()
+
+
+class FakeExecutablesTest:
+    """Base class for the tests using fake executables.
+
+    Every test gets a new FakeExecutables in self.fakes.
+    """
+
+    def setup(self):
+        """Setup method."""
+        self.fakes = FakeExecutables()
+
+    def teardown(self):
+        """Teardown method."""
+        self.fakes.cleanup()
+
+
+class EventLoopTest(FakeExecutablesTest):
+    """Base class for the tests running an asyncio event loop.
+
+    Every test gets a new event loop in self.loop.
+    """
+
+    def setup(self):
+        """Setup method."""
+        super(EventLoopTest, self).setup()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def teardown(self):
+        """Teardown method."""
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        super(EventLoopTest, self).teardown()
+
+    def run(self, coroutine):
+        """Run a coroutine in the test event loop."""
+        return self.loop.run_until_complete(coroutine)
+
+
+class ProbingTest(FakeExecutablesTest):
+    """Base class for the tests probing video files.
+
+    Every test gets a LOGGING_PROBER in self.prober, and a 120 seconds
+    long MPEG-TS video in self.video, its duration is read from the
+    header.
+    """
+
+    def setup(self):
+        """Setup method."""
+        super(ProbingTest, self).setup()
+        self.log_path = self.fakes.join('prober.log')
+        self.prober = self.fakes.add('ffprobe',
+                                     LOGGING_PROBER.format(self.log_path))
+        self.video = self.fakes.join('video.ts')
+        with open(self.video, 'wb') as video_file:
+            video_file.write(ts_packet(pcr=90000) + ts_packet(pcr=90000 * 121))
+
+    def prober_calls(self):
+        """Return the arguments of the prober runs."""
+        try:
+            with open(self.log_path) as log_file:
+                return log_file.read().splitlines()
+        except FileNotFoundError:
+            return []
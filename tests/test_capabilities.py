@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_capabilities.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for capabilities.py module."""
+
+from os import chmod
+
+import nose
+
+from helpers import FakeExecutablesTest
+from videomorph.converter.capabilities import LibraryCapabilities
+
+# Fake conversion library, listing its capabilities as ffmpeg does
+LIBRARY_SCRIPT = """#!/bin/sh
+case "$2" in
+-encoders)
+    echo "Encoders:"
+    echo " V..... = Video"
+    echo " ------"
+    echo " V..... libx264              libx264 H.264 / AVC"
+    echo " A..... aac                  AAC (Advanced Audio Coding)";;
+-muxers)
+    echo "File formats:"
+    echo " D. = Demuxing supported"
+    echo " --"
+    echo "  E mp4             MP4 (MPEG-4 Part 14)"
+    echo "  E matroska        Matroska";;
+-filters)
+    echo "Filters:"
+    echo "  T.. = Timeline support"
+    echo " ..C scale             V->V       Scale the input video size"
+    echo " TS. hflip             V->V       Horizontally flip the input"
+    echo " ... aresample         A->A       Resample audio data";;
+esac
+"""
+
+
+class TestLibraryCapabilities(FakeExecutablesTest):
+    """Class for testing LibraryCapabilities."""
+
+    def setup(self):
+        """Setup method."""
+        super(TestLibraryCapabilities, self).setup()
+        self.library_path = self.fakes.add('ffmpeg', LIBRARY_SCRIPT)
+        self.cache_path = self.fakes.join('capabilities.json')
+        self.capabilities = LibraryCapabilities(
+            library_path=self.library_path, cache_path=self.cache_path)
+
+    def test_inventory(self):
+        """Test the library capabilities are parsed."""
+        assert self.capabilities.encoders == {'libx264', 'aac'}
+        assert self.capabilities.muxers == {'mp4', 'matroska'}
+        assert self.capabilities.filters == {'scale', 'hflip', 'aresample'}
+
+    def test_missing(self):
+        """Test missing() on supported and unsupported params."""
+        assert not self.capabilities.missing(
+            ['-f', 'mp4', '-vcodec', 'libx264', '-c:a', 'copy',
+             '-vf', 'scale=640:-1,hflip', '-af', "aresample=async=1"])
+        assert self.capabilities.missing(
+            ['-f', 'webm', '-c:v', 'libvpx', '-acodec', 'aac',
+             '-filter_complex', "[0:v]scale=640:-1[v];[v]drawtext='a,b'"]) == [
+                 "Unknown muxer 'webm'",
+                 "Unknown encoder 'libvpx'",
+                 "No such filter: 'drawtext'"]
+
+    def test_persistence(self):
+        """Test the capabilities are read from the cache file."""
+        assert self.capabilities.encoders
+        # The library can't run now, but its size and mtime are the same
+        chmod(self.library_path, 0o644)
+        capabilities = LibraryCapabilities(library_path=self.library_path,
+                                           cache_path=self.cache_path)
+        assert capabilities.encoders == {'libx264', 'aac'}
+
+    def test_changed_library(self):
+        """Test the cache is invalid when the library changes."""
+        assert self.capabilities.encoders
+        self.fakes.add('ffmpeg', LIBRARY_SCRIPT.replace('libx264', 'libvpx'))
+        capabilities = LibraryCapabilities(library_path=self.library_path,
+                                           cache_path=self.cache_path)
+        assert capabilities.encoders == {'libvpx', 'aac'}
+
+    def test_missing_library(self):
+        """Test nothing is reported for a missing library."""
+        capabilities = LibraryCapabilities(
+            library_path=self.fakes.join('none'),
+            cache_path=self.cache_path)
+        assert not capabilities.missing(['-vcodec', 'libx265'])
+
+
+if __name__ == '__main__':
+    nose.main()
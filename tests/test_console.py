@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_console.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for console.py module."""
+
+import argparse
+import io
+import json
+import sys
+from collections import namedtuple
+from contextlib import redirect_stdout
+from os.path import basename
+from os.path import exists
+
+import nose
+
+from helpers import FakeExecutablesTest
+from helpers import ts_packet
+from videomorph.converter.console import _is_segmentable
+from videomorph.converter.console import is_headless
+from videomorph.converter.console import run_headless
+from videomorph.converter.media import StreamInfo
+from videomorph.converter.profile import ConversionProfile
+
+# Media file fake, for the checks not reading the file
+MediaFile = namedtuple('MediaFile',
+                       'duration video_stream_info audio_stream_info')
+
+NO_STREAM_INFO = StreamInfo(*[None] * len(StreamInfo._fields))
+
+# Fake conversion library, it lists its capabilities, or creates the
+# output file (last argument)
+LIBRARY_SCRIPT = ('#!/bin/sh\n'
+                  'case "$2" in\n'
+                  '-encoders) printf " ------\\n V..... {1}\\n'
+                  ' A..... aac\\n"; exit;;\n'
+                  '-muxers) printf " --\\n  E mp4\\n"; exit;;\n'
+                  '-filters) printf " ... scale V->V\\n"; exit;;\n'
+                  'esac\n'
+                  'printf "out_time_us=60000000\\nprogress=end\\n"\n'
+                  'echo "Conversion log" >&2\n'
+                  'for last; do :; done\n'
+                  ': > "$last"\n'
+                  'exit {0}\n')
+
+
+class TestRunHeadless(FakeExecutablesTest):
+    """Class for testing run_headless()."""
+
+    def setup(self):
+        """Setup method."""
+        super(TestRunHeadless, self).setup()
+        # A 120 seconds long video, read without the prober
+        self.video = self.fakes.join('video.ts')
+        with open(self.video, 'wb') as video_file:
+            video_file.write(ts_packet(pcr=90000) + ts_packet(pcr=90000 * 121))
+
+    def library(self, returncode=0, encoder='libx264'):
+        """Return the path to a fake conversion library."""
+        return self.fakes.add('ffmpeg',
+                              LIBRARY_SCRIPT.format(returncode, encoder))
+
+    def run(self, library_path, qualities=('MP4 Fullscreen (4:3)',)):
+        """Run the headless conversion, return the status and the events."""
+        quality_args = []
+        for quality in qualities:
+            quality_args += ['-q', quality]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = run_headless(['--headless', '-i', self.video,
+                                   '-p', 'MP4', '-o', self.fakes.path] +
+                                  quality_args,
+                                  library_path=library_path,
+                                  prober_path=sys.executable,
+                                  probe_cache_path=self.fakes.join(
+                                      'probe_cache.sqlite'),
+                                  capabilities_cache_path=self.fakes.join(
+                                      'capabilities.json'))
+
+        return status, [json.loads(line) for line in
+                        output.getvalue().splitlines()]
+
+    def test_conversion(self):
+        """Test a successful conversion."""
+        status, events = self.run(self.library())
+        assert status == 0
+        assert [event['event'] for event in events] == [
+            'progress', 'finished', 'summary']
+        assert events[0]['percent'] == 50.0
+        assert events[1]['status'] == 'done'
+        assert exists(events[1]['outputs'][0])
+        assert events[2]['done'] == 1
+
+    def test_multiple_qualities(self):
+        """Test a conversion to several qualities at once."""
+        status, events = self.run(self.library(),
+                                  qualities=('MP4 Fullscreen (4:3)',
+                                             'MP4 Widescreen (16:9)'))
+        assert status == 0
+        # Outputs are always tagged with several qualities
+        assert [basename(output) for output in events[1]['outputs']] == [
+            '[MP4F]-video.mp4', '[MP4W]-video.mp4']
+
+    def test_failed_conversion(self):
+        """Test the output of a failed conversion is removed."""
+        status, events = self.run(self.library(returncode=1))
+        assert status == 1
+        assert events[-2]['status'] == 'failed'
+        assert events[-2]['log'] == ['Conversion log']
+        assert not exists(events[-2]['outputs'][0])
+        assert events[-1]['failed'] == 1
+
+    def test_unsupported_quality(self):
+        """Test a quality needing a missing encoder is rejected."""
+        status, events = self.run(self.library(encoder='libx265'))
+        assert status == 1
+        assert not events
+
+
+def test_is_headless():
+    """Test is_headless()."""
+    assert is_headless(['-i', 'video.mp4', '--headless'])
+    assert not is_headless(['-i', 'video.mp4'])
+
+
+def test_is_segmentable():
+    """Test only the profiles encoding the video are segmented."""
+    media_file = MediaFile(duration=120.0, video_stream_info=NO_STREAM_INFO,
+                           audio_stream_info=NO_STREAM_INFO)
+    profile = ConversionProfile(prober=sys.executable)
+    for quality, segmentable in (('MP4 Fullscreen (4:3)', True),
+                                 ('MP3 Good Quality (160 Kbps)', False),
+                                 ('Extract Audio mp3', False),
+                                 ('DVD Fullscreen 352x480 (4:3)', False)):
+        args = argparse.Namespace(segment_time=10.0, subtitle=False,
+                                  quality=[quality])
+        profile.update(new_quality=quality)
+        assert _is_segmentable(media_file, args, profile) == segmentable
+
+    args = argparse.Namespace(segment_time=60.0, subtitle=False,
+                              quality=['MP4 Fullscreen (4:3)'])
+    profile.update(new_quality='MP4 Fullscreen (4:3)')
+    assert not _is_segmentable(media_file, args, profile)
+
+
+def test_is_segmentable_copied_video():
+    """Test a file whose video is copied is not segmented."""
+    args = argparse.Namespace(segment_time=10.0, subtitle=False,
+                              quality=['MS Compatible 640x480'])
+    profile = ConversionProfile(prober=sys.executable)
+    profile.update(new_quality='MS Compatible 640x480')
+    media_file = MediaFile(duration=120.0, video_stream_info=NO_STREAM_INFO,
+                           audio_stream_info=NO_STREAM_INFO)
+    assert _is_segmentable(media_file, args, profile)
+    # The video already has the codec, size and bitrate of the profile
+    media_file = media_file._replace(
+        video_stream_info=NO_STREAM_INFO._replace(
+            codec_name='msmpeg4v3', bit_rate=800000, width=640, height=480))
+    assert not _is_segmentable(media_file, args, profile)
+
+
+if __name__ == '__main__':
+    nose.main()
@@ -25,6 +25,9 @@ from PyQt5.QtCore import QProcess
 
 from videomorph.converter import media
 from videomorph.converter.conversionlib import ConversionLib
+from videomorph.converter.conversionlib import _ConversionTimer
+from videomorph.converter.engine import OutputReader
+from videomorph.converter.engine import ThreadBudget
 from videomorph.converter.profile import ConversionProfile
 
 
@@ -78,20 +81,50 @@ class TestConversionLib:
     def test_read_converter_output(self):
         """Test ConversionLib.read_converter_output()."""
         self.conv_lib.start_converter(cmd=self.get_conversion_cmd())
-        assert self.conv_lib.read_converter_output()
+        job = self.conv_lib.get_job(0)
+        # Nothing is read before the converter writes its progress
+        output = self.conv_lib.read_converter_output()
+        assert isinstance(output, bytes)
+        while (b'progress=' not in output and
+               job.wait_for_converter_output()):
+            output += self.conv_lib.read_converter_output()
+        assert b'progress=' in output
         self.conv_lib.stop_converter()
 
+    def test_start_converter_jobs(self):
+        """Test ConversionLib.start_converter() with several jobs."""
+        conv_lib = ConversionLib(max_jobs=2)
+        conv_lib.start_converter(cmd=self.get_conversion_cmd(), job_id=0)
+        assert conv_lib.has_free_slot
+        conv_lib.start_converter(cmd=['-version'], job_id=1, duration=60.0)
+        assert not conv_lib.has_free_slot
+        assert conv_lib.get_job(1).duration == 60.0
+        assert conv_lib.running_jobs == [0, 1]
+        assert len(conv_lib.abort_converter()) == 2
+        assert not conv_lib.running_jobs
+
     def test_catch_library_error_true(self):
-        """Test _OutputReader.catch_library_error() -> true."""
-        self.conv_lib.reader.update_read('Some random output with '
-                                         'Unknown encoder error')
-        assert self.conv_lib.reader.catch_library_error() == 'Unknown encoder'
+        """Test OutputReader.catch_library_error() -> true."""
+        reader = OutputReader()
+        reader.update_log(b'Some random output with Unknown encoder error')
+        assert reader.catch_library_error() == 'Unknown encoder'
 
     def test_catch_library_error_false(self):
-        """Test _OutputReader.catch_library_error() -> false."""
-        self.conv_lib.reader.update_read('Some random output with '
-                                         'no error')
-        assert self.conv_lib.reader.catch_library_error() is None
+        """Test OutputReader.catch_library_error() -> false."""
+        reader = OutputReader()
+        reader.update_log(b'Some random output with no error')
+        assert reader.catch_library_error() is None
+
+    def test_catch_errors_jobs(self):
+        """Test ConversionLib.catch_errors() keeps the error of each job."""
+        conv_lib = ConversionLib(max_jobs=2)
+        conv_lib.start_converter(cmd=['-version'], job_id=0)
+        conv_lib.start_converter(cmd=['-version'], job_id=1)
+        conv_lib.get_job(0).reader.update_log(b'Unknown encoder foo\n')
+        conv_lib.catch_errors(job_id=0)
+        conv_lib.catch_errors(job_id=1)
+        assert conv_lib.errors == {0: 'Unknown encoder'}
+        conv_lib.abort_converter()
 
     def test_stop_converter(self):
         """Test ConversionLib.stop_converter()."""
@@ -99,5 +132,58 @@ class TestConversionLib:
         assert not self.conv_lib.converter_is_running
 
 
+class TestConversionTimer:
+    """Class for testing _ConversionTimer."""
+
+    def test_process_progress_jobs(self):
+        """Test _ConversionTimer.process_progress() with several jobs."""
+        timer = _ConversionTimer()
+        timer.init_operation_start_time(job_id=0)
+        timer.init_operation_start_time(job_id=1)
+        timer.update_time(op_time_read_sec=20.0, job_id=0)
+        timer.update_time(op_time_read_sec=10.0, job_id=1)
+        assert timer.process_progress(list_duration=100.0) == 30
+        assert timer.operation_progress(file_duration=50.0, job_id=1) == 20
+        timer.finish_operation(job_id=0, op_time=50.0)
+        assert timer.process_progress(list_duration=100.0) == 60
+
+    def test_finish_stopped_operation(self):
+        """Test _ConversionTimer.finish_operation() for a stopped job."""
+        timer = _ConversionTimer()
+        timer.init_operation_start_time(job_id=0)
+        timer.update_time(op_time_read_sec=20.0, job_id=0)
+        timer.finish_operation(job_id=0, op_time=0.0)
+        assert timer.process_progress(list_duration=100.0) == 0
+
+
+class TestThreadBudget:
+    """Class for testing ThreadBudget."""
+
+    def test_allocate_split(self):
+        """Test ThreadBudget.allocate() splits the cores among jobs."""
+        budget = ThreadBudget(cores=16)
+        assert budget.allocate(job_id=0, encoder='libx264',
+                               starting_jobs=4) == 4
+        assert budget.allocate(job_id=1, encoder='libx264',
+                               starting_jobs=3) == 4
+
+    def test_allocate_encoder_limit(self):
+        """Test ThreadBudget.allocate() with a poorly threaded encoder."""
+        budget = ThreadBudget(cores=16)
+        assert budget.allocate(job_id=0, encoder='msmpeg4',
+                               starting_jobs=2) == 1
+        # The cores not used by the first job are left for the next one
+        assert budget.allocate(job_id=1, encoder='libx264',
+                               starting_jobs=1) == 15
+
+    def test_release(self):
+        """Test ThreadBudget.release() frees the cores of a job."""
+        budget = ThreadBudget(cores=4)
+        budget.allocate(job_id=0, starting_jobs=1)
+        assert budget.allocate(job_id=1, starting_jobs=1) == 1
+        budget.release(job_id=0)
+        assert budget.allocate(job_id=2, starting_jobs=1) == 3
+
+
 if __name__ == '__main__':
     nose.run()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_engine.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for engine.py module."""
+
+import asyncio
+import sys
+from glob import glob
+from os.path import exists
+from os.path import getsize
+from subprocess import DEVNULL
+from subprocess import run
+from unittest import SkipTest
+
+import nose
+
+from helpers import PYTHON_LIBRARY
+from helpers import EventLoopTest
+from helpers import python_cmd
+from videomorph.converter.engine import ConversionEngine
+from videomorph.converter.engine import OutputReader
+from videomorph.converter.utils import which
+
+# Fake conversion library output, run by the Python interpreter
+PROGRESS_SCRIPT = ('import sys, time\n'
+                   'for i in range(1, 4):\n'
+                   '    sys.stdout.write("frame={0}\\nout_time_us={0}000000\\n'
+                   'bitrate=64.0kbits/s\\nprogress=continue\\n".format(i))\n'
+                   '    sys.stdout.flush()\n'
+                   '    time.sleep(0.05)\n')
+
+# Fake conversion library for segmented jobs: split in 3 segments, encode
+# them in 10 seconds each, failing for the segment given (or the split),
+# and concatenate. The commands are logged
+SEGMENT_LIBRARY = """#!{0}
+import sys
+args = sys.argv[1:]
+output = args[-1]
+with open('{2}', 'a') as log_file:
+    log_file.write(' '.join(args) + '\\n')
+if 'segment' in args:
+    if '{1}' == 'split':
+        sys.exit(1)
+    for i in range(3):
+        open(output % i, 'w').close()
+elif 'concat' in args:
+    with open(args[args.index('-i') + 1]) as list_file:
+        open(output, 'w').write(list_file.read())
+else:
+    sys.stdout.write('out_time_us=10000000\\nprogress=end\\n')
+    if args[args.index('-i') + 1].endswith('{1}'):
+        sys.exit(1)
+    open(output, 'w').close()
+"""
+
+
+class TestConversionEngine(EventLoopTest):
+    """Class for testing ConversionEngine."""
+
+    def setup(self):
+        """Setup method."""
+        super(TestConversionEngine, self).setup()
+        self.library_path = self.fakes.add('ffmpeg', PYTHON_LIBRARY)
+
+    def test_progress(self):
+        """Test ConversionJob progress as an async iterator."""
+        async def convert():
+            engine = ConversionEngine(library_path=self.library_path)
+            job = engine.submit(build_cmd=python_cmd(PROGRESS_SCRIPT))
+            times = []
+            async for progress in job:
+                times.append(progress.time)
+            return times, await job.wait()
+
+        times, returncode = self.run(convert())
+        assert times and times[-1] == 3.0
+        assert returncode == 0
+
+    def test_max_jobs(self):
+        """Test ConversionEngine runs up to max_jobs jobs at once."""
+        async def convert():
+            engine = ConversionEngine(library_path=self.library_path,
+                                      max_jobs=2)
+            jobs = [engine.submit(build_cmd=python_cmd(PROGRESS_SCRIPT),
+                                  job_id=i) for i in range(3)]
+            await asyncio.sleep(0)
+            running = sum(job.is_running or job.done for job in jobs)
+            await engine.join()
+            return running, [job.returncode for job in jobs]
+
+        running, returncodes = self.run(convert())
+        assert running <= 2
+        assert returncodes == [0, 0, 0]
+
+    def test_cancel(self):
+        """Test ConversionJob.cancel() on running and queued jobs."""
+        async def convert():
+            engine = ConversionEngine(library_path=self.library_path,
+                                      max_jobs=1)
+            running = engine.submit(
+                build_cmd=python_cmd('import time; time.sleep(30)'))
+            queued = engine.submit(build_cmd=python_cmd(PROGRESS_SCRIPT))
+            while not running.is_running:
+                await asyncio.sleep(0.01)
+            queued.cancel()
+            running.cancel()
+            await engine.join()
+            return running, queued
+
+        running, queued = self.run(convert())
+        assert running.cancelled and running.returncode != 0
+        assert queued.done and queued.returncode is None
+
+    def test_build_cmd_error(self):
+        """Test an error building the command is stored in the job."""
+        def build_cmd(threads):
+            raise FileExistsError('Video file already exits')
+
+        async def convert():
+            engine = ConversionEngine(library_path=self.library_path)
+            job = engine.submit(build_cmd=build_cmd)
+            await job.wait()
+            return job
+
+        job = self.run(convert())
+        assert job.error == 'Video file already exits'
+
+    def test_start_error(self):
+        """Test any error keeping a job from starting is stored in it."""
+        def build_cmd(threads):
+            raise RuntimeError('Cannot add child handler')
+
+        async def convert():
+            engine = ConversionEngine(library_path=self.library_path)
+            job = engine.submit(build_cmd=build_cmd)
+            segmented_job = engine.submit_segmented(build_cmd=build_cmd,
+                                                    segment_time=10)
+            await engine.join()
+            return job, segmented_job
+
+        for job in self.run(convert()):
+            assert job.done and job.returncode is None
+            assert job.error == 'Cannot add child handler'
+
+    def test_library_error(self):
+        """Test the library errors are caught."""
+        script = 'import sys; sys.stderr.write("Unknown encoder x")'
+
+        async def convert():
+            engine = ConversionEngine(library_path=self.library_path)
+            job = engine.submit(build_cmd=python_cmd(script))
+            await job.wait()
+            return job
+
+        assert self.run(convert()).error == 'Unknown encoder'
+
+
+class TestSegmentedConversionJob(EventLoopTest):
+    """Class for testing SegmentedConversionJob."""
+
+    def setup(self):
+        """Setup method."""
+        super(TestSegmentedConversionJob, self).setup()
+        self.output = self.fakes.join('video.mp4')
+
+    def convert(self, failing_segment='none'):
+        """Run a segmented job, return it and its progress times."""
+        self.log_path = self.fakes.join('commands.log')
+        library_path = self.fakes.add(
+            'ffmpeg', SEGMENT_LIBRARY.format(sys.executable, failing_segment,
+                                             self.log_path))
+
+        async def convert():
+            engine = ConversionEngine(library_path=library_path, max_jobs=2)
+            job = engine.submit_segmented(
+                build_cmd=lambda threads: ['-i', 'video.ts', '-y',
+                                           self.output],
+                segment_time=10)
+            times = []
+            async for progress in job:
+                times.append(progress.time)
+            await engine.join()
+            return job, times
+
+        return self.run(convert())
+
+    def test_conversion(self):
+        """Test the segments are encoded and concatenated in order."""
+        job, times = self.convert()
+        assert job.returncode == 0
+        assert times[-1] == 30.0
+        with open(self.output) as output_file:
+            assert output_file.read().splitlines() == [
+                "file 'output00000.mp4'",
+                "file 'output00001.mp4'",
+                "file 'output00002.mp4'"]
+        with open(self.log_path) as log_file:
+            commands = log_file.read().splitlines()
+        assert len(commands) == 5
+        # Only the video is split, with timestamps
+        assert ('-fflags +genpts -i video.ts -map 0:v:0 -c copy '
+                '-f segment' in commands[0])
+        # The video is copied, the input streams are encoded once, with
+        # the default mapping
+        assert commands[-1].endswith(
+            '-vn -i video.ts -c:v copy -y ' + self.output)
+        assert '-map' not in commands[-1]
+        # The working directory is removed
+        assert not glob(self.fakes.join('.videomorph-*'))
+
+    def test_failed_segment(self):
+        """Test a failed segment fails the job."""
+        job, _ = self.convert(failing_segment='input00001.mkv')
+        assert job.returncode == 1
+        assert not exists(self.output)
+        assert not glob(self.fakes.join('.videomorph-*'))
+
+    def test_failed_split(self):
+        """Test an input that can't be split is converted whole."""
+        job, times = self.convert(failing_segment='split')
+        assert job.returncode == 0
+        assert times == [10.0]
+        assert exists(self.output)
+        with open(self.log_path) as log_file:
+            assert log_file.read().splitlines()[-1].endswith(
+                '-i video.ts -y ' + self.output)
+
+    def test_library(self):
+        """Test a segmented job with the conversion library installed."""
+        library_path = which('ffmpeg')
+        if library_path is None:
+            raise SkipTest('The conversion library is not installed')
+
+        # A MPEG-PS input, without timestamps on every packet
+        input_path = self.fakes.join('video.mpg')
+        run([library_path, '-v', 'error',
+             '-f', 'lavfi', '-i', 'testsrc=duration=6:size=160x120:rate=25',
+             '-f', 'lavfi', '-i', 'sine=duration=6',
+             '-c:v', 'mpeg1video', '-g', '25', '-c:a', 'mp2',
+             '-f', 'vob', input_path],
+            stdin=DEVNULL, check=True)
+
+        async def convert():
+            engine = ConversionEngine(library_path=library_path, max_jobs=2)
+            job = engine.submit_segmented(
+                build_cmd=lambda threads: [
+                    '-i', input_path, '-f', 'mp4', '-vcodec', 'mpeg4',
+                    '-acodec', 'aac', '-threads', str(threads),
+                    '-y', self.output],
+                segment_time=2)
+            await engine.join()
+            return job
+
+        job = self.run(convert())
+        assert job.returncode == 0, job.error
+        assert getsize(self.output) > 0
+
+
+class TestOutputReader:
+    """Class for testing OutputReader."""
+
+    def setup(self):
+        """Setup method."""
+        self.reader = OutputReader()
+
+    def test_progress(self):
+        """Test the progress fields are parsed."""
+        assert self.reader.update_read(b'frame=120\nfps=59.94\n'
+                                       b'bitrate=1024.5kbits/s\n'
+                                       b'total_size=1048576\n'
+                                       b'out_time_us=4004000\n'
+                                       b'speed=2.5x\nprogress=continue\n')
+        assert self.reader.progress.frame == 120
+        assert self.reader.progress.fps == 59.94
+        assert self.reader.progress.total_size == 1048576
+        assert self.reader.progress.speed == 2.5
+        assert self.reader.bitrate == '1024.5kbits/s'
+        assert self.reader.time == 4.004
+
+    def test_split_lines(self):
+        """Test a progress block split across reads."""
+        assert not self.reader.update_read(b'out_time_us=20')
+        assert not self.reader.update_read(b'00000\nprog')
+        assert not self.reader.has_time_read
+        assert self.reader.update_read(b'ress=continue\n')
+        assert self.reader.time == 2.0
+
+    def test_separate_channels(self):
+        """Test log lines can't break a progress line split across reads."""
+        assert not self.reader.update_read(b'out_time_us=20')
+        self.reader.update_log(b'[mp4 @ 0x1] partial log')
+        assert self.reader.update_read(b'00000\nprogress=continue\n')
+        self.reader.update_log(b' line\n')
+        assert self.reader.time == 2.0
+        assert list(self.reader.log_tail) == ['[mp4 @ 0x1] partial log line']
+
+    def test_not_available(self):
+        """Test the progress fields not available yet."""
+        self.reader.update_read(b'out_time_us=-9223372036854775807\n'
+                                b'bitrate=N/A\nspeed=N/A\nprogress=continue\n')
+        assert not self.reader.has_time_read
+        assert self.reader.bitrate is None
+        assert self.reader.progress.speed is None
+
+    def test_library_error(self):
+        """Test the library errors are caught from the log lines."""
+        self.reader.update_log(b"Unrecognized option 'foo=bar'.\n")
+        assert self.reader.catch_library_error() == 'Unrecognized option'
+
+    def test_split_character(self):
+        """Test a multibyte character split across reads."""
+        line = 'Input #0, from \'vídeo.mp4\':\n'.encode('utf-8')
+        split = line.index(b'\xc3') + 1
+        self.reader.update_log(line[:split])
+        self.reader.update_log(line[split:])
+        assert self.reader.log_tail[-1] == "Input #0, from 'vídeo.mp4':"
+
+    def test_bounded_log(self):
+        """Test only the last log lines are kept."""
+        for i in range(1000):
+            self.reader.update_log('log line {0}\n'.format(i).encode())
+        assert len(self.reader.log_tail) == self.reader.MAX_LOG_LINES
+        assert self.reader.log_tail[-1] == 'log line 999'
+
+
+if __name__ == '__main__':
+    nose.main()
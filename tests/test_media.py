@@ -20,8 +20,16 @@
 
 """This module provides tests for media.py module."""
 
+import threading
+import time
+from os.path import abspath
+
 import nose
 
+from helpers import HANGING_PROBER
+from helpers import FakeExecutables
+from helpers import ProbingTest
+from videomorph.converter import media
 from videomorph.converter.conversionlib import ConversionLib
 from videomorph.converter.media import MediaList
 from videomorph.converter.media import _MediaFile
@@ -136,6 +144,18 @@ class TestMedia:
         """Test MediaList.duration()."""
         nose.tools.assert_almost_equal(self.media_list.duration, 120.72)
 
+    def test_duration_status_change(self):
+        """Test MediaList.duration after a file status change."""
+        self.media_list.set_file_status(0, STATUS.done)
+        assert self.media_list.duration == 0.0
+        self.media_list.set_file_status(0, STATUS.todo)
+        nose.tools.assert_almost_equal(self.media_list.duration, 120.72)
+
+    def test_duration_delete_file(self):
+        """Test MediaList.duration after deleting a file."""
+        self.media_list.delete_file(position=0)
+        assert self.media_list.duration == 0.0
+
     @nose.tools.raises(StopIteration)
     def test_add_file_twice(self):
         """Testing adding the same file twice."""
@@ -143,6 +163,17 @@ class TestMedia:
         gen = self.media_list.populate(('Dad.mpg',))
         next(gen)
 
+    def test_filter_by_path(self):
+        """Test MediaList.filter_by_path() with relative duplicates."""
+        assert self.media_list.filter_by_path(
+            ('./Dad.mpg', abspath('Dad.mpg'), 'New.mpg', './New.mpg')) == [
+                'New.mpg']
+
+    def test_delete_file_from_index(self):
+        """Test MediaList.delete_file() removes the file from the index."""
+        self.media_list.delete_file(position=0)
+        assert self.media_list.filter_by_path(('Dad.mpg',)) == ['Dad.mpg']
+
     def test_build_conversion_cmd(self):
         """Test _MediaFile.build_conversion_cmd."""
         assert self.media_list.get_file(0).build_conversion_cmd(
@@ -172,6 +203,23 @@ class TestMedia:
                                                                '-y',
                                                                './[DVDF]-Dad.mpg']
 
+    def test_build_multi_conversion_cmd(self):
+        """Test _MediaFile.build_multi_conversion_cmd()."""
+        cmd = self.media_list.get_file(0).build_multi_conversion_cmd(
+            output_dir='.',
+            target_qualities=('DVD Fullscreen 352x480 (4:3)',
+                              'DVD Widescreen 352x480 (16:9)'),
+            tagged_output=False,
+            subtitle=False,
+            threads=2)
+        self.profile.update(new_quality='DVD Fullscreen 352x480 (4:3)')
+        # A single input with an output per quality, always tagged
+        assert cmd.count('-i') == 1
+        assert cmd.count('-threads') == 2
+        assert cmd[cmd.index('-threads') + 1] == '1'
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-y'] == [
+            './[DVDF]-Dad.mpg', './[DVDW]-Dad.mpg']
+
     def test_running_file_conversion_cmd(self):
         """Test MediaList.running_file_conversion_cmd()."""
         assert self.media_list.running_file_conversion_cmd(
@@ -228,6 +276,149 @@ class TestMedia:
         next(gen)
         assert next(gen) == 'Dad.mpg'
 
+    def test_populate_no_files(self):
+        """Test MediaList.populate() with no files to add."""
+        media_list = MediaList(profile=self.profile)
+        assert list(media_list.populate(())) == [0]
+        # Nothing is yielded when the files are in the list already
+        assert not list(self.media_list.populate(('Dad.mpg',)))
+
+    def test_lazy_stream_info(self):
+        """Test _MediaFile streams info is probed on first access."""
+        media_file = self.media_list.get_file(0)
+        assert media_file._video_stream_info is None
+        assert media_file.video_stream_info.codec_name is not None
+        assert media_file._audio_stream_info is not None
+
+    def test_parse_probe_streams(self):
+        """Test _MediaFile._parse_probe_audio_stream() with many streams."""
+        probe_info = {'streams': [{'codec_type': 'video',
+                                   'codec_name': 'h264'},
+                                  {'codec_type': 'audio',
+                                   'codec_name': 'aac',
+                                   'bit_rate': '128000',
+                                   'tags': {'language': 'eng'}},
+                                  {'codec_type': 'audio',
+                                   'codec_name': 'mp3'}]}
+        audio_info = _MediaFile._parse_probe_audio_stream(probe_info)
+        assert audio_info.codec_name == 'aac'
+        assert audio_info.bit_rate == 128000
+        assert audio_info.language == 'eng'
+        assert audio_info.width is None
+
+    def test_parse_probe_format(self):
+        """Test _MediaFile._parse_probe_format() numeric fields."""
+        format_info = _MediaFile._parse_probe_format(
+            {'format': {'duration': '120.720000', 'size': '1024',
+                        'bit_rate': 'N/A', 'format_name': 'mpeg'}})
+        assert format_info.duration == 120.72
+        assert format_info.size == 1024
+        assert format_info.bit_rate is None
+        assert format_info.format_name == 'mpeg'
+
+    def test_parse_probe_no_output(self):
+        """Test _MediaFile._parse_probe_format() with no prober output."""
+        assert _MediaFile._parse_probe_format({}).duration is None
+
+    def test_probe_timeout(self):
+        """Test a hung prober is killed and the file is not added."""
+        with FakeExecutables() as fakes:
+            prober = fakes.add('ffprobe', HANGING_PROBER)
+
+            timeout = media.PROBE_TIMEOUT
+            media.PROBE_TIMEOUT = 0.5
+            try:
+                media_list = MediaList(
+                    profile=ConversionProfile(prober=prober))
+                assert list(media_list.populate(('Dad.mpg',))) == [
+                    1, 'Dad.mpg']
+            finally:
+                media.PROBE_TIMEOUT = timeout
+
+            assert not media_list
+            assert list(media_list.not_added_files) == ['Dad.mpg']
+
+    def test_cancel_probing(self):
+        """Test MediaList.cancel_probing() kills the probes in flight."""
+        with FakeExecutables() as fakes:
+            prober = fakes.add('ffprobe', HANGING_PROBER)
+
+            media_list = MediaList(profile=ConversionProfile(prober=prober))
+            threading.Timer(0.5, media_list.cancel_probing).start()
+            start_time = time.time()
+            assert not list(media_list.probe_files(('Dad.mpg', 'Dad.mpg')))
+            assert time.time() - start_time < media.PROBE_TIMEOUT
+
+
+class TestProbing(ProbingTest):
+    """Class for testing when the files of a MediaList are probed."""
+
+    def setup(self):
+        """Setup method."""
+        super(TestProbing, self).setup()
+        self.profile = ConversionProfile(prober=self.prober)
+
+    def test_add_file(self):
+        """Test adding a file with a readable header runs no prober."""
+        media_list = MediaList(profile=self.profile)
+        assert list(media_list.populate((self.video,))) == [1, 'video.ts']
+        assert media_list.duration == 120.0
+        assert not media_list.get_file(0).has_streams_info
+        assert not self.prober_calls()
+
+    def test_probe_files(self):
+        """Test MediaList.probe_files() probes headerless files only."""
+        video = self.fakes.join('video.mpg')
+        with open(video, 'wb') as video_file:
+            video_file.write(bytes(64))
+        media_list = MediaList(profile=self.profile)
+        durations = [media_file.duration for media_file in
+                     media_list.probe_files((self.video, video))]
+        assert durations == [120.0, 60.0]
+        prober_calls = self.prober_calls()
+        assert len(prober_calls) == 1
+        assert prober_calls[0].endswith(video)
+
+    def test_probe_streams(self):
+        """Test MediaList.probe_streams() runs the prober once per file."""
+        media_list = MediaList(profile=self.profile)
+        list(media_list.populate((self.video,)))
+        media_file = media_list.get_file(0)
+        assert list(media_list.probe_streams(media_list)) == [media_file]
+        assert media_file.has_streams_info
+        assert media_file.video_stream_info.codec_name == 'h264'
+        assert media_file.audio_stream_info.codec_name == 'aac'
+        assert list(media_list.probe_streams(media_list)) == [media_file]
+        assert len(self.prober_calls()) == 1
+
+    def test_missing_prober(self):
+        """Test the streams info is empty if the prober can't run."""
+        for prober in (self.fakes.join('none'), None):
+            media_list = MediaList(profile=ConversionProfile(prober=prober))
+            list(media_list.populate((self.video,)))
+            media_file = media_list.get_file(0)
+            assert list(media_list.probe_streams(media_list)) == [media_file]
+            assert media_file.has_streams_info
+            assert media_file.video_stream_info.codec_name is None
+            assert media_file.duration == 120.0
+
+    def test_lazy_stream_info(self):
+        """Test the streams info is probed on first access only."""
+        # No duration in the header, the prober reads it
+        video = self.fakes.join('video.mpg')
+        with open(video, 'wb') as video_file:
+            video_file.write(bytes(64))
+        media_list = MediaList(profile=self.profile)
+        list(media_list.populate((video,)))
+        media_file = media_list.get_file(0)
+        assert media_file.duration == 60.0
+        assert not media_file.has_streams_info
+        assert '-show_streams' not in self.prober_calls()[0]
+        assert media_file.video_stream_info.codec_name == 'h264'
+        assert media_file.audio_stream_info.codec_name == 'aac'
+        assert '-show_streams' in self.prober_calls()[1]
+        assert len(self.prober_calls()) == 2
+
 
 if __name__ == '__main__':
     nose.main()
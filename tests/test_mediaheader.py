@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_mediaheader.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for mediaheader.py module."""
+
+import struct
+import tempfile
+from os.path import join as join_path
+
+import nose
+
+from helpers import ts_packet
+from videomorph.converter.mediaheader import read_duration
+
+
+def mp4_box(box_type, payload):
+    """Return a MP4 box."""
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+class TestReadDuration:
+    """Class for testing read_duration()."""
+
+    def setup(self):
+        """Setup method."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def teardown(self):
+        """Teardown method."""
+        self.tmp_dir.cleanup()
+
+    def write_file(self, name, data):
+        """Write a file to the temporary directory."""
+        path = join_path(self.tmp_dir.name, name)
+        with open(path, 'wb') as media_file:
+            media_file.write(data)
+        return path
+
+    def test_mp4(self):
+        """Test read_duration() for a MP4 file with moov at the end."""
+        mvhd = mp4_box(b'mvhd', bytes(12) + struct.pack('>II', 1000, 120720) +
+                       bytes(80))
+        path = self.write_file('video.mp4',
+                               mp4_box(b'ftyp', b'isom' + bytes(4)) +
+                               mp4_box(b'mdat', bytes(1024)) +
+                               mp4_box(b'moov', mvhd))
+        nose.tools.assert_almost_equal(read_duration(path), 120.72)
+
+    def test_mp4_unknown_duration(self):
+        """Test read_duration() for a MP4 file with unknown duration."""
+        mvhd = mp4_box(b'mvhd', bytes(12) +
+                       struct.pack('>II', 1000, 0xFFFFFFFF) + bytes(80))
+        path = self.write_file('video.mp4', mp4_box(b'moov', mvhd))
+        assert read_duration(path) is None
+
+    def test_matroska(self):
+        """Test read_duration() for a Matroska file."""
+        info = (b'\x2a\xd7\xb1\x83' + (1000000).to_bytes(3, 'big') +
+                b'\x44\x89\x88' + struct.pack('>d', 120720.0))
+        path = self.write_file('video.mkv',
+                               b'\x1a\x45\xdf\xa3\x84' + bytes(4) +
+                               b'\x18\x53\x80\x67\x01' + b'\xff' * 7 +
+                               b'\xec\x82' + bytes(2) +
+                               b'\x15\x49\xa9\x66' +
+                               bytes([0x80 | len(info)]) + info)
+        nose.tools.assert_almost_equal(read_duration(path), 120.72)
+
+    def test_mpegts(self):
+        """Test read_duration() for a MPEG-TS file."""
+        path = self.write_file('video.ts',
+                               ts_packet(pcr=90000) +
+                               ts_packet() * 100 +
+                               ts_packet(pcr=90000 * 121))
+        nose.tools.assert_almost_equal(read_duration(path), 120.0)
+
+    def test_unsupported_extension(self):
+        """Test read_duration() for an unsupported container."""
+        assert read_duration(self.write_file('video.mpg', bytes(64))) is None
+
+    def test_corrupt_file(self):
+        """Test read_duration() for a corrupt file."""
+        assert read_duration(self.write_file('video.mkv', bytes(64))) is None
+        assert read_duration(self.write_file('video.mp4', bytes(64))) is None
+        assert read_duration(self.write_file('video.ts', bytes(64))) is None
+
+    def test_missing_file(self):
+        """Test read_duration() for a missing file."""
+        assert read_duration(join_path(self.tmp_dir.name, 'no.mp4')) is None
+
+
+if __name__ == '__main__':
+    nose.main()
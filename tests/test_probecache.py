@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_probecache.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for probecache.py module."""
+
+import os
+import sys
+import tempfile
+import time
+from os.path import join as join_path
+
+import nose
+
+from videomorph.converter.probecache import ProbeCache
+
+
+class TestProbeCache:
+    """Class for testing ProbeCache."""
+
+    probe_info = {'format': {'filename': 'video.mpg', 'duration': '1.0'}}
+
+    def setup(self):
+        """Setup method."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.video = join_path(self.tmp_dir.name, 'video.mpg')
+        with open(self.video, 'wb') as video_file:
+            video_file.write(b'\x00' * 16)
+        self.cache = ProbeCache(
+            db_path=join_path(self.tmp_dir.name, 'cache.sqlite'))
+
+    def teardown(self):
+        """Teardown method."""
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_miss(self):
+        """Test ProbeCache.get() on an empty cache."""
+        assert self.cache.get(self.video, sys.executable) is None
+        assert self.cache.misses == 1
+
+    def test_hit(self):
+        """Test ProbeCache.get() after ProbeCache.set()."""
+        self.cache.set(self.video, sys.executable, self.probe_info)
+        assert self.cache.get(self.video, sys.executable) == self.probe_info
+        assert self.cache.hits == 1
+
+    def test_modified_file(self):
+        """Test a modified file is not read from the cache."""
+        self.cache.set(self.video, sys.executable, self.probe_info)
+        with open(self.video, 'ab') as video_file:
+            video_file.write(b'\x00')
+        assert self.cache.get(self.video, sys.executable) is None
+
+    def test_other_prober(self):
+        """Test the cache is invalid for a different prober."""
+        self.cache.set(self.video, sys.executable, self.probe_info)
+        assert self.cache.get(self.video, self.video) is None
+
+    def test_persistence(self):
+        """Test the cache entries persist across instances."""
+        self.cache.set(self.video, sys.executable, self.probe_info)
+        self.cache.close()
+        self.cache = ProbeCache(db_path=self.cache.db_path)
+        assert self.cache.get(self.video, sys.executable) == self.probe_info
+
+    def test_eviction(self):
+        """Test the least recently used entries are evicted."""
+        self.cache.max_entries = 2
+        videos = []
+        for i in range(3):
+            videos.append(join_path(self.tmp_dir.name, '{0}.mpg'.format(i)))
+            open(videos[-1], 'wb').close()
+            self.cache.set(videos[-1], sys.executable, self.probe_info)
+            time.sleep(0.02)
+        self.cache._evict()
+        assert len(self.cache) == 2
+        assert self.cache.get(videos[0], sys.executable) is None
+
+    def test_missing_file(self):
+        """Test a missing file is never cached."""
+        os.remove(self.video)
+        self.cache.set(self.video, sys.executable, self.probe_info)
+        assert not len(self.cache)
+
+
+if __name__ == '__main__':
+    nose.main()
@@ -66,7 +66,33 @@ def test_get_xml_profile_qualities_es():
     assert qualities == OrderedDict([('AVI', ['Compatible MS 640x480', 'Compatible MS 720x480', 'XVID Pantalla Completa 640x480 (4:3)', 'XVID Pantalla Panorámica 704x384 (16:9)']), ('DVD', ['DVD Pantalla Completa 352x480 (4:3)', 'DVD Pantalla Panorámica 352x480 (16:9)', 'DVD Pantalla Completa 720x480 (4:3) Alta Calidad', 'DVD Pantalla Panorámica 720x480 (16:9) Alta Calidad', 'DVD Baja Calidad 720x480']), ('FLV', ['FLV Pantalla Completa 320x240 (4:3)', 'FLV Pantalla Panorámica 320x180 (16:9)']), ('MOV', ['MOV Genérico', 'Quicktime MOV Auto', 'QuickTime H.264 Alta Calidad', 'QuickTime H.264 Muy Alta Calidad']), ('MP4', ['MP4 Alta Calidad', 'MP4 Muy Alta Calidad', 'MP4 Súper Alta Calidad', 'MP4 Pantalla Completa (4:3)', 'MP4 Pantalla Panorámica (16:9)']), ('VCD', ['VCD Alta Calidad', 'PAL VCD Alta Calidad']), ('WEBM', ['WEBM Pantalla Completa (4:3)', 'WEBM Pantalla Panorámica (16:9)']), ('WMV', ['WMV Genérico']), ('MP3', ['Extraer Audio mp3', 'MP3 Buena Calidad (160 kb)', 'MP3 Alta Calidad (192 kb)'])])
 
 
+def test_get_xml_profile():
+    """Test get_xml_profile by english and spanish names."""
+    entry = profile.get_xml_profile('MP4 Pantalla Completa (4:3)')
+    assert entry is profile.get_xml_profile('MP4 Fullscreen (4:3)')
+    assert entry.file_extension == '.mp4'
+    assert entry.argv[:4] == ('-f', 'mp4', '-r', '29.97')
+
+
+def test_get_xml_profile_after_add():
+    """Test the profile index is rebuilt after adding a profile."""
+    assert profile.get_xml_profile('Test Preset') is None
+    profile.add_xml_profile(profile_name='test', preset='Test Preset',
+                            params='-vcodec copy', extension='.mkv')
+    try:
+        assert profile.get_xml_profile('Test Preset').argv == ('-vcodec',
+                                                               'copy')
+    finally:
+        profile.restore_default_profiles()
+    assert profile.get_xml_profile('Test Preset') is None
+
+
 # Tests for _Profile class
+def test_video_encoder():
+    """Test _Profile.video_encoder."""
+    assert profile.video_encoder == 'libx264'
+
+
 def test_quality_tag():
     """Test _Profile.quality_tag."""
     assert profile.quality_tag == '[MP4F]-'
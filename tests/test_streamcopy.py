@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_streamcopy.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for streamcopy.py module."""
+
+import nose
+
+from videomorph.converter.media import StreamInfo
+from videomorph.converter.streamcopy import get_video_encoder
+from videomorph.converter.streamcopy import split_params
+from videomorph.converter.streamcopy import stream_copy_params
+from videomorph.converter.streamcopy import video_copy_params
+
+PARAMS = ('-f mp4 -vcodec libx264 -s 1280x720 -b:v 2000k -preset fast '
+          '-acodec aac -strict -2 -b:a 128k -ar 44100 -ac 2').split()
+
+VIDEO_INFO = StreamInfo(codec_name='h264', codec_long_name=None,
+                        bit_rate=1500000, width=1280, height=720,
+                        sample_rate=None, channels=None, language=None)
+AUDIO_INFO = StreamInfo(codec_name='aac', codec_long_name=None,
+                        bit_rate=128000, width=None, height=None,
+                        sample_rate=44100, channels=2, language=None)
+
+
+def test_split_params():
+    """Test split_params()."""
+    assert split_params('-f mp3 -vn -strict -2'.split()) == [
+        ('-f', 'mp3'), ('-vn', None), ('-strict', '-2')]
+
+
+def test_get_video_encoder():
+    """Test get_video_encoder()."""
+    assert get_video_encoder(PARAMS) == 'libx264'
+    # The last encoder is used
+    assert get_video_encoder(PARAMS + ['-c:v', 'mpeg4']) == 'mpeg4'
+    assert get_video_encoder('-f mp3 -vn -acodec libmp3lame'.split()) is None
+
+
+def test_copy_all_streams():
+    """Test stream_copy_params() when all the streams match."""
+    assert stream_copy_params(PARAMS, VIDEO_INFO, AUDIO_INFO) == [
+        '-f', 'mp4', '-vcodec', 'copy', '-acodec', 'copy', '-strict', '-2']
+
+
+def test_copy_audio_stream():
+    """Test stream_copy_params() when only the audio matches."""
+    video_info = VIDEO_INFO._replace(width=1920, height=1080)
+    assert stream_copy_params(PARAMS, video_info, AUDIO_INFO) == [
+        '-f', 'mp4', '-vcodec', 'libx264', '-s', '1280x720', '-b:v', '2000k',
+        '-preset', 'fast', '-acodec', 'copy', '-strict', '-2']
+
+
+def test_no_copy():
+    """Test stream_copy_params() when no stream matches."""
+    video_info = VIDEO_INFO._replace(codec_name='mpeg4')
+    audio_info = AUDIO_INFO._replace(sample_rate=48000)
+    assert stream_copy_params(PARAMS, video_info, audio_info) == PARAMS
+
+
+def test_no_copy_higher_bitrate():
+    """Test a stream with a higher bitrate than the profile is encoded."""
+    video_info = VIDEO_INFO._replace(bit_rate=8000000)
+    assert 'copy' not in stream_copy_params(PARAMS, video_info,
+                                            AUDIO_INFO)[:4]
+
+
+def test_no_copy_unknown_bitrate():
+    """Test a stream with an unknown bitrate is encoded."""
+    video_info = VIDEO_INFO._replace(bit_rate=None)
+    audio_info = AUDIO_INFO._replace(bit_rate=None)
+    assert stream_copy_params(PARAMS, video_info, audio_info) == PARAMS
+
+
+def test_copy_unknown_bitrate():
+    """Test a stream with an unknown bitrate is copied without limit."""
+    params = '-f mp4 -vcodec libx264 -s 1280x720 -acodec aac'.split()
+    video_info = VIDEO_INFO._replace(bit_rate=None)
+    assert stream_copy_params(params, video_info, AUDIO_INFO) == [
+        '-f', 'mp4', '-vcodec', 'copy', '-acodec', 'copy']
+
+
+def test_no_copy_filters():
+    """Test a stream is encoded when the profile changes it."""
+    params = PARAMS + ['-r', '29.97']
+    assert stream_copy_params(params, VIDEO_INFO, AUDIO_INFO)[3] == 'libx264'
+
+
+def test_no_copy_rate_control():
+    """Test a stream is encoded when the profile sets its quality."""
+    params = ('-c:v libx265 -preset medium -crf 28 -c:a aac -b:a 128k '
+              '-strict -2').split()
+    video_info = VIDEO_INFO._replace(codec_name='hevc', bit_rate=20000000)
+    assert stream_copy_params(params, video_info, AUDIO_INFO) == [
+        '-c:v', 'libx265', '-preset', 'medium', '-crf', '28', '-c:a', 'copy',
+        '-strict', '-2']
+
+
+def test_no_copy_unknown_stream():
+    """Test an unprobed stream is encoded."""
+    empty_info = StreamInfo(*[None] * len(StreamInfo._fields))
+    assert stream_copy_params(PARAMS, empty_info, empty_info) == PARAMS
+
+
+def test_video_copy_params():
+    """Test video_copy_params() drops the video options."""
+    params = PARAMS + ['-vf', 'scale=640:-1', '-y', 'output.mp4']
+    assert video_copy_params(params) == [
+        '-c:v', 'copy', '-f', 'mp4', '-acodec', 'aac', '-strict', '-2',
+        '-b:a', '128k', '-ar', '44100', '-ac', '2', '-y', 'output.mp4']
+
+
+if __name__ == '__main__':
+    nose.main()
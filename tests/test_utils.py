@@ -20,6 +20,10 @@
 
 """This module provides tests for utils.py module."""
 
+import os
+import tempfile
+from os.path import join as join_path
+
 import nose
 
 from videomorph.converter import utils
@@ -96,6 +100,41 @@ def test_which_null_arg():
     utils.which('')
 
 
+def test_executable_resolver():
+    """Test ExecutableResolver caching and invalidation."""
+    resolver = utils.ExecutableResolver()
+    sys_path_var = os.environ.get('PATH')
+    with tempfile.TemporaryDirectory() as dir_1, \
+            tempfile.TemporaryDirectory() as dir_2:
+        app_path = join_path(dir_1, 'app')
+        open(app_path, 'w').close()
+        os.chmod(app_path, 0o755)
+        try:
+            os.environ['PATH'] = dir_1
+            assert resolver.which('app') == app_path
+            assert resolver.which('other_app') is None
+            # Executables installed later are found
+            open(join_path(dir_1, 'other_app'), 'w').close()
+            os.chmod(join_path(dir_1, 'other_app'), 0o755)
+            assert resolver.which('other_app') == join_path(dir_1,
+                                                            'other_app')
+            # The PATH order is followed when it changes
+            open(join_path(dir_2, 'other_app'), 'w').close()
+            os.chmod(join_path(dir_2, 'other_app'), 0o755)
+            os.environ['PATH'] = os.pathsep.join([dir_2, dir_1])
+            assert resolver.which('other_app') == join_path(dir_2,
+                                                            'other_app')
+            os.environ['PATH'] = os.pathsep.join([dir_1, dir_2])
+            # A vanished executable is looked up again
+            os.rename(app_path, join_path(dir_2, 'app'))
+            assert resolver.which('app') == join_path(dir_2, 'app')
+        finally:
+            if sys_path_var is None:
+                del os.environ['PATH']
+            else:
+                os.environ['PATH'] = sys_path_var
+
+
 def test_get_locale():
     """Test get_locale."""
     from locale import getdefaultlocale
@@ -128,5 +167,24 @@ def test_write_size_gib():
     assert utils.write_size(1585558454) == '1.5GiB'
 
 
+def test_stage_timer():
+    """Test StageTimer.report() lists the stages in time order."""
+    stage_timer = utils.StageTimer()
+    stage_timer.mark('first')
+    stage_timer.stages.append(('from another thread', 0.0))
+    stage_timer.mark('second')
+    stages = [line.split('ms')[1].strip() for line in
+              stage_timer.report().splitlines()]
+    assert stages == ['from another thread', 'first', 'second']
+
+
+def test_mark_stage():
+    """Test mark_stage() with and without a StageTimer."""
+    stage_timer = utils.StageTimer()
+    utils.mark_stage(stage_timer, 'first')
+    utils.mark_stage(None, 'not timed')
+    assert [stage for stage, _ in stage_timer.stages] == ['first']
+
+
 if __name__ == '__main__':
     nose.runmodule()
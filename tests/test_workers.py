@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# File name: test_workers.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides tests for workers.py module."""
+
+import time
+
+import nose
+from PyQt5.QtCore import QCoreApplication
+
+from helpers import PYTHON_LIBRARY
+from helpers import FakeExecutablesTest
+from helpers import ProbingTest
+from helpers import python_cmd
+from videomorph.converter.engine import ConversionEngine
+from videomorph.converter.media import MediaList
+from videomorph.converter.profile import ConversionProfile
+from videomorph.forms.workers import ConversionWorker
+from videomorph.forms.workers import MediaProber
+from videomorph.forms.workers import StreamsProber
+
+# Fake conversion library output, run by the Python interpreter
+PROGRESS_SCRIPT = ('import sys, time\n'
+                   'for i in range(1, 4):\n'
+                   '    sys.stdout.write("out_time_us={0}000000\\n'
+                   'progress=continue\\n".format(i))\n'
+                   '    sys.stdout.flush()\n'
+                   '    time.sleep(0.05)\n')
+
+
+class TestConversionWorker(FakeExecutablesTest):
+    """Class for testing ConversionWorker."""
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setup(self):
+        """Setup method."""
+        super(TestConversionWorker, self).setup()
+        self.worker = ConversionWorker(engine=ConversionEngine(
+            library_path=self.fakes.add('ffmpeg', PYTHON_LIBRARY)))
+        self.progress = []
+        self.finished = []
+        self.worker.job_progress.connect(
+            lambda job_id, time_read, bitrate: self.progress.append(
+                (job_id, time_read)))
+        self.worker.job_finished.connect(
+            lambda job_id, returncode, error: self.finished.append(
+                (job_id, returncode)))
+        self.worker.start()
+
+    def teardown(self):
+        """Teardown method."""
+        self.worker.stop()
+        self.worker.wait()
+        super(TestConversionWorker, self).teardown()
+
+    def wait_finished(self, jobs, timeout=30):
+        """Process the worker signals until the jobs have finished."""
+        end_time = time.time() + timeout
+        while len(self.finished) < jobs and time.time() < end_time:
+            self.app.processEvents()
+            time.sleep(0.01)
+
+    def test_submit(self):
+        """Test the progress and end of a job are signaled."""
+        self.worker.submit(build_cmd=python_cmd(PROGRESS_SCRIPT), job_id=7)
+        self.wait_finished(jobs=1)
+        assert self.finished == [(7, 0)]
+        assert self.progress[-1] == (7, 3.0)
+
+    def test_cancel(self):
+        """Test a cancelled job is signaled as finished."""
+        self.worker.submit(
+            build_cmd=python_cmd('import time; time.sleep(30)'), job_id=0)
+        self.worker.cancel(job_id=0)
+        self.wait_finished(jobs=1)
+        assert len(self.finished) == 1
+        assert self.finished[0][1] != 0
+
+
+class TestProbers(ProbingTest):
+    """Class for testing MediaProber and StreamsProber."""
+
+    def setup(self):
+        """Setup method."""
+        super(TestProbers, self).setup()
+        self.media_list = MediaList(profile=ConversionProfile(
+            prober=self.prober))
+
+    def probe(self, prober):
+        """Run a prober in this thread, return the files it sends."""
+        probed = []
+        prober.file_probed.connect(probed.append)
+        prober.run()
+        return probed
+
+    def test_media_prober(self):
+        """Test MediaProber doesn't run the prober for a readable header."""
+        media_file, = self.probe(MediaProber(media_list=self.media_list,
+                                             files_paths=[self.video]))
+        assert media_file.duration == 120.0
+        assert not media_file.has_streams_info
+        assert not self.prober_calls()
+
+    def test_streams_prober(self):
+        """Test StreamsProber probes the streams info of the files."""
+        self.media_list.add_file(next(self.media_list.probe_files(
+            [self.video])))
+        media_file, = self.probe(StreamsProber(media_list=self.media_list,
+                                               media_files=self.media_list))
+        assert media_file.has_streams_info
+        assert media_file.video_stream_info.codec_name == 'h264'
+
+
+if __name__ == '__main__':
+    nose.main()
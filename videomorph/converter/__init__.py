@@ -70,4 +70,14 @@ CPU_CORES = (cpu_count() - 1 if
              cpu_count() is not None
              else 0)
 
+# Conversion jobs to run at once. Every ffmpeg job already uses several
+# threads, so only run more than one job when there are plenty of cores
+CONVERSION_JOBS = max(1, (cpu_count() or 1) // 4)
+
+# Probing is I/O and process spawn bound, so use more workers than cores
+PROBE_WORKERS = min(32, 4 * (cpu_count() or 1))
+
+# Seconds to wait for the prober before giving up on a file
+PROBE_TIMEOUT = 30
+
 VM_PATHS = VMPaths()
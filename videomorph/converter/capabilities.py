@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+# File name: capabilities.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides the LibraryCapabilities class."""
+
+import json
+import re
+from os import makedirs
+from os import replace
+from os import stat
+from os.path import abspath
+from os.path import dirname
+from os.path import join as join_path
+from subprocess import DEVNULL
+from subprocess import PIPE
+from subprocess import run
+from subprocess import SubprocessError
+
+from . import SYS_PATHS
+
+# Options taking an encoder, a muxer or a filter graph as value
+_ENCODER_OPTIONS = re.compile(r'^-(vcodec|acodec|scodec|c|codec)(:[a-z])?$')
+_MUXER_OPTIONS = {'-f'}
+_FILTER_OPTIONS = re.compile(r'^-(vf|af|lavfi|filter_complex|'
+                             r'filter(:[a-z])?)$')
+
+# Separators of the filters in a filter graph
+_FILTER_SEPARATORS = re.compile(r"""((?:[^,;'\\]|\\.|'[^']*')+)""")
+
+
+class LibraryCapabilities:
+    """Encoders, muxers and filters available in the conversion library.
+
+    The library is asked for them once, and they are stored in a JSON
+    file, keyed on the library path, size and modification time, so they
+    are read again only when the library binary changes.
+    """
+
+    _KINDS = ('encoders', 'muxers', 'filters')
+
+    def __init__(self, library_path, cache_path=None):
+        """Class initializer."""
+        if cache_path is None:
+            cache_path = join_path(SYS_PATHS.config,
+                                   'library_capabilities.json')
+        self.library_path = library_path
+        self.cache_path = cache_path
+        self._capabilities = None
+
+    @property
+    def encoders(self):
+        """Return the set of available encoders."""
+        return self._get('encoders')
+
+    @property
+    def muxers(self):
+        """Return the set of available muxers."""
+        return self._get('muxers')
+
+    @property
+    def filters(self):
+        """Return the set of available filters."""
+        return self._get('filters')
+
+    def missing(self, params):
+        """Return the features used by params not available in the library.
+
+        Args:
+            params (sequence): conversion parameters, split as argv
+
+        Return a list of error messages, like those of the library, e.g.
+        "Unknown encoder 'libx265'". Nothing is reported if the library
+        couldn't be asked for its capabilities.
+        """
+        if self._get_capabilities() is None:
+            return []
+
+        missing = []
+        for option, value in zip(params, params[1:]):
+            if _ENCODER_OPTIONS.match(option):
+                if value != 'copy' and value not in self.encoders:
+                    missing.append("Unknown encoder '{0}'".format(value))
+            elif option in _MUXER_OPTIONS:
+                if value not in self.muxers:
+                    missing.append("Unknown muxer '{0}'".format(value))
+            elif _FILTER_OPTIONS.match(option):
+                missing.extend("No such filter: '{0}'".format(name) for
+                               name in _get_filter_names(value) if
+                               name not in self.filters)
+
+        return missing
+
+    def _get(self, kind):
+        """Return the set of available features of a kind."""
+        capabilities = self._get_capabilities()
+        if capabilities is None:
+            return frozenset()
+
+        return capabilities[kind]
+
+    def _get_capabilities(self):
+        """Return the capabilities from the cache file or the library."""
+        if self._capabilities is not None:
+            return self._capabilities
+
+        library_id = _library_id(self.library_path)
+        if library_id is None:
+            return None
+
+        cache = self._read_cache()
+        capabilities = cache.get(library_id)
+        if capabilities is None:
+            capabilities = self._query_library()
+            if capabilities is None:
+                return None
+            # Drop the entries of libraries changed or removed since then
+            cache = {key: value for key, value in cache.items() if
+                     _library_id(key.rsplit('|', 2)[0]) == key}
+            cache[library_id] = capabilities
+            self._write_cache(cache)
+
+        self._capabilities = {kind: frozenset(capabilities[kind]) for
+                              kind in self._KINDS}
+
+        return self._capabilities
+
+    def _query_library(self):
+        """Ask the library for its capabilities, return None on errors."""
+        capabilities = {}
+        for kind in self._KINDS:
+            try:
+                output = run([self.library_path, '-hide_banner',
+                              '-' + kind],
+                             stdout=PIPE, stderr=DEVNULL, stdin=DEVNULL,
+                             timeout=30).stdout
+            except (OSError, SubprocessError):
+                return None
+
+            names = _parse_library_list(output.decode('utf-8', 'replace'),
+                                        kind)
+            if not names:
+                return None
+            capabilities[kind] = sorted(names)
+
+        return capabilities
+
+    def _read_cache(self):
+        """Return the cached capabilities, per library id."""
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cache, dict):
+            return {}
+
+        # Ignore malformed entries
+        return {key: value for key, value in cache.items() if
+                isinstance(value, dict) and
+                all(isinstance(value.get(kind), list) for
+                    kind in self._KINDS)}
+
+    def _write_cache(self, cache):
+        """Store the capabilities, the cache is optional on errors."""
+        tmp_path = self.cache_path + '.tmp'
+        try:
+            makedirs(dirname(abspath(self.cache_path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(cache, cache_file)
+            replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def _library_id(library_path):
+    """Return a string identifying the library binary."""
+    try:
+        library_stat = stat(library_path)
+    except (OSError, TypeError):
+        return None
+
+    return '{0}|{1}|{2}'.format(library_path, library_stat.st_size,
+                                library_stat.st_mtime_ns)
+
+
+def _parse_library_list(output, kind):
+    """Return the names listed by the library -encoders, -muxers, etc."""
+    names = set()
+    in_list = False
+    for line in output.splitlines():
+        fields = line.split()
+        if not fields:
+            continue
+        if kind == 'filters':
+            # e.g. ' TSC scale             V->V       Scale the input video'
+            if len(fields) >= 3 and '->' in fields[2]:
+                names.add(fields[1])
+        elif in_list:
+            # e.g. ' V....D libx264        libx264 H.264 / AVC'
+            #      '  E mp4             MP4 (MPEG-4 Part 14)'
+            if len(fields) >= 2:
+                names.update(fields[1].split(','))
+        elif fields[0].startswith('--'):
+            # The legend ends with a dashed line
+            in_list = True
+
+    return names
+
+
+def _get_filter_names(filter_graph):
+    """Return the names of the filters in a filter graph."""
+    names = []
+    for match in _FILTER_SEPARATORS.finditer(filter_graph):
+        # Remove the link labels, e.g. '[0:v]scale=640:-1[out]'
+        name = re.sub(r'\[[^\]]*\]', '', match.group(1)).strip()
+        name = name.split('=', 1)[0].split('@', 1)[0].strip()
+        if name:
+            names.append(name)
+
+    return names
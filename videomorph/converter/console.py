@@ -20,7 +20,11 @@
 """This module defines the VideoMorph terminal options."""
 
 import argparse
+import asyncio
+import json
 import sys
+from collections import OrderedDict
+from functools import partial
 from os import walk
 from os.path import abspath
 from os.path import exists
@@ -28,13 +32,26 @@ from os.path import isdir
 from os.path import join as join_path
 
 from . import APP_NAME
+from . import CONVERSION_JOBS
 from . import VERSION
 from . import VALID_VIDEO_EXT
+from .capabilities import LibraryCapabilities
+from .engine import ConversionEngine
+from .engine import library_path_factory
+from .media import InvalidMetadataError
+from .media import MediaList
+from .probecache import ProbeCache
+from .profile import ConversionProfile
+from .streamcopy import get_video_encoder
+from .streamcopy import stream_copy_params
+from .utils import remove_file
 
+# Profile options that prevent encoding a file in segments
+_NOT_SEGMENTABLE_OPTIONS = {'-vn', '-map', '-target'}
 
-def run_on_console(app, main_win):
-    """Provide options to run VideoMorph from the command line."""
 
+def create_parser():
+    """Return the parser for the command line options."""
     # Add a parser for command line
     parser = argparse.ArgumentParser(description=APP_NAME + ' ' + VERSION)
 
@@ -51,9 +68,77 @@ def run_on_console(app, main_win):
                         action='store',
                         dest='input_dir')
 
-    # Process the command line input
-    args = parser.parse_args()
+    # Options for the headless mode
+    parser.add_argument('--headless',
+                        help='convert the video files without GUI, printing '
+                             'the progress as JSON lines',
+                        action='store_true',
+                        dest='headless')
+
+    parser.add_argument('-p', '--profile',
+                        help='conversion profile, e.g. MP4 (headless mode)',
+                        action='store',
+                        dest='profile')
+
+    parser.add_argument('-q', '--quality',
+                        help='target quality of the conversion profile, '
+                             'repeat it to get several outputs from a single '
+                             'conversion (headless mode)',
+                        action='append',
+                        dest='quality')
+
+    parser.add_argument('-o', '--output-dir',
+                        help='directory for the converted files '
+                             '(headless mode)',
+                        action='store',
+                        dest='output_dir')
+
+    parser.add_argument('-j', '--jobs',
+                        help='number of conversions to run at once '
+                             '(headless mode)',
+                        action='store',
+                        type=int,
+                        default=CONVERSION_JOBS,
+                        dest='jobs')
+
+    parser.add_argument('--segment-time',
+                        help='encode the files longer than twice this time, '
+                             'in seconds, in segments converted in parallel '
+                             '(headless mode, not with subtitles)',
+                        action='store',
+                        type=float,
+                        dest='segment_time')
+
+    parser.add_argument('-t', '--tag',
+                        help='tag the output files with the quality '
+                             '(headless mode)',
+                        action='store_true',
+                        dest='tag')
+
+    parser.add_argument('-s', '--subtitle',
+                        help='insert the subtitles if available '
+                             '(headless mode)',
+                        action='store_true',
+                        dest='subtitle')
+
+    parser.add_argument('--startup-timing',
+                        help='print a timing of the GUI startup stages',
+                        action='store_true',
+                        dest='startup_timing')
+
+    return parser
+
+
+def is_headless(argv=None):
+    """Return True if VideoMorph must run in headless mode."""
+    if argv is None:
+        argv = sys.argv[1:]
+
+    return '--headless' in argv
+
 
+def get_input_files(args):
+    """Return the video files from the command line arguments."""
     files = []
 
     if args.input_file:
@@ -73,13 +158,243 @@ def run_on_console(app, main_win):
         except FileNotFoundError as error:
             print(error, file=sys.stderr)
 
+    # Avoid duplicated files
+    return list(OrderedDict.fromkeys(files))
+
+
+def run_on_console(main_win):
+    """Provide options to run VideoMorph from the command line."""
+    # Process the command line input
+    args = create_parser().parse_args()
+
+    files = get_input_files(args)
+
     if files:
-        # Avoid duplicated files
-        files_to_add = set(files)
         # Add files
-        main_win.add_media_files(*files_to_add)
-        main_win.show()
-        sys.exit(app.exec_())
+        main_win.add_media_files(*files)
+
+
+def main():
+    """Run VideoMorph from the command line, without GUI."""
+    sys.exit(run_headless())
+
+
+def run_headless(argv=None, library_path=None, prober_path=None,
+                 probe_cache_path=None, capabilities_cache_path=None):
+    """Convert video files without GUI.
+
+    The conversion events are printed to stdout as JSON lines. Every
+    event has an "event" key: "skipped", "progress", "finished" or
+    "summary". Failed jobs report the last library log lines.
+
+    The library and prober are looked up in the system when not given,
+    and the probe and capabilities caches default to the config folder.
+
+    Return the exit status: 0 if all the files were converted, 1 if not.
+    """
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    if not args.profile or not args.quality:
+        parser.error('the --profile and --quality options are required')
+
+    if not args.output_dir or not isdir(args.output_dir):
+        parser.error('the --output-dir option must be an existing directory')
+
+    if args.jobs < 1:
+        parser.error('the --jobs option must be a positive number')
+
+    if args.segment_time is not None and args.segment_time <= 0:
+        parser.error('the --segment-time option must be a positive number')
+
+    library = library_path_factory()
+    library_path = library_path or library.library_path
+    prober_path = prober_path or library.prober_path
+
+    if library_path is None or prober_path is None:
+        print('Conversion library not found', file=sys.stderr)
+        return 1
+
+    profile = ConversionProfile(
+        prober=prober_path,
+        capabilities=LibraryCapabilities(
+            library_path=library_path,
+            cache_path=capabilities_cache_path))
+
+    for quality in args.quality:
+        if not _is_valid_quality(profile, args.profile, quality):
+            parser.error('invalid quality: {0}, for profile: {1}'.format(
+                quality, args.profile))
+
+    # Reject the conversion before starting any job if it's doomed
+    unsupported = profile.get_unsupported_qualities()
+    for quality in args.quality:
+        if quality in unsupported:
+            print('Quality {0} is not supported by the conversion library: '
+                  '{1}'.format(quality, '; '.join(unsupported[quality])),
+                  file=sys.stderr)
+            return 1
+
+    profile.update(new_quality=args.quality[0])
+    encoder = profile.video_encoder
+
+    files = get_input_files(args)
+    if not files:
+        print('No video files to convert', file=sys.stderr)
+        return 1
+
+    media_list = MediaList(profile=profile,
+                           probe_cache=ProbeCache(db_path=probe_cache_path))
+    skipped = 0
+    for media_file in media_list.probe_files(media_list.filter_by_path(files)):
+        try:
+            media_list.add_file(media_file)
+        except InvalidMetadataError as error:
+            skipped += 1
+            _print_event('skipped', input=media_file.input_path,
+                         error=str(error))
+
+    # All the files added are converted, probe their streams info now, so
+    # the conversion commands are built without running the prober on the
+    # event loop thread
+    for _ in media_list.probe_streams(media_list):
+        pass
+
+    loop = _new_event_loop()
+    engine = ConversionEngine(library_path=library_path, max_jobs=args.jobs)
+    jobs = []
+    for position, media_file in enumerate(media_list):
+        submit = engine.submit
+        if _is_segmentable(media_file, args, profile):
+            submit = partial(engine.submit_segmented,
+                             segment_time=args.segment_time)
+        jobs.append(submit(build_cmd=_cmd_builder(media_file, args),
+                           job_id=position,
+                           encoder=encoder,
+                           output_path=media_file.get_output_paths(
+                               args.output_dir, args.quality, args.tag)))
+
+    try:
+        results = loop.run_until_complete(asyncio.gather(
+            *(_watch_job(job, media_list.get_file(job.job_id))
+              for job in jobs)))
+    except KeyboardInterrupt:
+        engine.kill_all()
+        loop.run_until_complete(engine.join())
+        for job in jobs:
+            if job.returncode is not None and job.returncode != 0:
+                _remove_outputs(job)
+        return 1
+    finally:
+        loop.close()
+
+    done = results.count(True)
+    _print_event('summary', done=done, failed=len(results) - done,
+                 skipped=skipped)
+
+    return 0 if done == len(results) and not skipped else 1
+
+
+def _is_valid_quality(profile, profile_name, quality):
+    """Return True if quality is available for profile_name."""
+    for locale in ('en_US', 'es_ES'):
+        qualities = profile.get_xml_profile_qualities(locale)
+        if quality in qualities.get(profile_name.upper(), ()):
+            return True
+
+    return False
+
+
+def _is_segmentable(media_file, args, profile):
+    """Return True if a file must be encoded in segments.
+
+    Args:
+        profile (ConversionProfile): profile updated to the quality
+    """
+    # Subtitles can't be inserted segment by segment, and segments are
+    # encoded to a single output
+    if (args.segment_time is None or args.subtitle or
+            len(set(args.quality)) != 1 or
+            media_file.duration <= 2 * args.segment_time):
+        return False
+
+    # Decide from the params the command is built with: a video copied
+    # from the input has nothing to encode in segments
+    params = stream_copy_params(profile.argv,
+                                video_info=media_file.video_stream_info,
+                                audio_info=media_file.audio_stream_info)
+    # Only the video is encoded in segments, and the other streams are
+    # muxed with the library default mapping. The -target presets also set
+    # the audio and muxing options
+    return (get_video_encoder(params) not in (None, 'copy') and
+            not _NOT_SEGMENTABLE_OPTIONS.intersection(params))
+
+
+def _cmd_builder(media_file, args):
+    """Return a function to build the conversion command of a file."""
+    def build_cmd(threads):
+        return media_file.build_multi_conversion_cmd(
+            output_dir=args.output_dir,
+            target_qualities=args.quality,
+            tagged_output=args.tag,
+            subtitle=args.subtitle,
+            threads=threads)
+
+    return build_cmd
+
+
+async def _watch_job(job, media_file):
+    """Print the events of a conversion job, return True if successful."""
+    async for progress in job:
+        _print_event('progress',
+                     job=job.job_id,
+                     input=media_file.input_path,
+                     time=progress.time,
+                     bitrate=progress.bitrate,
+                     percent=round(min(100.0, 100.0 * progress.time /
+                                       media_file.duration), 1))
+
+    await job.wait()
+    successful = job.returncode == 0
+
+    # The output files are incomplete, but don't remove existing files
+    # when the command couldn't be built
+    if not successful and job.returncode is not None:
+        _remove_outputs(job)
+
+    _print_event('finished',
+                 job=job.job_id,
+                 input=media_file.input_path,
+                 outputs=job.output_path,
+                 status='done' if successful else 'failed',
+                 returncode=job.returncode,
+                 error=job.error,
+                 log=None if successful else list(job.reader.log_tail))
+
+    return successful
+
+
+def _remove_outputs(job):
+    """Remove the output files of a job."""
+    for output_path in job.output_path:
+        remove_file(output_path)
+
+
+def _print_event(event, **fields):
+    """Print a conversion event as a JSON line."""
+    fields['event'] = event
+    print(json.dumps(fields, sort_keys=True), flush=True)
+
+
+def _new_event_loop():
+    """Return a new event loop able to run subprocesses."""
+    if sys.platform == 'win32':
+        loop = asyncio.ProactorEventLoop()
+    else:
+        loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    return loop
 
 
 def search_directory_recursively(directory, files=None):
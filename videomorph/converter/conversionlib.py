@@ -19,40 +19,147 @@
 
 """This module provides the definition of the ConversionLib class."""
 
-import re
-from os.path import isdir
-from os.path import join as join_path
+from collections import OrderedDict
+from functools import partial
 from time import time
 
 from PyQt5.QtCore import QProcess
 
-from . import BASE_DIR
+from . import CONVERSION_JOBS
+from . import CPU_CORES
+from .engine import OutputReader
+from .engine import PROGRESS_ARGS
+from .engine import ThreadBudget
+from .engine import library_path_factory
 from .platformdeps import launcher_factory
-from .platformdeps import generic_factory
 from .utils import write_time
-from .utils import which
 
 
 class ConversionLib:
-    """Conversion Library class."""
+    """Conversion Library class.
 
-    def __init__(self):
+    It runs up to max_jobs conversion jobs at once, each one on its own
+    converter process. Jobs are identified by the job_id given to
+    start_converter().
+    """
+
+    def __init__(self, max_jobs=None):
         """Class initializer."""
         library = library_path_factory()
         self._library_path = library.library_path
         self.prober_path = library.prober_path
-        self._converter = _Converter(library_path=self.library_path)
-        self.error = None
-        self.reader = _OutputReader()
+        self.max_jobs = max_jobs or CONVERSION_JOBS
+        # Library errors of the conversion jobs, by job_id
+        self.errors = OrderedDict()
         self.timer = _ConversionTimer()
+        self._jobs = OrderedDict()
+        self._thread_budget = ThreadBudget(cores=max(1, CPU_CORES))
+        self._reader = None
+        self._finisher = None
+        self._process_channel = QProcess.SeparateChannels
 
-    def __getattr__(self, attr):
-        """Delegate to use instance member objects."""
-        return getattr(self._converter, attr)
-
-    def catch_errors(self):
-        """Catch the library error when running."""
-        self.error = self.reader.catch_library_error()
+    def setup_converter(self, reader, finisher, process_channel):
+        """Set up the callbacks for the conversion jobs.
+
+        Args:
+            reader (callable): called with the job_id of a job with new output
+            finisher (callable): called with the job_id of a finished job
+            process_channel (QProcess.ProcessChannelMode): channel mode
+        """
+        self._reader = reader
+        self._finisher = finisher
+        self._process_channel = process_channel
+
+    def start_converter(self, cmd, job_id=0, output_path=None, duration=None):
+        """Start a conversion job.
+
+        Args:
+            output_path (str): path of the output file, for the caller use
+            duration (float): duration of the input file, for the caller use
+        """
+        job = _ConversionJob(job_id=job_id,
+                             library_path=self.library_path,
+                             output_path=output_path,
+                             duration=duration)
+        if self._reader is not None:
+            job.setup_converter(reader=partial(self._read_job, job),
+                                finisher=partial(self._finish_job, job),
+                                process_channel=self._process_channel)
+        self._jobs[job_id] = job
+        job.start_converter(cmd)
+
+    def allocate_threads(self, job_id, encoder=None, pending_files=1):
+        """Return the number of threads for a job about to start.
+
+        The free cores are split among the jobs that can start now, the
+        cores of a job are freed when it's removed.
+
+        Args:
+            job_id: id of the job to start
+            encoder (str): video encoder used by the job
+            pending_files (int): files left to convert, this one included
+        """
+        starting_jobs = min(self.max_jobs - len(self._jobs), pending_files)
+        return self._thread_budget.allocate(job_id=job_id,
+                                            encoder=encoder,
+                                            starting_jobs=starting_jobs)
+
+    def release_threads(self, job_id):
+        """Free the threads allocated to a job that failed to start."""
+        self._thread_budget.release(job_id)
+
+    def stop_converter(self, job_id=None):
+        """Terminate a conversion job, or all of them if job_id is None."""
+        jobs = self._jobs.values() if job_id is None else [self._jobs[job_id]]
+        for job in jobs:
+            job.stop_converter()
+
+    def abort_converter(self):
+        """Kill all the conversion jobs, the finisher is not called.
+
+        Return the aborted jobs.
+        """
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        self._thread_budget.clear()
+        for job in jobs:
+            job.kill_converter()
+            job.close_converter()
+
+        return jobs
+
+    def get_job(self, job_id):
+        """Return a running conversion job."""
+        return self._jobs[job_id]
+
+    def remove_job(self, job_id):
+        """Remove a finished conversion job and return it."""
+        job = self._jobs.pop(job_id)
+        self._thread_budget.release(job_id)
+        job.close_converter()
+        return job
+
+    def converter_state(self, job_id=0):
+        """Return the state of a conversion job."""
+        return self._jobs[job_id].converter_state()
+
+    def read_converter_output(self, job_id=0):
+        """Return the new output of a conversion job."""
+        return self._jobs[job_id].read_converter_output()
+
+    def read_converter_log(self, job_id=0):
+        """Return the new log of a conversion job."""
+        return self._jobs[job_id].read_converter_log()
+
+    def catch_errors(self, job_id=0):
+        """Catch the library error of a running job.
+
+        The error is kept until the caller clears self.errors, so the
+        errors of several jobs are not lost when others run fine.
+        """
+        error = self._jobs[job_id].reader.catch_library_error()
+        if error is not None:
+            self.errors[job_id] = error
 
     @staticmethod
     def run_player(file_path):
@@ -65,65 +172,32 @@ class ConversionLib:
         """Return the name of the conversion library."""
         return self._library_path
 
-
-class _LibraryPath:
-    """Class to define platform dependent conversion tools."""
-
-    def _get_system_path(self, app):
-        """Return the name of the conversion library installed on system."""
-        local_dir = self._get_local_dir()
-        if isdir(local_dir):
-            return join_path(local_dir, app)
-        if which(app):
-            return which(app)
-        return None  # Not available library
-
-    @property
-    def library_path(self):
-        """Get conversion library path."""
-        return self._get_system_path('ffmpeg')
-
     @property
-    def prober_path(self):
-        """Get prober path."""
-        return self._get_system_path('ffprobe')
-
-    def _get_local_dir(self):
-        """Return the local directory for ffmpeg library."""
-        raise NotImplementedError('Must be implemented in subclasses')
-
-
-class _LinuxLibraryPath(_LibraryPath):
-    """Class to define platform dependent conversion lib for Linux."""
-
-    def _get_local_dir(self):
-        """Return the local directory for ffmpeg library."""
-        return join_path(BASE_DIR, 'ffmpeg')
-
-
-class _Win32LibraryPath(_LibraryPath):
-    """Class to define platform dependent conversion lib for Win32."""
-
-    def _get_local_dir(self):
-        """Return the local directory for ffmpeg library."""
-        return join_path(BASE_DIR, 'ffmpeg', 'bin')
+    def running_jobs(self):
+        """Return the ids of the conversion jobs, in start order."""
+        return list(self._jobs)
 
     @property
-    def library_path(self):
-        path = super(_Win32LibraryPath, self).library_path
-        if path is not None:
-            return path + '.exe'
+    def has_free_slot(self):
+        """Return True if another conversion job can be started."""
+        return len(self._jobs) < self.max_jobs
 
     @property
-    def prober_path(self):
-        path = super(_Win32LibraryPath, self).prober_path
-        if path is not None:
-            return path + '.exe'
+    def converter_is_running(self):
+        """Return True if any conversion job is running."""
+        return any(job.converter_is_running for job in self._jobs.values())
 
+    def _read_job(self, job):
+        """Call the reader when the converter of a job has new output."""
+        # Ignore removed jobs
+        if self._jobs.get(job.job_id) is job:
+            self._reader(job.job_id)
 
-def library_path_factory():
-    """Factory method to create the appropriate lib name."""
-    return generic_factory(parent_class=_LibraryPath)
+    def _finish_job(self, job, *args):
+        """Call the finisher when the converter of a job finishes."""
+        # Ignore removed jobs
+        if self._jobs.get(job.job_id) is job:
+            self._finisher(job.job_id)
 
 
 class _Converter:
@@ -137,12 +211,13 @@ class _Converter:
     def setup_converter(self, reader, finisher, process_channel):
         """Set up the QProcess object."""
         self._process.setProcessChannelMode(process_channel)
-        self._process.readyRead.connect(reader)
+        self._process.readyReadStandardOutput.connect(reader)
+        self._process.readyReadStandardError.connect(reader)
         self._process.finished.connect(finisher)
 
     def start_converter(self, cmd):
         """Start the encoding process."""
-        self._process.start(self._library_path, cmd)
+        self._process.start(self._library_path, PROGRESS_ARGS + cmd)
 
     def stop_converter(self):
         """Terminate the encoding process."""
@@ -170,9 +245,17 @@ class _Converter:
         """Call QProcess.exit_status method."""
         return self._process.exitStatus()
 
+    def wait_for_converter_output(self, msecs=30000):
+        """Call QProcess.waitForReadyRead method."""
+        return self._process.waitForReadyRead(msecs)
+
     def read_converter_output(self):
-        """Call QProcess.readAll method."""
-        return str(self._process.readAll())
+        """Return the new converter stdout (progress) bytes."""
+        return bytes(self._process.readAllStandardOutput())
+
+    def read_converter_log(self):
+        """Return the new converter stderr (log) bytes."""
+        return bytes(self._process.readAllStandardError())
 
     @property
     def converter_is_running(self):
@@ -180,127 +263,111 @@ class _Converter:
         return self._process.state() == QProcess.Running
 
 
-class _OutputReader:
-    """Read the converter output."""
+class _ConversionJob(_Converter):
+    """A conversion job, running on its own converter process."""
 
-    def __init__(self):
+    def __init__(self, job_id, library_path, output_path=None,
+                 duration=None):
         """Class initializer."""
-        self._params_regex = {
-            'bitrate': r'bitrate=[ ]*[0-9]*\.[0-9]*[a-z]*./[a-z]*',
-            'time': r'time=([0-9.:]+) '}
-        self._library_errors = ('Unknown encoder',
-                                'Unrecognized option',
-                                'Invalid argument')
-        self._process_output = None
-
-    def update_read(self, process_output):
-        """Update the process output."""
-        self._process_output = process_output
-
-    def catch_library_error(self):
-        """Process the library errors."""
-        for error in self._library_errors:
-            if error in self._process_output:
-                return error
-
-        return None
-
-    @property
-    def has_time_read(self):
-        """Return the time read."""
-        return self._read_output_param(param='time')
-
-    @property
-    def bitrate(self):
-        """Return the bitrate read."""
-        bitrate_read = self._read_output_param(param='bitrate')
-
-        return bitrate_read[0].split('=')[-1].strip()
-
-    @property
-    def time(self):
-        """Convert time read to seconds."""
-        seconds = 0.0
-        for time_part in self.has_time_read[0].split(':'):
-            seconds = 60 * seconds + float(time_part)
-
-        return seconds
-
-    def _read_output_param(self, param):
-        """Read library output looking for some parameters."""
-        pattern = re.compile(self._params_regex[param])
-
-        return pattern.findall(self._process_output)
+        super(_ConversionJob, self).__init__(library_path)
+        self.job_id = job_id
+        self.output_path = output_path
+        self.duration = duration
+        self.reader = OutputReader()
 
 
 class _ConversionTimer:
-    """Class to process Conversion progress times."""
+    """Class to process Conversion progress times.
+
+    Times are tracked for every running operation (conversion job), the
+    process progress adds up the time converted by all of them.
+    """
 
     def __init__(self):
         """Class initializer."""
-        self._time_jump = 0.0
-        self._partial_time = 0.0
-        self._total_time = 0.0
-
-        self._operation_time_read = 0.0
+        # Seconds converted by the finished operations
+        self._finished_time = 0.0
+        # Seconds converted and start time of the running operations
+        self._operations_time_read = {}
+        self._operations_start_time = {}
 
         self.process_start_time = 0.0
         self.process_cum_time = 0.0
-        self.operation_start_time = 0.0
-        self.operation_cum_time = 0.0
 
-    def update_time(self, op_time_read_sec):
+    def update_time(self, op_time_read_sec, job_id=0):
         """Update ConversionTimer with operation time read from conversion."""
-        self._operation_time_read = op_time_read_sec
+        self._operations_time_read[job_id] = op_time_read_sec
 
     def init_process_start_time(self):
         """Initialize process start time."""
         self.process_start_time = time()
 
-    def init_operation_start_time(self):
+    def init_operation_start_time(self, job_id=0):
         """Initialize the operation time"""
-        self.operation_start_time = time()
+        self._operations_start_time[job_id] = time()
+        self._operations_time_read[job_id] = 0.0
+
+    def finish_operation(self, job_id=0, op_time=None):
+        """Stop tracking an operation.
+
+        Args:
+            job_id: the operation job id
+            op_time (float): seconds to add to the process progress, the
+                last time read by default
+        """
+        time_read = self._operations_time_read.pop(job_id, 0.0)
+        self._operations_start_time.pop(job_id, None)
+        self._finished_time += time_read if op_time is None else op_time
 
     def reset_progress_times(self):
         """Reset the variables used to calculate progress."""
-        self._time_jump = 0.0
-        self._partial_time = 0.0
-        self._total_time = 0.0
-        self.operation_start_time = 0.0
+        self._finished_time = 0.0
+        for job_id in self._operations_time_read:
+            self._operations_time_read[job_id] = 0.0
 
-    def operation_progress(self, file_duration):
+    def operation_progress(self, file_duration, job_id=0):
         """Return the operation progress percentage."""
-        return int(self._operation_time_read / file_duration * 100)
+        return int(self._operations_time_read.get(job_id, 0.0) /
+                   file_duration * 100)
 
     def process_progress(self, list_duration):
         """"Calculate total progress percentage."""
-        if self._partial_time > self._operation_time_read:
-            self._time_jump += self._partial_time
-
-        self._total_time = self._time_jump + self._operation_time_read
-        self._partial_time = self._operation_time_read
+        total_time = (self._finished_time +
+                      sum(self._operations_time_read.values()))
 
-        return int(self._total_time / float(list_duration) * 100)
+        return min(int(total_time / list_duration * 100), 100)
 
-    def operation_remaining_time(self, file_duration):
+    def operation_remaining_time(self, file_duration, job_id=0):
         """Return the operation remaining time."""
-        op_time = self._operation_time(file_duration=file_duration)
+        op_time = self._operation_time(file_duration=file_duration,
+                                       job_id=job_id)
         # Avoid negative time
         try:
-            op_remaining_time = write_time(op_time - self.operation_cum_time)
+            op_remaining_time = write_time(
+                op_time - self.operation_cum_time(job_id))
         except ValueError:
             op_remaining_time = write_time(0)
 
         return op_remaining_time
 
+    def operation_cum_time(self, job_id=0):
+        """Return the time elapsed since the operation started."""
+        start_time = self._operations_start_time.get(job_id)
+        if start_time is None:
+            return 0.0
+
+        return time() - start_time
+
     def update_cum_times(self):
         """Real time computation."""
-        sys_time = time()
-        self.operation_cum_time = sys_time - self.operation_start_time
-        self.process_cum_time = sys_time - self.process_start_time
+        self.process_cum_time = time() - self.process_start_time
 
-    def _operation_time(self, file_duration):
+    def _operation_time(self, file_duration, job_id=0):
         """Estimating operation time."""
-        speed = self.operation_cum_time / self._operation_time_read
+        time_read = self._operations_time_read.get(job_id)
+        if not time_read:
+            return 0.0
+
+        speed = self.operation_cum_time(job_id) / time_read
 
         return file_duration * speed
@@ -0,0 +1,823 @@
+# -*- coding: utf-8 -*-
+#
+# File name: engine.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides a conversion engine that doesn't depend on Qt.
+
+ConversionEngine runs the conversion library on asyncio subprocesses,
+so it can be used without a Qt event loop:
+
+    async def convert(engine, cmd):
+        job = engine.submit(build_cmd=lambda threads: cmd)
+        async for progress in job:
+            print(progress.time, progress.bitrate)
+        return await job.wait()
+"""
+
+import asyncio
+from collections import deque
+from collections import namedtuple
+from glob import glob
+from os.path import basename
+from os.path import dirname
+from os.path import isdir
+from os.path import join as join_path
+from os.path import splitext
+from shutil import rmtree
+from subprocess import DEVNULL
+from subprocess import PIPE
+from tempfile import mkdtemp
+
+from . import BASE_DIR
+from . import CONVERSION_JOBS
+from . import CPU_CORES
+from .platformdeps import generic_factory
+from .streamcopy import video_copy_params
+from .utils import which
+
+# Size of the chunks read from the conversion library output
+_READ_SIZE = 4096
+
+# Options to make the library write its progress as key=value lines to
+# stdout, instead of the status line
+PROGRESS_ARGS = ['-nostats', '-progress', 'pipe:1']
+
+ConversionProgress = namedtuple('ConversionProgress', 'time bitrate')
+
+# Progress block read from the library, missing or N/A fields are None
+ProgressInfo = namedtuple('ProgressInfo', 'frame fps out_time_us total_size '
+                                          'bitrate speed')
+
+
+class ConversionEngine:
+    """Run conversion jobs on asyncio subprocesses.
+
+    Up to max_jobs jobs run at once, the rest wait in a queue. The cores
+    are shared among the running jobs as ConversionLib does.
+    """
+
+    def __init__(self, library_path=None, max_jobs=None):
+        """Class initializer."""
+        if library_path is None:
+            library_path = library_path_factory().library_path
+        self.library_path = library_path
+        self.max_jobs = max_jobs or CONVERSION_JOBS
+        self._thread_budget = ThreadBudget(cores=max(1, CPU_CORES))
+        self._queued_jobs = deque()
+        self._running_jobs = set()
+        self._segmented_jobs = set()
+
+    def submit(self, build_cmd, job_id=None, encoder=None, output_path=None):
+        """Queue a conversion job and return it.
+
+        Call it from the thread running the event loop of the jobs.
+
+        Args:
+            build_cmd (callable): take the number of threads for the job and
+                return the conversion command, it's called when the job
+                starts. Errors raised by it (e.g. FileExistsError) are
+                stored in job.error
+            job_id: id of the job, for the caller use
+            encoder (str): video encoder used by the job
+            output_path (str): path of the output file, for the caller use
+        """
+        job = ConversionJob(build_cmd=build_cmd,
+                            job_id=job_id,
+                            encoder=encoder,
+                            output_path=output_path,
+                            engine=self)
+        self._queued_jobs.append(job)
+        self._start_jobs()
+
+        return job
+
+    def submit_segmented(self, build_cmd, segment_time, job_id=None,
+                         encoder=None, output_path=None):
+        """Queue a conversion job encoded in segments and return it.
+
+        The input video is split at keyframes into segments about
+        segment_time seconds long. The segments are encoded as jobs of
+        this engine, so they run in parallel, and then concatenated into
+        the output file. The audio and subtitle streams are encoded once,
+        from the input file, while the video is concatenated, so there
+        are no gaps at the segments boundaries. Inputs that can't be split
+        (e.g. without timestamps) are converted in a single step.
+
+        Only the headless mode uses it: the GUI runs its jobs on QProcess
+        objects (see ConversionLib), one per file row, and the files with
+        subtitles or several qualities can't be encoded in segments.
+
+        Args:
+            build_cmd (callable): as in submit(). The command must have a
+                single input ('-i' input_path), end with the output path,
+                encode the video and keep the default streams mapping (no
+                '-vn', '-map' or '-target' options)
+            segment_time (float): duration of the segments in seconds
+        """
+        job = SegmentedConversionJob(build_cmd=build_cmd,
+                                     segment_time=segment_time,
+                                     job_id=job_id,
+                                     encoder=encoder,
+                                     output_path=output_path,
+                                     engine=self)
+        self._segmented_jobs.add(job)
+        asyncio.ensure_future(self._run_segmented_job(job))
+
+        return job
+
+    async def join(self):
+        """Wait for all the submitted jobs to finish."""
+        while self.jobs:
+            await asyncio.gather(*(job.wait() for job in self.jobs))
+
+    def cancel_all(self):
+        """Cancel the queued jobs and terminate the running ones."""
+        for job in self.jobs:
+            job.cancel()
+
+    def kill_all(self):
+        """Cancel the queued jobs and kill the running ones."""
+        for job in self.jobs:
+            job.kill()
+
+    @property
+    def jobs(self):
+        """Return the running and queued jobs."""
+        return (list(self._segmented_jobs) + list(self._running_jobs) +
+                list(self._queued_jobs))
+
+    def _start_jobs(self):
+        """Start the queued jobs while there are free job slots."""
+        while self._queued_jobs and len(self._running_jobs) < self.max_jobs:
+            job = self._queued_jobs.popleft()
+            threads = self._thread_budget.allocate(
+                job_id=id(job),
+                encoder=job.encoder,
+                starting_jobs=min(self.max_jobs - len(self._running_jobs),
+                                  len(self._queued_jobs) + 1))
+            self._running_jobs.add(job)
+            asyncio.ensure_future(self._run_job(job, threads))
+
+    async def _run_job(self, job, threads):
+        """Run a conversion job."""
+        try:
+            await job._run(self.library_path, threads)
+        finally:
+            self._running_jobs.discard(job)
+            self._thread_budget.release(id(job))
+            self._start_jobs()
+
+    async def _run_segmented_job(self, job):
+        """Run a conversion job encoded in segments."""
+        try:
+            await job._run_segments()
+        finally:
+            self._segmented_jobs.discard(job)
+
+    def _dequeue(self, job):
+        """Remove a job from the queue, return False if it's not queued."""
+        try:
+            self._queued_jobs.remove(job)
+        except ValueError:
+            return False
+
+        return True
+
+
+class ConversionJob:
+    """A conversion job, run by a ConversionEngine.
+
+    The job is an async iterator over its progress. Progress updates are
+    coalesced, so a slow consumer only gets the latest one.
+    """
+
+    def __init__(self, build_cmd, job_id=None, encoder=None,
+                 output_path=None, engine=None):
+        """Class initializer."""
+        self.job_id = job_id
+        self.encoder = encoder
+        self.output_path = output_path
+        self.returncode = None
+        self.error = None
+        self.cancelled = False
+        self.reader = OutputReader()
+        self._build_cmd = build_cmd
+        self._engine = engine
+        self._process = None
+        self._progress = None
+        self._finished = False
+        self._updated = asyncio.Event()
+        self._done = asyncio.Event()
+
+    def __aiter__(self):
+        """Return the async iterator over the job progress."""
+        return self
+
+    async def __anext__(self):
+        """Return the next progress update of the job."""
+        while self._progress is None:
+            if self._finished:
+                raise StopAsyncIteration
+            await self._updated.wait()
+            self._updated.clear()
+
+        progress, self._progress = self._progress, None
+
+        return progress
+
+    async def wait(self):
+        """Wait for the job to finish and return the library return code."""
+        await self._done.wait()
+        return self.returncode
+
+    def cancel(self):
+        """Cancel the job, terminating the library process if running."""
+        self.cancelled = True
+        if self._engine is not None and self._engine._dequeue(self):
+            self._finish()
+        elif self.is_running:
+            self._process.terminate()
+
+    def kill(self):
+        """Cancel the job, killing the library process if running."""
+        self.cancelled = True
+        if self._engine is not None and self._engine._dequeue(self):
+            self._finish()
+        elif self.is_running:
+            self._process.kill()
+
+    @property
+    def is_running(self):
+        """Return True if the library process is running."""
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def done(self):
+        """Return True if the job has finished."""
+        return self._finished
+
+    async def _run(self, library_path, threads):
+        """Run the conversion library and read its output."""
+        try:
+            if self.cancelled:
+                return
+            try:
+                cmd = self._build_cmd(threads)
+                self._process = await asyncio.create_subprocess_exec(
+                    library_path, *(PROGRESS_ARGS + cmd),
+                    stdin=DEVNULL,
+                    stdout=PIPE,
+                    stderr=PIPE)
+            except Exception as error:
+                # Anything keeping the job from starting is its error, e.g.
+                # an event loop unable to run subprocesses (RuntimeError)
+                self.error = _error_message(error)
+                return
+            if self.cancelled:
+                # Cancelled while the process was starting
+                self._process.terminate()
+            await self._read_output()
+            self.returncode = await self._process.wait()
+        except OSError as error:
+            self.error = str(error)
+        finally:
+            self._finish()
+
+    async def _read_output(self):
+        """Read the library progress and log, from separate pipes."""
+        await asyncio.gather(self._read_progress(), self._read_log())
+
+    async def _read_progress(self):
+        """Read the library progress from stdout."""
+        while True:
+            chunk = await self._process.stdout.read(_READ_SIZE)
+            if not chunk:
+                break
+
+            if self.reader.update_read(chunk) and self.reader.has_time_read:
+                self._set_progress(ConversionProgress(
+                    time=self.reader.time,
+                    bitrate=self.reader.bitrate))
+
+    async def _read_log(self):
+        """Read the library log from stderr, catching its errors."""
+        while True:
+            chunk = await self._process.stderr.read(_READ_SIZE)
+            if not chunk:
+                break
+
+            self.reader.update_log(chunk)
+            if self.error is None and not self.reader.has_time_read:
+                # Catch the library errors only before time read
+                self.error = self.reader.catch_library_error()
+
+    def _set_progress(self, progress):
+        """Set the latest progress of the job."""
+        self._progress = progress
+        self._updated.set()
+
+    def _finish(self):
+        """Mark the job as finished."""
+        self._finished = True
+        self._updated.set()
+        self._done.set()
+
+
+class SegmentedConversionJob(ConversionJob):
+    """A conversion job encoding the segments of its input in parallel.
+
+    Only the video is encoded in segments. All the audio and subtitle
+    streams of the input are encoded once, when the video segments are
+    muxed into the output file, so no encoder priming is added at the
+    segments boundaries.
+
+    The progress time is the sum of the progress of the segments, so it
+    goes from 0 to the input duration as for a regular job.
+
+    It's only used by the headless mode (see run_headless()). The GUI
+    converts each file in a single process, with ConversionLib.
+    """
+
+    def __init__(self, build_cmd, segment_time, job_id=None, encoder=None,
+                 output_path=None, engine=None):
+        """Class initializer."""
+        super(SegmentedConversionJob, self).__init__(build_cmd=build_cmd,
+                                                     job_id=job_id,
+                                                     encoder=encoder,
+                                                     output_path=output_path,
+                                                     engine=engine)
+        self.segment_time = segment_time
+        self._steps = []
+        self._segments_time = []
+
+    def cancel(self):
+        """Cancel the job, terminating the running steps."""
+        self.cancelled = True
+        for step in self._steps:
+            step.cancel()
+
+    def kill(self):
+        """Cancel the job, killing the running steps."""
+        self.cancelled = True
+        for step in self._steps:
+            step.kill()
+
+    @property
+    def is_running(self):
+        """Return True if any step of the job is running."""
+        return any(step.is_running for step in self._steps)
+
+    async def _run_segments(self):
+        """Split the input, encode the segments and mux them."""
+        work_dir = None
+        try:
+            # The command is built here just to check it and take the
+            # input and output paths
+            try:
+                cmd = self._build_cmd(1)
+            except Exception as error:
+                self.error = _error_message(error)
+                return
+            input_path = cmd[cmd.index('-i') + 1]
+            output_path = cmd[-1]
+            work_dir = mkdtemp(prefix='.videomorph-',
+                               dir=dirname(output_path) or None)
+
+            try:
+                segments = await self._split(input_path, work_dir)
+            except _StepError:
+                if self.cancelled:
+                    raise
+                # The library can't split the input, convert it whole
+                self.error = None
+                await self._convert()
+            else:
+                outputs = await self._encode(segments, output_path,
+                                             work_dir)
+                await self._mux(outputs, work_dir)
+            self.returncode = 0
+        except OSError as error:
+            self.error = str(error)
+        except _StepError:
+            pass
+        finally:
+            if work_dir is not None:
+                rmtree(work_dir, ignore_errors=True)
+            self._finish()
+
+    async def _split(self, input_path, work_dir):
+        """Split the input video at keyframes, return the segments paths."""
+        pattern = join_path(work_dir, 'input%05d.mkv')
+        await self._run_steps([lambda threads: [
+            # Generate the missing timestamps, e.g. of MPEG-PS files
+            '-fflags', '+genpts',
+            '-i', input_path,
+            '-map', '0:v:0',
+            '-c', 'copy',
+            '-f', 'segment',
+            '-segment_time', str(self.segment_time),
+            '-reset_timestamps', '1',
+            pattern]])
+
+        segments = sorted(glob(join_path(work_dir, 'input*.mkv')))
+        if not segments:
+            self._fail(error='No segments found')
+
+        return segments
+
+    async def _encode(self, segments, output_path, work_dir):
+        """Encode the segments in parallel, return the encoded paths."""
+        extension = splitext(output_path)[1]
+        outputs = [join_path(work_dir, 'output{0:05d}{1}'.format(i, extension))
+                   for i in range(len(segments))]
+        self._segments_time = [0.0] * len(segments)
+
+        await self._run_steps(
+            [self._segment_cmd_builder(segment, output)
+             for segment, output in zip(segments, outputs)],
+            watch_progress=True)
+
+        return outputs
+
+    async def _convert(self):
+        """Convert the input in a single step, as a regular job."""
+        self._segments_time = [0.0]
+        await self._run_steps([self._build_cmd], watch_progress=True)
+
+    async def _mux(self, outputs, work_dir):
+        """Mux the encoded segments and the input streams into the output.
+
+        The segments are concatenated with the concat demuxer, and the
+        audio and subtitle streams of the input are encoded with the
+        conversion command options. The input video is blocked, so the
+        library selects the same streams as for a regular job.
+        """
+        list_path = join_path(work_dir, 'segments.txt')
+        with open(list_path, 'w', encoding='UTF-8') as list_file:
+            for output in outputs:
+                list_file.write("file '{0}'\n".format(basename(output)))
+
+        await self._run_steps([self._mux_cmd_builder(list_path)])
+
+    def _segment_cmd_builder(self, segment, output):
+        """Return a function to build the conversion command of a segment."""
+        def build_cmd(threads):
+            cmd = self._build_cmd(threads)
+            cmd[cmd.index('-i') + 1] = segment
+            cmd[-1] = output
+            return cmd
+
+        return build_cmd
+
+    def _mux_cmd_builder(self, list_path):
+        """Return a function to build the command muxing the output."""
+        def build_cmd(threads):
+            cmd = self._build_cmd(threads)
+            # Input options, the input and the output options
+            input_start = cmd.index('-i')
+            return (['-f', 'concat', '-safe', '0', '-i', list_path] +
+                    cmd[:input_start] + ['-vn'] +
+                    cmd[input_start:input_start + 2] +
+                    video_copy_params(cmd[input_start + 2:]))
+
+        return build_cmd
+
+    async def _run_steps(self, build_cmds, watch_progress=False):
+        """Run conversion steps on the engine and wait for them."""
+        if self.cancelled:
+            self._fail()
+
+        steps = [self._engine.submit(build_cmd=build_cmd,
+                                     encoder=self.encoder)
+                 for build_cmd in build_cmds]
+        self._steps = steps
+        if self.cancelled:
+            # Cancelled while submitting
+            self.cancel()
+
+        await asyncio.gather(*(self._watch_step(i, step, watch_progress)
+                               for i, step in enumerate(steps)))
+
+        for step in steps:
+            if step.returncode != 0:
+                # Report the log of the failed step
+                self.reader = step.reader
+                self._fail(returncode=step.returncode, error=step.error)
+
+    async def _watch_step(self, index, step, watch_progress):
+        """Update the job progress from a step, stop the others on errors."""
+        async for progress in step:
+            if watch_progress:
+                self._segments_time[index] = progress.time
+                self._set_progress(ConversionProgress(
+                    time=sum(self._segments_time),
+                    bitrate=progress.bitrate))
+
+        await step.wait()
+        if step.returncode != 0:
+            # The job isn't cancelled, it may go on (e.g. if the split
+            # fails), but the other steps are useless now
+            for other_step in self._steps:
+                other_step.cancel()
+
+    def _fail(self, returncode=None, error=None):
+        """Stop the job with the return code and error of a step."""
+        self.returncode = returncode
+        if self.error is None:
+            self.error = error
+        raise _StepError
+
+
+def _error_message(error):
+    """Return the message of an exception, or its name if it has none."""
+    return str(error) or type(error).__name__
+
+
+class _StepError(Exception):
+    """Exception to stop a segmented job when a step fails."""
+    pass
+
+
+class _LibraryPath:
+    """Class to define platform dependent conversion tools."""
+
+    def _get_system_path(self, app):
+        """Return the name of the conversion library installed on system."""
+        local_dir = self._get_local_dir()
+        if isdir(local_dir):
+            return join_path(local_dir, app)
+        # None if not available library
+        return which(app)
+
+    @property
+    def library_path(self):
+        """Get conversion library path."""
+        return self._get_system_path('ffmpeg')
+
+    @property
+    def prober_path(self):
+        """Get prober path."""
+        return self._get_system_path('ffprobe')
+
+    def _get_local_dir(self):
+        """Return the local directory for ffmpeg library."""
+        raise NotImplementedError('Must be implemented in subclasses')
+
+
+class _LinuxLibraryPath(_LibraryPath):
+    """Class to define platform dependent conversion lib for Linux."""
+
+    def _get_local_dir(self):
+        """Return the local directory for ffmpeg library."""
+        return join_path(BASE_DIR, 'ffmpeg')
+
+
+class _Win32LibraryPath(_LibraryPath):
+    """Class to define platform dependent conversion lib for Win32."""
+
+    def _get_local_dir(self):
+        """Return the local directory for ffmpeg library."""
+        return join_path(BASE_DIR, 'ffmpeg', 'bin')
+
+    @property
+    def library_path(self):
+        path = super(_Win32LibraryPath, self).library_path
+        if path is not None:
+            return path + '.exe'
+
+    @property
+    def prober_path(self):
+        path = super(_Win32LibraryPath, self).prober_path
+        if path is not None:
+            return path + '.exe'
+
+
+def library_path_factory():
+    """Factory method to create the appropriate lib name."""
+    return generic_factory(parent_class=_LibraryPath)
+
+
+class _LineBuffer:
+    """Split the bytes read from a process channel into text lines."""
+
+    # Longest partial line kept while waiting for its end
+    MAX_LINE_SIZE = 4096
+
+    def __init__(self):
+        """Class initializer."""
+        self.partial_line = b''
+
+    def split(self, data):
+        """Return the complete lines ended by data, decoded."""
+        lines = (self.partial_line + data).split(b'\n')
+        self.partial_line = lines.pop()[-self.MAX_LINE_SIZE:]
+
+        return [line.decode('utf-8', errors='replace').strip() for
+                line in lines]
+
+
+class OutputReader:
+    """Read the converter output.
+
+    The progress is read from the key=value blocks the library writes to
+    stdout with the PROGRESS_ARGS options, and the log from stderr. Each
+    channel has its own line buffer, so log lines can't break progress
+    lines. The output bytes are parsed incrementally: only new complete
+    lines are decoded and parsed, and just the last log lines are kept,
+    so memory and time per read don't grow with the conversion length.
+    """
+
+    # Log lines kept to report errors
+    MAX_LOG_LINES = 32
+
+    _library_errors = ('Unknown encoder',
+                       'Unrecognized option',
+                       'Invalid argument')
+
+    def __init__(self):
+        """Class initializer."""
+        self.progress = None
+        self.log_tail = deque(maxlen=self.MAX_LOG_LINES)
+        self._block = {}
+        self._progress_buffer = _LineBuffer()
+        self._log_buffer = _LineBuffer()
+        self._error = None
+
+    def update_read(self, process_output):
+        """Parse new progress bytes, return True if progress changed."""
+        updated = False
+        for line in self._progress_buffer.split(process_output):
+            updated = self._parse_line(line) or updated
+
+        return updated
+
+    def update_log(self, process_log):
+        """Parse new log bytes."""
+        for line in self._log_buffer.split(process_log):
+            self._add_log_line(line)
+
+    def catch_library_error(self):
+        """Process the library errors."""
+        if self._error is None:
+            self._error = self._find_library_error(
+                self._log_buffer.partial_line.decode('utf-8',
+                                                     errors='replace'))
+
+        return self._error
+
+    @property
+    def has_time_read(self):
+        """Return True if a time was read."""
+        return (self.progress is not None and
+                self.progress.out_time_us is not None)
+
+    @property
+    def bitrate(self):
+        """Return the bitrate read."""
+        return None if self.progress is None else self.progress.bitrate
+
+    @property
+    def time(self):
+        """Return the time read in seconds."""
+        return self.progress.out_time_us / 1000000
+
+    def _parse_line(self, line):
+        """Parse an output line, return True if a progress block ended."""
+        key, sep, value = line.partition('=')
+        if sep and key == 'progress':
+            self.progress = ProgressInfo(*[self._block.get(field) for field in
+                                           ProgressInfo._fields])
+            self._block = {}
+            return True
+
+        key = _PROGRESS_ALIASES.get(key, key)
+        parse = _PROGRESS_FIELDS.get(key) if sep else None
+        if parse is not None:
+            self._block[key] = parse(value.strip())
+            return False
+
+        # Anything else in the progress channel goes to the log
+        self._add_log_line(line)
+
+        return False
+
+    def _add_log_line(self, line):
+        """Keep a log line, looking for library errors in it."""
+        if line:
+            self.log_tail.append(line)
+            if self._error is None:
+                self._error = self._find_library_error(line)
+
+    def _find_library_error(self, text):
+        """Return the library error found in text, or None."""
+        for error in self._library_errors:
+            if error in text:
+                return error
+
+        return None
+
+
+class ThreadBudget:
+    """Split the available cores among the running conversion jobs.
+
+    The library can't change the threads of a running job, so jobs are
+    balanced when they start: a new job gets its share of the cores left
+    free by the running jobs, including the ones freed by finished jobs.
+    """
+
+    # Encoders that can't use many threads, anything else (x264, x265,
+    # vp9...) scales well with the number of cores
+    ENCODER_MAX_THREADS = {'mpeg1video': 4,
+                           'mpeg2video': 4,
+                           'mpeg4': 4,
+                           'libxvid': 4,
+                           'libvpx': 8,
+                           'libtheora': 1,
+                           'flv': 1,
+                           'h263': 1,
+                           'msmpeg4': 1,
+                           'msmpeg4v2': 1,
+                           'wmv1': 1,
+                           'wmv2': 1}
+
+    def __init__(self, cores):
+        """Class initializer."""
+        self.cores = cores
+        self._threads = {}
+
+    def allocate(self, job_id, encoder=None, starting_jobs=1):
+        """Return the threads for a job and take them from the budget.
+
+        Args:
+            job_id: id of the job
+            encoder (str): video encoder used by the job
+            starting_jobs (int): jobs starting now, sharing the free cores
+        """
+        self.release(job_id)
+        free_cores = self.cores - sum(self._threads.values())
+        threads = max(1, free_cores // max(1, starting_jobs))
+        max_threads = self.ENCODER_MAX_THREADS.get(encoder)
+        if max_threads is not None:
+            threads = min(threads, max_threads)
+
+        self._threads[job_id] = threads
+
+        return threads
+
+    def release(self, job_id):
+        """Return the threads of a job to the budget."""
+        self._threads.pop(job_id, None)
+
+    def clear(self):
+        """Return all the threads to the budget."""
+        self._threads.clear()
+
+
+def _parse_progress_int(value):
+    """Return an int progress value, or None if not available."""
+    try:
+        value = int(value)
+    except ValueError:
+        return None
+
+    # The time is negative before the first frame is written
+    return value if value >= 0 else None
+
+
+def _parse_progress_float(value):
+    """Return a float progress value (e.g. 1.5x), or None if not available."""
+    try:
+        return float(value.rstrip('x'))
+    except ValueError:
+        return None
+
+
+def _parse_progress_text(value):
+    """Return a text progress value, or None if not available."""
+    return None if value == 'N/A' else value
+
+
+_PROGRESS_FIELDS = {'frame': _parse_progress_int,
+                    'fps': _parse_progress_float,
+                    'out_time_us': _parse_progress_int,
+                    'total_size': _parse_progress_int,
+                    'bitrate': _parse_progress_text,
+                    'speed': _parse_progress_float}
+
+# Older library versions only write out_time_ms, in microseconds too
+_PROGRESS_ALIASES = {'out_time_ms': 'out_time_us'}
@@ -19,18 +19,45 @@
 
 """This module provides the definition of MediaList and _MediaFile classes."""
 
-import shlex
+import json
+from collections import OrderedDict
 from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from math import isfinite
 from os import W_OK
 from os import access
 from os import remove
 from os.path import basename
 from os.path import exists
+from os.path import getsize
 from os.path import join as join_path
+from os.path import normcase
+from os.path import realpath
+from subprocess import TimeoutExpired
+from sys import intern
+from threading import Lock
 
 from . import CPU_CORES
+from . import PROBE_TIMEOUT
+from . import PROBE_WORKERS
 from . import STATUS
+from .mediaheader import read_duration
+from .platformdeps import kill_process
 from .platformdeps import spawn_process
+from .streamcopy import stream_copy_params
+from .utils import remove_file
+
+
+# Probe info records, numeric fields are parsed once at probe time and
+# missing fields are None
+FormatInfo = namedtuple('FormatInfo', 'filename nb_streams format_name '
+                                      'format_long_name duration size '
+                                      'bit_rate')
+StreamInfo = namedtuple('StreamInfo', 'codec_name codec_long_name bit_rate '
+                                      'width height sample_rate channels '
+                                      'language')
 
 
 class MediaError(Exception):
@@ -46,16 +73,32 @@ class InvalidMetadataError(MediaError):
 class MediaList(list):
     """Class to store the list of video files to convert."""
 
-    def __init__(self, profile):
+    def __init__(self, profile, probe_cache=None):
         """Class initializer."""
         super(MediaList, self).__init__()
         self._profile = profile
+        self._probe_cache = probe_cache
         self._position = None  # None, no item running, 0, the first item,...
         self.not_added_files = deque()
+        # Index of the files in the list, by normalized path
+        self._paths_index = {}
+        # Duration of the files to convert, updated on every change
+        self._todo_duration = 0.0
+        # Runs of probe_files() in progress
+        self._probe_runs = set()
+
+    def append(self, media_file):
+        """Append a video file to the list."""
+        super(MediaList, self).append(media_file)
+        self._paths_index[self.path_key(media_file.input_path)] = media_file
+        if media_file.status == STATUS.todo:
+            self._todo_duration += media_file.duration
 
     def clear(self):
         """Clear the list of videos."""
         super(MediaList, self).clear()
+        self._paths_index.clear()
+        self._todo_duration = 0.0
         self.position = None
 
     def populate(self, files_paths):
@@ -67,9 +110,10 @@ class MediaList(list):
             Element 1: Total number of video files to process
             Element 2,...: file path for the processed video file
         """
-        files_paths_to_add = self._filter_by_path(files_paths)
+        files_paths_to_add = self.filter_by_path(files_paths)
 
-        if files_paths_to_add is None:
+        # All the files are in the list already
+        if self.length and not files_paths_to_add:
             return
 
         self.not_added_files.clear()
@@ -77,18 +121,137 @@ class MediaList(list):
         # First, it yields the total number of video files to process
         yield len(files_paths_to_add)
 
-        for file in self._media_files_generator(files_paths_to_add):
+        for file in self.probe_files(files_paths_to_add):
             try:
-                self._add_file(file)
+                self.add_file(file)
                 yield file.get_name(with_extension=True)
             except InvalidMetadataError:
                 self.not_added_files.append(file.get_name(with_extension=True))
                 yield file.get_name(with_extension=True)
 
+    def add_file(self, media_file):
+        """Add a video file to the list."""
+        # Invalid metadata: the prober found no valid duration
+        if media_file.duration is None:
+            raise InvalidMetadataError('Invalid file duration')
+
+        # Duration = 0
+        if media_file.duration > 0:
+            self.append(media_file)
+        else:
+            raise InvalidMetadataError('File is zero size')
+
+    def probe_files(self, files_paths):
+        """Yield _MediaFile objects to be added to MediaList.
+
+        Files are probed concurrently by a bounded pool of workers, but
+        they are yielded in the same order as in files_paths. It stops
+        when cancel_probing() is called.
+        """
+        def probe(file_path, probe_run):
+            return _MediaFile(file_path, self._profile, self._probe_cache,
+                              probe_run)
+
+        return self._run_probes(probe, files_paths)
+
+    def probe_streams(self, media_files):
+        """Yield media_files once their streams info is probed.
+
+        The conversion commands need the streams info, so it's probed for
+        the files about to be converted, out of the thread building the
+        commands. It works as probe_files().
+        """
+        def probe(media_file, probe_run):
+            media_file.probe_streams(probe_run=probe_run)
+            return media_file
+
+        return self._run_probes(probe, media_files)
+
+    def _run_probes(self, probe, items):
+        """Yield the results of probe(item, probe_run) for items.
+
+        The probes run concurrently in a bounded pool of workers, but
+        their results are yielded in the same order as items.
+        """
+        items = iter(items)
+        pending = deque()
+        probe_run = _ProbeRun()
+        self._probe_runs.add(probe_run)
+        executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS)
+
+        def submit(item):
+            pending.append(executor.submit(probe, item, probe_run))
+
+        try:
+            # Keep a limited number of probes ahead of the consumer
+            for item in islice(items, 2 * PROBE_WORKERS):
+                submit(item)
+            while pending:
+                result = pending.popleft().result()
+                if probe_run.cancelled:
+                    return
+                for item in islice(items, 1):
+                    submit(item)
+                yield result
+        finally:
+            # The consumer may stop early (e.g. user cancellation), kill
+            # the probes in flight instead of waiting for them
+            for future in pending:
+                future.cancel()
+            probe_run.cancel()
+            executor.shutdown(wait=False)
+            self._probe_runs.discard(probe_run)
+
+    def cancel_probing(self):
+        """Stop the runs of probe_files() in progress.
+
+        It can be called from any thread. The prober processes running are
+        killed, so the runs finish without waiting for them.
+        """
+        for probe_run in list(self._probe_runs):
+            probe_run.cancel()
+
+    def filter_by_path(self, files_paths, pending=None):
+        """Return a list with files to add to media list.
+
+        Args:
+            files_paths (iterable): list of files paths
+            pending (set): keys of the files that are not in the list yet,
+                but will be added later. It's updated with the returned files
+        """
+        if pending is None:
+            pending = set()
+
+        filtered_paths = []
+        for file_path in files_paths:
+            key = self.path_key(file_path)
+            if key not in self._paths_index and key not in pending:
+                pending.add(key)
+                filtered_paths.append(file_path)
+
+        return filtered_paths
+
+    @staticmethod
+    def path_key(file_path):
+        """Return the key of a file in the index of paths."""
+        # Catch symlinked and relative duplicates
+        return normcase(realpath(file_path))
+
     def delete_file(self, position):
         """Delete a video file from the list."""
+        media_file = self[position]
         del self[position]
 
+        if media_file.status == STATUS.todo:
+            self._todo_duration -= media_file.duration
+
+        key = self.path_key(media_file.input_path)
+        if self._paths_index.get(key) is not media_file:
+            # The path resolves to another file since it was added
+            key = next(key for key, file in self._paths_index.items() if
+                       file is media_file)
+        del self._paths_index[key]
+
     def get_file(self, position):
         """Return a file object."""
         return self[position]
@@ -107,7 +270,7 @@ class MediaList(list):
 
     def set_file_status(self, position, status):
         """Set the video file conversion status."""
-        self[position].status = status
+        self._set_status(self[position], status)
 
     def get_file_info(self, position, info_param):
         """Return general streaming info from a video file."""
@@ -129,15 +292,16 @@ class MediaList(list):
     @running_file_status.setter
     def running_file_status(self, status):
         """Set file status."""
-        self._running_file.status = status
+        self._set_status(self._running_file, status)
 
     def running_file_conversion_cmd(self, output_dir, target_quality,
-                                    tagged_output, subtitle):
+                                    tagged_output, subtitle, threads=None):
         """Return the conversion command."""
         return self._running_file.build_conversion_cmd(output_dir,
                                                        target_quality,
                                                        tagged_output,
-                                                       subtitle)
+                                                       subtitle,
+                                                       threads)
 
     def running_file_output_name(self, output_dir, tagged_output):
         """Return the output name."""
@@ -186,52 +350,53 @@ class MediaList(list):
     @property
     def duration(self):
         """Return the duration time of MediaList counting files todo only."""
-        return sum(float(media.get_format_info('duration')) for
-                   media in self if media.status == STATUS.todo)
+        # Avoid negative values caused by floating point rounding
+        return max(self._todo_duration, 0.0)
 
     @property
     def _running_file(self):
         """Return the file currently running."""
         return self[self.position]
 
-    def _add_file(self, media_file):
-        """Add a video file to the list."""
-        # Invalid metadata
-        try:
-            # Duration is not a valid float() argument
-            duration = float(media_file.get_format_info('duration'))
-        except (TypeError, ValueError):
-            raise InvalidMetadataError('Invalid file duration')
-
-        # Duration = 0
-        if duration > 0:
-            self.append(media_file)
-        else:
-            raise InvalidMetadataError('File is zero size')
+    def _set_status(self, media_file, status):
+        """Set a file status and update the duration of files todo."""
+        if media_file.status == STATUS.todo and status != STATUS.todo:
+            self._todo_duration -= media_file.duration
+        elif media_file.status != STATUS.todo and status == STATUS.todo:
+            self._todo_duration += media_file.duration
 
-    def _media_files_generator(self, files_paths):
-        """Yield _MediaFile objects to be added to MediaList."""
-        for file_path in files_paths:
-            yield _MediaFile(file_path, self._profile)
-
-    def _filter_by_path(self, files_paths):
-        """Return a list with files to add to media list."""
-        if self.length:
-            filtered_paths = [file_path for file_path in files_paths if
-                              self._file_not_added(file_path)]
-            if not filtered_paths:
-                return None
+        media_file.status = status
 
-            return filtered_paths
 
-        return files_paths
+class _ProbeRun:
+    """The prober processes running for a call to MediaList.probe_files()."""
 
-    def _file_not_added(self, file_path):
-        """Determine if a video file is already in the list."""
-        for file in self:
-            if file.input_path == file_path:
-                return False
-        return True
+    def __init__(self):
+        """Class initializer."""
+        self.cancelled = False
+        self._processes = set()
+        self._lock = Lock()
+
+    def add(self, process):
+        """Track a prober process, kill it if the run is cancelled."""
+        with self._lock:
+            if self.cancelled:
+                kill_process(process)
+            else:
+                self._processes.add(process)
+
+    def discard(self, process):
+        """Stop tracking a finished prober process."""
+        with self._lock:
+            self._processes.discard(process)
+
+    def cancel(self):
+        """Cancel the run, killing its prober processes."""
+        with self._lock:
+            self.cancelled = True
+            for process in self._processes:
+                kill_process(process)
+            self._processes.clear()
 
 
 class _MediaFile:
@@ -239,21 +404,40 @@ class _MediaFile:
 
     __slots__ = ('input_path',
                  '_profile',
+                 '_probe_cache',
                  'status',
-                 'format_info',
-                 'video_stream_info',
-                 'audio_stream_info',
-                 'sub_stream_info')
+                 'duration',
+                 '_format_info',
+                 '_native_format',
+                 '_video_stream_info',
+                 '_audio_stream_info',
+                 '_sub_stream_info')
 
-    def __init__(self, file_path, profile):
-        """Class initializer."""
+    def __init__(self, file_path, profile, probe_cache=None, probe_run=None):
+        """Class initializer.
+
+        Args:
+            probe_run (_ProbeRun): run tracking the prober of the file
+        """
         self._profile = profile
+        self._probe_cache = probe_cache
         self.input_path = file_path
         self.status = STATUS.todo
-        self.format_info = self._parse_probe_format()
-        self.video_stream_info = self._parse_probe_video_stream()
-        self.audio_stream_info = self._parse_probe_audio_stream()
-        self.sub_stream_info = self._parse_probe_sub_stream()
+        self._video_stream_info = None
+        self._audio_stream_info = None
+        self._sub_stream_info = None
+        # Read the duration from the container header if possible
+        self._format_info = self._read_native_format()
+        self._native_format = self._format_info is not None
+        if not self._native_format:
+            # Only the format is needed to add the file, streams are probed
+            # the first time their info is requested
+            probe_info = self._parse_probe(probe_run=probe_run)
+            self._format_info = self._parse_probe_format(probe_info)
+            # Streams info may be already available in the cache
+            if 'streams' in probe_info:
+                self._set_streams_info(probe_info)
+        self.duration = self._format_info.duration
 
     def get_name(self, with_extension=False):
         """Return the file name."""
@@ -264,49 +448,140 @@ class _MediaFile:
             return full_file_name
         return file_name
 
+    @property
+    def format_info(self):
+        """Return the format info."""
+        # The header reader only provides a few format params
+        if self._native_format:
+            self._load_probe_info()
+        return self._format_info
+
+    @property
+    def video_stream_info(self):
+        """Return the video stream info."""
+        if self._video_stream_info is None:
+            self._load_probe_info()
+        return self._video_stream_info
+
+    @property
+    def audio_stream_info(self):
+        """Return the audio stream info."""
+        if self._audio_stream_info is None:
+            self._load_probe_info()
+        return self._audio_stream_info
+
+    @property
+    def sub_stream_info(self):
+        """Return the subtitle stream info."""
+        if self._sub_stream_info is None:
+            self._load_probe_info()
+        return self._sub_stream_info
+
+    @property
+    def has_streams_info(self):
+        """Return True if the streams info is probed already."""
+        return self._video_stream_info is not None
+
+    def probe_streams(self, probe_run=None):
+        """Probe the streams info, if not probed yet.
+
+        Args:
+            probe_run (_ProbeRun): run tracking the prober of the file
+        """
+        if not self.has_streams_info:
+            self._load_probe_info(probe_run=probe_run)
+
     def get_format_info(self, info_param):
         """Return an info attribute from a given video file."""
-        return self.format_info.get(info_param)
+        info = getattr(self._format_info, info_param, None)
+        if info is None and self._native_format:
+            info = getattr(self.format_info, info_param, None)
+        return info
 
     def build_conversion_cmd(self, output_dir, target_quality,
-                             tagged_output, subtitle):
-        """Return the conversion command."""
+                             tagged_output, subtitle, threads=None):
+        """Return the conversion command.
+
+        Args:
+            threads (int): number of threads for the conversion library,
+                CPU_CORES by default
+        """
+        return self.build_multi_conversion_cmd(output_dir,
+                                               (target_quality,),
+                                               tagged_output,
+                                               subtitle,
+                                               threads)
+
+    def build_multi_conversion_cmd(self, output_dir, target_qualities,
+                                   tagged_output, subtitle, threads=None):
+        """Return a conversion command with an output per target quality.
+
+        The input is read and decoded once by the conversion library for
+        all the outputs. The output files are always tagged when there are
+        several qualities, so their names don't collide.
+
+        Args:
+            target_qualities (iterable): qualities of the outputs
+            threads (int): number of threads for the conversion library,
+                CPU_CORES by default, shared among the outputs
+        """
+        if threads is None:
+            threads = CPU_CORES
+
         if not access(output_dir, W_OK):
             raise PermissionError('Access denied')
 
         if not exists(self.input_path):
             raise FileNotFoundError('Input video file not found')
 
-        # Ensure the conversion_profile is up to date
-        self._profile.update(new_quality=target_quality)
+        target_qualities = self._unique_qualities(target_qualities)
+        tagged_output = tagged_output or len(target_qualities) > 1
+        output_threads = max(1, threads // len(target_qualities))
 
         # Process subtitles if available
         subtitle_opt = self._process_subtitles(subtitle)
 
-        # Get the output path
-        output_path = self.get_output_path(output_dir, tagged_output)
+        cmd = ['-i', self.input_path]
+        for target_quality in target_qualities:
+            # Ensure the conversion_profile is up to date
+            self._profile.update(new_quality=target_quality)
+
+            # Get the output path
+            output_path = self.get_output_path(output_dir, tagged_output)
 
-        if exists(output_path):
-            raise FileExistsError('Video file already exits')
+            if exists(output_path):
+                raise FileExistsError('Video file already exits')
 
-        # Build the conversion command
-        cmd = ['-i', self.input_path] + subtitle_opt + \
-            shlex.split(self._profile.params) + \
-              ['-threads', str(CPU_CORES)] + \
-            ['-y', output_path]
+            # Copy the streams that already match the profile, but the video
+            # must be encoded to burn the subtitles in
+            params = stream_copy_params(
+                self._profile.argv,
+                video_info=(_EMPTY_STREAM_INFO if subtitle_opt else
+                            self.video_stream_info),
+                audio_info=self.audio_stream_info)
+
+            # Add the output to the conversion command
+            cmd += subtitle_opt + params + \
+                ['-threads', str(output_threads)] + \
+                ['-y', output_path]
 
         return cmd
 
+    def get_output_paths(self, output_dir, target_qualities, tagged_output):
+        """Return the output paths of a multiple qualities conversion."""
+        target_qualities = self._unique_qualities(target_qualities)
+        tagged_output = tagged_output or len(target_qualities) > 1
+        output_paths = []
+        for target_quality in target_qualities:
+            self._profile.update(new_quality=target_quality)
+            output_paths.append(self.get_output_path(output_dir,
+                                                     tagged_output))
+
+        return output_paths
+
     def delete_output(self, output_dir, tagged_output):
         """Delete the output file if conversion is stopped."""
-        while True:
-            try:
-                remove(self.get_output_path(output_dir, tagged_output))
-                break
-            except FileNotFoundError:
-                break
-            except PermissionError:
-                continue
+        remove_file(self.get_output_path(output_dir, tagged_output))
 
     def delete_input(self):
         """Delete the input file (and subtitle) when conversion is finished."""
@@ -330,6 +605,11 @@ class _MediaFile:
         output_file_name = tag + self.get_name() + self._profile.extension
         return join_path(output_dir, output_file_name)
 
+    @staticmethod
+    def _unique_qualities(target_qualities):
+        """Return the target qualities without duplicates."""
+        return list(OrderedDict.fromkeys(target_qualities))
+
     @property
     def _subtitle_path(self):
         """Return the subtitle path if exit."""
@@ -355,73 +635,186 @@ class _MediaFile:
 
         return []
 
-    def _probe(self, args):
-        """Return the prober output as a file like object."""
+    def _probe(self, args, probe_run=None):
+        """Return the prober output.
+
+        Both output pipes are drained while waiting for the prober, so a
+        chatty stderr can't fill its pipe and hang it. A prober running
+        longer than PROBE_TIMEOUT is killed.
+
+        Args:
+            probe_run (_ProbeRun): run tracking the prober, to kill it
+        """
         process_args = [self._profile.prober, self.input_path]
         process_args[1:-1] = args
         prober_run = spawn_process(process_args)
+        if probe_run is not None:
+            probe_run.add(prober_run)
+
+        # Leaving the context closes the pipes and reaps the prober
+        with prober_run:
+            try:
+                output, _ = prober_run.communicate(timeout=PROBE_TIMEOUT)
+            except TimeoutExpired:
+                kill_process(prober_run)
+                raise InvalidMetadataError('Prober timed out')
+            finally:
+                if probe_run is not None:
+                    probe_run.discard(prober_run)
+
+        return output
+
+    def _read_native_format(self):
+        """Return the format info read from the container header, or None."""
+        duration = read_duration(self.input_path)
+        if duration is None:
+            return None
+
+        try:
+            size = getsize(self.input_path)
+        except OSError:
+            return None
+
+        return _EMPTY_FORMAT_INFO._replace(filename=self.input_path,
+                                           duration=duration,
+                                           size=size)
+
+    def _load_probe_info(self, probe_run=None):
+        """Probe the format and streams info of the file."""
+        probe_info = self._parse_probe(show_streams=True, probe_run=probe_run)
+        # Keep the format read from the header if the prober failed
+        if 'format' in probe_info or self._format_info is None:
+            self._format_info = self._parse_probe_format(probe_info)
+        self._native_format = False
+        self._set_streams_info(probe_info)
+
+    def _set_streams_info(self, probe_info):
+        """Set the streams info from the prober output."""
+        self._audio_stream_info = self._parse_probe_audio_stream(probe_info)
+        self._sub_stream_info = self._parse_probe_sub_stream(probe_info)
+        # Set last, has_streams_info may be checked from another thread
+        self._video_stream_info = self._parse_probe_video_stream(probe_info)
+
+    def _parse_probe(self, show_streams=False, probe_run=None):
+        """Run the prober and return its output decoded from JSON."""
+        section = 'streams' if show_streams else 'format'
+
+        if self._probe_cache is not None:
+            probe_info = self._probe_cache.get(self.input_path,
+                                               self._profile.prober)
+            if probe_info is not None and section in probe_info:
+                return probe_info
+
+        args = ['-v', 'error', '-print_format', 'json', '-show_format']
+        if show_streams:
+            args.append('-show_streams')
 
-        return prober_run.stdout
+        try:
+            probe_info = json.loads(self._probe(args, probe_run))
+        except (OSError, TypeError, ValueError, InvalidMetadataError):
+            # The prober is missing, failed, hung or the file has no valid
+            # metadata. add_file() rejects files without a valid duration
+            probe_info = {}
+
+        if not isinstance(probe_info, dict):
+            return {}
+
+        # Only cache the output for files with a valid format
+        if self._probe_cache is not None and 'format' in probe_info:
+            self._probe_cache.set(self.input_path, self._profile.prober,
+                                  probe_info)
+
+        return probe_info
+
+    @staticmethod
+    def _parse_section(section, record_fields, record_type):
+        """Return a record with the fields of a probe section parsed."""
+        tags = section.get('tags', {})
+        values = []
+
+        for param, parse in record_fields:
+            if param.startswith('TAG:'):
+                value = tags.get(param[len('TAG:'):])
+            else:
+                value = section.get(param)
+            values.append(None if value is None else parse(value))
+
+        return record_type(*values)
+
+    @classmethod
+    def _parse_probe_stream(cls, probe_info, codec_type):
+        """Parse the first stream of a given type from the prober output."""
+        for stream in probe_info.get('streams', []):
+            if stream.get('codec_type') == codec_type:
+                return cls._parse_section(stream, _STREAM_FIELDS, StreamInfo)
+
+        return _EMPTY_STREAM_INFO
+
+    @classmethod
+    def _parse_probe_format(cls, probe_info):
+        """Parse the prober output."""
+        return cls._parse_section(probe_info.get('format', {}),
+                                  _FORMAT_FIELDS, FormatInfo)
 
-    def _parse_probe(self, selected_params, cmd):
+    @classmethod
+    def _parse_probe_video_stream(cls, probe_info):
         """Parse the prober output."""
-        info = {}
+        return cls._parse_probe_stream(probe_info, 'video')
 
-        with self._probe(cmd) as probe_file:
-            stream_count = -1
+    @classmethod
+    def _parse_probe_audio_stream(cls, probe_info):
+        """Parse the prober output."""
+        return cls._parse_probe_stream(probe_info, 'audio')
 
-            for format_line in probe_file:
-                format_line = format_line.strip()
-                param = format_line.split('=')
+    @classmethod
+    def _parse_probe_sub_stream(cls, probe_info):
+        """Parse the prober output."""
+        return cls._parse_probe_stream(probe_info, 'subtitle')
 
-                if '[STREAM]' in format_line:
-                    stream_count += 1
 
-                if '=' in format_line and param[0] in selected_params:
-                    if not param[0] in info:
-                        info[param[0]] = param[1]
-                    else:
-                        info[param[0] + '_{0}'.format(stream_count)] = param[1]
+def _parse_int(value):
+    """Return value as an int, or None if not valid."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
-        return info
 
-    def _parse_probe_format(self):
-        """Parse the prober output."""
-        selected_params = {'filename',
-                           'nb_streams',
-                           'format_name',
-                           'format_long_name',
-                           'duration',
-                           'size',
-                           'bit_rate'}
-
-        return self._parse_probe(selected_params=selected_params,
-                                 cmd=['-show_format'])
-
-    def _parse_probe_video_stream(self):
-        """Parse the prober output."""
-        selected_params = {'codec_name',
-                           'codec_long_name',
-                           'bit_rate',
-                           'width',
-                           'height'}
+def _parse_float(value):
+    """Return value as a finite float, or None if not valid."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
 
-        return self._parse_probe(selected_params=selected_params,
-                                 cmd=['-show_streams', '-select_streams', 'v'])
+    return value if isfinite(value) else None
 
-    def _parse_probe_audio_stream(self):
-        """Parse the prober output."""
-        selected_params = {'codec_name',
-                           'codec_long_name'}
 
-        return self._parse_probe(selected_params=selected_params,
-                                 cmd=['-show_streams', '-select_streams', 'a'])
+def _parse_name(value):
+    """Return value as an interned string.
 
-    def _parse_probe_sub_stream(self):
-        """Parse the prober output."""
-        selected_params = {'codec_name',
-                           'codec_long_name',
-                           'TAG:language'}
+    Codec and format names repeat across most of the files in a list, so
+    interning them keeps a single copy of each one in memory.
+    """
+    return intern(str(value))
+
+
+_FORMAT_FIELDS = (('filename', str),
+                  ('nb_streams', _parse_int),
+                  ('format_name', _parse_name),
+                  ('format_long_name', _parse_name),
+                  ('duration', _parse_float),
+                  ('size', _parse_int),
+                  ('bit_rate', _parse_int))
+
+_STREAM_FIELDS = (('codec_name', _parse_name),
+                  ('codec_long_name', _parse_name),
+                  ('bit_rate', _parse_int),
+                  ('width', _parse_int),
+                  ('height', _parse_int),
+                  ('sample_rate', _parse_int),
+                  ('channels', _parse_int),
+                  ('TAG:language', _parse_name))
 
-        return self._parse_probe(selected_params=selected_params,
-                                 cmd=['-show_streams', '-select_streams', 's'])
+_EMPTY_FORMAT_INFO = FormatInfo(*[None] * len(FormatInfo._fields))
+_EMPTY_STREAM_INFO = StreamInfo(*[None] * len(StreamInfo._fields))
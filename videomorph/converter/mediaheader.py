@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+#
+# File name: mediaheader.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides a native reader for video container headers.
+
+It reads the duration of some common containers directly from their
+headers, using a few seek-limited reads, so there is no need to spawn
+the prober for them.
+"""
+
+import struct
+from math import isfinite
+from os import fstat
+from os.path import splitext
+
+# Limits to avoid reading too much from a corrupt file
+_MAX_MP4_BOXES = 1024
+_MATROSKA_HEADER_SIZE = 64 * 1024
+_MPEGTS_CHUNK_SIZE = 256 * 1024
+_MAX_DURATION = 30 * 24 * 3600.0
+
+_MATROSKA_IDS = {'ebml': 0x1A45DFA3,
+                 'segment': 0x18538067,
+                 'info': 0x1549A966,
+                 'timecode_scale': 0x2AD7B1,
+                 'duration': 0x4489}
+
+_MPEGTS_SYNC_BYTE = 0x47
+_MPEGTS_PCR_CLOCK = 90000.0
+
+
+def read_duration(file_path):
+    """Return the duration in seconds of a video file, read from its header.
+
+    Return None if the container is not supported, or if the header is
+    missing or suspicious, so the caller can fall back to the prober.
+    """
+    reader = _READERS.get(splitext(file_path)[1].lower())
+    if reader is None:
+        return None
+
+    try:
+        with open(file_path, 'rb') as media_file:
+            duration = reader(media_file)
+    except (OSError, ValueError, IndexError, struct.error):
+        return None
+
+    if (duration is None or not isfinite(duration) or
+            not 0 < duration < _MAX_DURATION):
+        return None
+
+    return duration
+
+
+def _read_at(media_file, offset, size):
+    """Read size bytes from the given offset."""
+    media_file.seek(offset)
+    return media_file.read(size)
+
+
+# MP4/MOV
+
+def _read_mp4_box_header(media_file, offset, end):
+    """Return the (type, size, header size) of the box at offset."""
+    data = _read_at(media_file, offset, 8)
+    if len(data) < 8:
+        return None
+
+    box_size, box_type = struct.unpack('>I4s', data)
+    header_size = 8
+
+    if box_size == 1:
+        box_size = struct.unpack('>Q', _read_at(media_file, offset + 8, 8))[0]
+        header_size = 16
+    elif box_size == 0:
+        # The box extends to the end of its parent
+        box_size = end - offset
+
+    if (box_size < header_size or offset + box_size > end or
+            not all(32 <= char < 127 for char in box_type)):
+        raise ValueError('Invalid MP4 box')
+
+    return box_type, box_size, header_size
+
+
+def _find_mp4_box(media_file, box_type, start, end):
+    """Return the (payload offset, end) of the first box of a given type."""
+    offset = start
+    for _ in range(_MAX_MP4_BOXES):
+        if offset >= end:
+            break
+
+        box = _read_mp4_box_header(media_file, offset, end)
+        if box is None:
+            break
+
+        if box[0] == box_type:
+            return offset + box[2], offset + box[1]
+
+        offset += box[1]
+
+    return None
+
+
+def _read_mp4_duration(media_file):
+    """Read the duration from the mvhd box of MP4/MOV files."""
+    file_size = fstat(media_file.fileno()).st_size
+
+    moov = _find_mp4_box(media_file, b'moov', 0, file_size)
+    if moov is None:
+        return None
+
+    mvhd = _find_mp4_box(media_file, b'mvhd', *moov)
+    if mvhd is None:
+        return None
+
+    data = _read_at(media_file, mvhd[0], 32)
+    if data[0] == 1:
+        timescale, duration = struct.unpack('>IQ', data[20:32])
+        unknown = 0xFFFFFFFFFFFFFFFF
+    else:
+        timescale, duration = struct.unpack('>II', data[12:20])
+        unknown = 0xFFFFFFFF
+
+    if not timescale or duration == unknown:
+        return None
+
+    return duration / timescale
+
+
+# Matroska/WebM
+
+def _read_ebml_vint(data, pos, is_id=False):
+    """Return the (value, next position, unknown) of an EBML variable int."""
+    first = data[pos]
+    length = 1
+    marker = 0x80
+    while not first & marker:
+        marker >>= 1
+        length += 1
+        if length > 8:
+            raise ValueError('Invalid EBML variable size integer')
+
+    if pos + length > len(data):
+        raise ValueError('Truncated EBML data')
+
+    value = first if is_id else first & (marker - 1)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+
+    unknown = not is_id and value == (1 << (7 * length)) - 1
+
+    return value, pos + length, unknown
+
+
+def _read_ebml_element(data, pos):
+    """Return the (id, payload position, payload end) of an EBML element."""
+    element_id, pos, _ = _read_ebml_vint(data, pos, is_id=True)
+    size, pos, unknown = _read_ebml_vint(data, pos)
+    end = len(data) if unknown else pos + size
+
+    return element_id, pos, end, unknown
+
+
+def _read_matroska_duration(media_file):
+    """Read the duration from the Segment Info of Matroska/WebM files."""
+    data = media_file.read(_MATROSKA_HEADER_SIZE)
+
+    element_id, pos, end, _ = _read_ebml_element(data, 0)
+    if element_id != _MATROSKA_IDS['ebml']:
+        return None
+
+    element_id, pos, segment_end, _ = _read_ebml_element(data, end)
+    if element_id != _MATROSKA_IDS['segment']:
+        return None
+
+    # Look for the Info element among the Segment children
+    while pos < min(segment_end, len(data)):
+        element_id, pos, end, unknown = _read_ebml_element(data, pos)
+        if element_id == _MATROSKA_IDS['info']:
+            if end > len(data):
+                return None
+            return _read_matroska_info(data, pos, end)
+        if unknown:
+            # Can't skip an element with unknown size
+            return None
+        pos = end
+
+    return None
+
+
+def _read_matroska_info(data, pos, info_end):
+    """Return the duration from a Matroska Info element."""
+    timecode_scale = 1000000  # Default: 1 ms
+    duration = None
+
+    while pos < info_end:
+        element_id, pos, end, _ = _read_ebml_element(data, pos)
+        if element_id == _MATROSKA_IDS['timecode_scale']:
+            timecode_scale = int.from_bytes(data[pos:end], 'big')
+        elif element_id == _MATROSKA_IDS['duration']:
+            if end - pos == 4:
+                duration = struct.unpack('>f', data[pos:end])[0]
+            elif end - pos == 8:
+                duration = struct.unpack('>d', data[pos:end])[0]
+        pos = end
+
+    if duration is None:
+        return None
+
+    return duration * timecode_scale / 1e9
+
+
+# MPEG-TS
+
+def _find_mpegts_sync(data, packet_size):
+    """Return the offset of the first packet in data, or None."""
+    packets = min(5, len(data) // packet_size)
+    if not packets:
+        return None
+
+    for start in range(min(packet_size, len(data) - packet_size + 1)):
+        if all(data[start + i * packet_size] == _MPEGTS_SYNC_BYTE for
+               i in range(packets) if start + i * packet_size < len(data)):
+            return start
+
+    return None
+
+
+def _iter_mpegts_pcr(data, start, packet_size):
+    """Yield (pid, pcr) for each packet with a PCR in data."""
+    for pos in range(start, len(data) - 11, packet_size):
+        packet = data[pos:pos + 12]
+        if packet[0] != _MPEGTS_SYNC_BYTE:
+            continue
+        has_adaptation = packet[3] & 0x20
+        if has_adaptation and packet[4] >= 7 and packet[5] & 0x10:
+            pid = ((packet[1] & 0x1F) << 8) | packet[2]
+            pcr = ((packet[6] << 25) | (packet[7] << 17) |
+                   (packet[8] << 9) | (packet[9] << 1) | (packet[10] >> 7))
+            yield pid, pcr
+
+
+def _read_mpegts_duration(media_file):
+    """Read the duration from the first and last PCR of MPEG-TS files."""
+    file_size = fstat(media_file.fileno()).st_size
+    head = _read_at(media_file, 0, _MPEGTS_CHUNK_SIZE)
+    tail = _read_at(media_file, max(0, file_size - _MPEGTS_CHUNK_SIZE),
+                    _MPEGTS_CHUNK_SIZE)
+
+    # Plain TS uses 188 bytes packets, M2TS (.mts) uses 192 bytes ones
+    for packet_size in (188, 192):
+        head_start = _find_mpegts_sync(head, packet_size)
+        if head_start is not None:
+            break
+    else:
+        return None
+
+    tail_start = _find_mpegts_sync(tail, packet_size)
+    if tail_start is None:
+        return None
+
+    first = next(_iter_mpegts_pcr(head, head_start, packet_size), None)
+    if first is None:
+        return None
+
+    pcr_pid, first_pcr = first
+    last_pcr = None
+    for pid, pcr in _iter_mpegts_pcr(tail, tail_start, packet_size):
+        if pid == pcr_pid:
+            last_pcr = pcr
+
+    if last_pcr is None:
+        return None
+
+    # The PCR base is a 33 bits counter that may wrap around
+    return ((last_pcr - first_pcr) % (1 << 33)) / _MPEGTS_PCR_CLOCK
+
+
+_READERS = {'.mp4': _read_mp4_duration,
+            '.mov': _read_mp4_duration,
+            '.3gp': _read_mp4_duration,
+            '.f4v': _read_mp4_duration,
+            '.mkv': _read_matroska_duration,
+            '.webm': _read_matroska_duration,
+            '.ts': _read_mpegts_duration,
+            '.mts': _read_mpegts_duration}
@@ -57,6 +57,7 @@ class VMPaths:
         self.icons = 'share/icons'
         self.i18n = 'share/videomorph/translations'
         self.profiles = 'share/videomorph/profiles'
+        self.resources = 'share/videomorph/resources'
         self.sounds = 'share/videomorph/sounds'
         self.doc = 'share/doc/videomorph'
         self.help = join_path(self.doc, 'manual')
@@ -87,6 +88,7 @@ class _Win32Paths(VMPaths):
         self.icons = join_path(program_files, r'VideoMorph\icons')
         self.i18n = join_path(program_files, r'VideoMorph\translations')
         self.profiles = join_path(program_files, r'VideoMorph\profiles')
+        self.resources = join_path(program_files, r'VideoMorph\resources')
         self.sounds = join_path(program_files, r'VideoMorph\sounds')
         self.doc = join_path(program_files, r'VideoMorph\doc')
         self.help = join_path(self.doc, 'manual')
@@ -145,8 +147,9 @@ class _LinuxLauncher(_Launcher):
 
     def open_with_user_app(self, url):
         """Open a file or url with user's preferred app."""
-        if which('xdg-open') is not None:
-            spawn_process([which('xdg-open'), url])
+        xdg_open = which('xdg-open')
+        if xdg_open is not None:
+            spawn_process([xdg_open, url])
         else:
             player = self._get_player()
             spawn_process([which(player), url])
@@ -203,6 +206,10 @@ class _Process:
         """Class to implement external subprocess on different platforms."""
         raise NotImplementedError('Must be implemented in subclasses')
 
+    def kill_process(self, process):
+        """Kill a process spawned by spawn_process()."""
+        raise NotImplementedError('Must be implemented in subclasses')
+
 
 class _LinuxProcess(_Process):
     """Concrete class to implement external subprocess on Linux."""
@@ -216,6 +223,10 @@ class _LinuxProcess(_Process):
                      stderr=PIPE,
                      universal_newlines=True)
 
+    def kill_process(self, process):
+        """Kill a process on Linux."""
+        process.kill()
+
 
 class _Win32Process(_Process):
     """Concrete class to implement external subprocess on Windows."""
@@ -234,7 +245,20 @@ class _Win32Process(_Process):
                      startupinfo=startupinfo,
                      universal_newlines=True)
 
+    def kill_process(self, process):
+        """Kill a process and its children on Windows."""
+        # The process runs under a shell, so kill the whole tree
+        subprocess.call(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL)
+        process.kill()
+
 
 def spawn_process(cmd):
     """Launch processes on different platforms."""
     return generic_factory(parent_class=_Process).spawn_process(cmd=cmd)
+
+
+def kill_process(process):
+    """Kill processes on different platforms."""
+    generic_factory(parent_class=_Process).kill_process(process=process)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# File name: probecache.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides the ProbeCache class."""
+
+import json
+import sqlite3
+from os import makedirs
+from os import stat
+from os.path import abspath
+from os.path import dirname
+from os.path import join as join_path
+from threading import Lock
+from time import time
+
+from . import SYS_PATHS
+
+
+class ProbeCache:
+    """Persistent cache for the prober output, stored in a SQLite database.
+
+    Entries are keyed on the absolute file path, and they are only valid
+    while the file size and modification time, and the prober binary
+    identity, remain the same. The least recently used entries are
+    evicted when the cache grows beyond max_entries.
+    """
+
+    # Number of insertions between two eviction checks
+    _EVICTION_INTERVAL = 128
+
+    def __init__(self, db_path=None, max_entries=100000):
+        """Class initializer."""
+        if db_path is None:
+            db_path = join_path(SYS_PATHS.config, 'probe_cache.sqlite')
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._insertions = 0
+        # Files are probed from several threads
+        self._lock = Lock()
+        self._connection = self._connect()
+
+    def get(self, file_path, prober):
+        """Return the cached prober output for a file, or None."""
+        key = self._file_key(file_path, prober)
+
+        with self._lock:
+            row = None
+            if key is not None:
+                row = self._execute('SELECT size, mtime, prober, info '
+                                    'FROM probes WHERE path = ?',
+                                    (key[0],)).fetchone()
+
+            if row is None or tuple(row[:3]) != key[1:]:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._execute('UPDATE probes SET last_used = ? WHERE path = ?',
+                          (time(), key[0]))
+
+        return json.loads(row[3])
+
+    def set(self, file_path, prober, probe_info):
+        """Store the prober output for a file."""
+        key = self._file_key(file_path, prober)
+        if key is None:
+            return
+
+        with self._lock:
+            self._execute('INSERT OR REPLACE INTO probes VALUES '
+                          '(?, ?, ?, ?, ?, ?)',
+                          key + (json.dumps(probe_info), time()))
+            self._insertions += 1
+            if not self._insertions % self._EVICTION_INTERVAL:
+                self._evict()
+
+    def clear(self):
+        """Remove all the entries from the cache."""
+        with self._lock:
+            self._execute('DELETE FROM probes')
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self):
+        """Return the number of entries in the cache."""
+        with self._lock:
+            row = self._execute('SELECT COUNT(*) FROM probes').fetchone()
+        return row[0] if row is not None else 0
+
+    def _connect(self):
+        """Open the cache database, return None if not available."""
+        try:
+            makedirs(dirname(abspath(self.db_path)), exist_ok=True)
+            connection = sqlite3.connect(self.db_path,
+                                         check_same_thread=False,
+                                         isolation_level=None)
+            # Avoid a disk sync on every write
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS probes ('
+                               'path TEXT PRIMARY KEY, '
+                               'size INTEGER, '
+                               'mtime INTEGER, '
+                               'prober TEXT, '
+                               'info TEXT, '
+                               'last_used REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS probes_last_used '
+                               'ON probes (last_used)')
+        except (OSError, sqlite3.Error):
+            return None
+
+        return connection
+
+    def _execute(self, sql, params=()):
+        """Run a SQL statement, the cache is disabled on database errors."""
+        if self._connection is not None:
+            try:
+                return self._connection.execute(sql, params)
+            except sqlite3.Error:
+                self._connection.close()
+                self._connection = None
+
+        return _EmptyCursor()
+
+    def _evict(self):
+        """Delete the least recently used entries beyond max_entries."""
+        row = self._execute('SELECT COUNT(*) FROM probes').fetchone()
+        if row is not None and row[0] > self.max_entries:
+            self._execute('DELETE FROM probes WHERE path IN ('
+                          'SELECT path FROM probes ORDER BY last_used '
+                          'LIMIT ?)', (row[0] - self.max_entries,))
+
+    def _file_key(self, file_path, prober):
+        """Return the (path, size, mtime, prober) key for a file."""
+        prober_id = self._prober_id(prober)
+        try:
+            file_stat = stat(file_path)
+        except (OSError, TypeError):
+            return None
+
+        if prober_id is None:
+            return None
+
+        return (abspath(file_path), file_stat.st_size,
+                file_stat.st_mtime_ns, prober_id)
+
+    @staticmethod
+    def _prober_id(prober):
+        """Return a string identifying the prober binary."""
+        try:
+            prober_stat = stat(prober)
+        except (OSError, TypeError):
+            return None
+
+        return '{0}:{1}:{2}'.format(prober, prober_stat.st_size,
+                                    prober_stat.st_mtime_ns)
+
+
+class _EmptyCursor:
+    """Cursor returned when the cache database is not available."""
+
+    @staticmethod
+    def fetchone():
+        """Return no row."""
+        return None
@@ -20,7 +20,9 @@
 """This module provides the ConversionProfile class."""
 
 import re
+import shlex
 from collections import OrderedDict
+from collections import namedtuple
 from shutil import copy2
 from os import makedirs
 from os.path import exists, getsize
@@ -34,6 +36,7 @@ from . import SYS_PATHS
 from . import VM_PATHS
 from . import VALID_VIDEO_EXT
 from . import XML_FILES
+from .streamcopy import get_video_encoder
 
 
 class ProfileError(Exception):
@@ -61,13 +64,30 @@ class ProfileExtensionError(ProfileError):
     pass
 
 
+class ProfileUnsupportedParamsError(ProfileError):
+    """Exception for Profile Params unsupported by the library."""
+    pass
+
+
+# Conversion profile data, indexed by quality name
+ProfileEntry = namedtuple('ProfileEntry', 'preset_name preset_params '
+                                          'file_extension preset_name_es '
+                                          'argv')
+
+
 class _XMLProfile:
     """Class to manage the xml profiles file."""
 
-    def __init__(self):
+    def __init__(self, capabilities=None):
         """Class initializer."""
         # Create xml files.
         self._xml_files = XML_FILES
+        # LibraryCapabilities to validate the profiles params
+        self.capabilities = capabilities
+        # Profiles indexed by quality name, and the files mtimes it was
+        # built from
+        self._index = None
+        self._index_mtimes = None
         self._create_xml_files()
 
     def restore_default_profiles(self):
@@ -87,6 +107,10 @@ class _XMLProfile:
         if not params:
             raise ProfileBlankParamsError
 
+        missing = self.get_missing_features(shlex.split(params))
+        if missing:
+            raise ProfileUnsupportedParamsError('; '.join(missing))
+
         if not extension.startswith('.') or extension not in VALID_VIDEO_EXT:
             raise ProfileExtensionError('Invalid video file extension')
 
@@ -119,20 +143,51 @@ class _XMLProfile:
             copy2(src=src_file, dst=dst_directory)
         except OSError:
             raise PermissionError
+        finally:
+            self._index = None
 
     def get_xml_profile_attr(self, target_quality, attr_name='preset_params'):
         """Return a param of ConversionProfile."""
-        param_map = {'preset_name': 0,
-                     'preset_params': 1,
-                     'file_extension': 2,
-                     'preset_name_es': 3}
+        entry = self.get_xml_profile(target_quality)
+        if entry is None:
+            return None
 
-        for xml_file in self._xml_files:
-            for element in self._get_xml_root(xml_file_name=xml_file):
-                for item in element:
-                    if (item[0].text == target_quality or
-                            item[3].text == target_quality):
-                        return item[param_map[attr_name]].text
+        return getattr(entry, attr_name)
+
+    def get_xml_profile(self, target_quality):
+        """Return the ProfileEntry of a quality, or None.
+
+        Qualities can be given by their English or Spanish names.
+        """
+        mtimes = self._xml_files_mtimes()
+        if self._index is None or mtimes != self._index_mtimes:
+            self._index = self._build_index()
+            self._index_mtimes = mtimes
+
+        return self._index.get(target_quality)
+
+    def get_missing_features(self, argv):
+        """Return the features used by argv missing in the library."""
+        if self.capabilities is None:
+            return []
+
+        return self.capabilities.missing(argv)
+
+    def get_unsupported_qualities(self):
+        """Return the qualities the library can't convert to.
+
+        Return a dict of the missing features per quality, by its English
+        and Spanish names.
+        """
+        # Build the index if needed
+        self.get_xml_profile(target_quality=None)
+        unsupported = {}
+        for quality, entry in self._index.items():
+            missing = self.get_missing_features(entry.argv)
+            if missing:
+                unsupported[quality] = missing
+
+        return unsupported
 
     def get_xml_profile_qualities(self, locale):
         """Return a list of available Qualities per conversion profile."""
@@ -158,6 +213,35 @@ class _XMLProfile:
                 qualities.append(item[0].text)
         return qualities
 
+    def _build_index(self):
+        """Return the profiles indexed by English and Spanish quality."""
+        index = {}
+        for xml_file in self._xml_files:
+            for element in self._get_xml_root(xml_file_name=xml_file):
+                for item in element:
+                    entry = ProfileEntry(preset_name=item[0].text,
+                                         preset_params=item[1].text,
+                                         file_extension=item[2].text,
+                                         preset_name_es=item[3].text,
+                                         argv=tuple(shlex.split(
+                                             item[1].text or '')))
+                    # The first profile with a given quality wins
+                    index.setdefault(entry.preset_name, entry)
+                    index.setdefault(entry.preset_name_es, entry)
+
+        return index
+
+    def _xml_files_mtimes(self):
+        """Return the modification times of the xml files."""
+        mtimes = []
+        for xml_file in self._xml_files:
+            try:
+                mtimes.append(getmtime(self._user_xml_file_path(xml_file)))
+            except OSError:
+                mtimes.append(None)
+
+        return tuple(mtimes)
+
     def _user_xml_file_path(self, file_name):
         """Return the path to the profiles file."""
         return join_path(self._user_xml_files_directory(), file_name)
@@ -183,6 +267,9 @@ class _XMLProfile:
             xml_file.write(b'<?xml version="1.0"?>\n')
             ElementTree.ElementTree(xml_tree).write(xml_file, encoding='UTF-8')
 
+        # The mtime may not change within its resolution
+        self._index = None
+
     def _create_xml_files(self):
         """Create a xml file with the conversion profiles."""
         makedirs(self._user_xml_files_directory(), exist_ok=True)
@@ -197,6 +284,7 @@ class _XMLProfile:
         xml_file_user_path = self._user_xml_file_path(file_name)
 
         copy2(src=xml_file_sys_path, dst=xml_file_user_path)
+        self._index = None
 
     def _xml_file_is_correct(self, file_name):
         """Validate xml files in user config directory."""
@@ -262,13 +350,14 @@ class _XMLProfile:
 class ConversionProfile:
     """Base class for a Conversion Profile."""
 
-    def __init__(self, prober):
+    def __init__(self, prober, capabilities=None):
         """Class initializer."""
-        self._xml_profile = _XMLProfile()
+        self._xml_profile = _XMLProfile(capabilities=capabilities)
         self._quality = None
         self.prober = prober
         self.extension = None
         self.params = None
+        self.argv = ()
 
     def __getattr__(self, attr):
         """Delegate to manage the _XMLProfile object."""
@@ -278,12 +367,24 @@ class ConversionProfile:
         """Set the target Quality and other parameters needed to get it."""
         self._quality = new_quality
         # Update the params and extension when the target quality change
-        self.params = self._xml_profile.get_xml_profile_attr(
-            target_quality=self._quality,
-            attr_name='preset_params')
-        self.extension = self._xml_profile.get_xml_profile_attr(
-            target_quality=self._quality,
-            attr_name='file_extension')
+        entry = self._xml_profile.get_xml_profile(target_quality=self._quality)
+        if entry is None:
+            self.params = self.extension = None
+            self.argv = ()
+        else:
+            self.params = entry.preset_params
+            self.extension = entry.file_extension
+            self.argv = entry.argv
+
+    @property
+    def video_encoder(self):
+        """Return the video encoder set in the profile params, or None."""
+        return get_video_encoder(self.argv)
+
+    @property
+    def missing_features(self):
+        """Return the features of the profile missing in the library."""
+        return self._xml_profile.get_missing_features(self.argv)
 
     @property
     def quality_tag(self):
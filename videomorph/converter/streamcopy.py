@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+#
+# File name: streamcopy.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides the stream copy fast path for conversions.
+
+When a stream of the input file already has the codec and parameters a
+profile asks for, the stream is copied to the output instead of being
+encoded again.
+"""
+
+import re
+
+# Options without value
+_FLAGS = {'-vn', '-an', '-sn', '-dn', '-y', '-n', '-shortest'}
+
+# Encoders producing a codec with a different name
+_ENCODER_CODECS = {'libx264': 'h264',
+                   'libx265': 'hevc',
+                   'libxvid': 'mpeg4',
+                   'libvpx': 'vp8',
+                   'libvpx-vp9': 'vp9',
+                   'libtheora': 'theora',
+                   'msmpeg4': 'msmpeg4v3',
+                   'flv': 'flv1',
+                   'libmp3lame': 'mp3',
+                   'libshine': 'mp3',
+                   'libtwolame': 'mp2',
+                   'libvorbis': 'vorbis',
+                   'libopus': 'opus',
+                   'libfdk_aac': 'aac',
+                   'libfaac': 'aac'}
+
+_VIDEO_CODEC_OPTIONS = {'-vcodec', '-c:v', '-codec:v'}
+_AUDIO_CODEC_OPTIONS = {'-acodec', '-c:a', '-codec:a'}
+
+# Options that change the stream, a stream is never copied with them
+_VIDEO_FILTER_OPTIONS = {'-r', '-aspect', '-vf', '-filter:v', '-pix_fmt',
+                         '-target', '-vn'}
+_AUDIO_FILTER_OPTIONS = {'-af', '-filter:a', '-target', '-an'}
+
+# Rate control options, the quality of the input stream can't be known, so
+# a stream is never copied with them either
+_VIDEO_RATE_CONTROL_OPTIONS = {'-crf', '-qp', '-q:v', '-qscale',
+                               '-qscale:v', '-global_quality'}
+_AUDIO_RATE_CONTROL_OPTIONS = {'-q:a', '-qscale:a', '-aq'}
+
+# Encoding options, they are dropped when a stream is copied
+_VIDEO_ENCODING_OPTIONS = {'-s', '-b:v', '-vb', '-crf', '-preset', '-tune',
+                           '-profile:v', '-level', '-g', '-keyint_min',
+                           '-sc_threshold', '-qmin', '-qmax', '-q:v',
+                           '-qscale', '-qscale:v', '-qp', '-bf',
+                           '-b_strategy', '-refs', '-me_range', '-me_method',
+                           '-subq', '-partitions', '-i_qfactor', '-coder',
+                           '-cmp', '-subcmp', '-mbd', '-trellis', '-flags',
+                           '-maxrate', '-minrate', '-bufsize', '-bt',
+                           '-qcomp', '-rc_buf_aggressivity', '-deblockalpha',
+                           '-deblockbeta'}
+_AUDIO_ENCODING_OPTIONS = {'-ar', '-ac', '-b:a', '-ab', '-q:a', '-qscale:a',
+                           '-aq', '-profile:a'}
+
+_VIDEO_BITRATE_OPTIONS = ('-b:v', '-vb', '-maxrate')
+_AUDIO_BITRATE_OPTIONS = ('-b:a', '-ab')
+
+_SIZE_REGEX = re.compile(r'^(\d+)x(\d+)$')
+_BITRATE_REGEX = re.compile(r'^(\d+(?:\.\d+)?)([kKM]?)$')
+_BITRATE_UNITS = {'': 1, 'k': 1000, 'K': 1000, 'M': 1000000}
+
+
+def stream_copy_params(params, video_info, audio_info):
+    """Return the params of a profile, copying the streams that match them.
+
+    Args:
+        params (sequence): params of the conversion profile, split
+        video_info (StreamInfo): info of the input video stream
+        audio_info (StreamInfo): info of the input audio stream
+    Return:
+        The list of params for the conversion command
+    """
+    options = split_params(params)
+    copy_video = _video_matches(options, video_info)
+    copy_audio = _audio_matches(options, audio_info)
+
+    if not copy_video and not copy_audio:
+        return list(params)
+
+    copy_params = []
+    for option, value in options:
+        if copy_video:
+            if option in _VIDEO_CODEC_OPTIONS:
+                value = 'copy'
+            elif option in _VIDEO_ENCODING_OPTIONS:
+                continue
+        if copy_audio:
+            if option in _AUDIO_CODEC_OPTIONS:
+                value = 'copy'
+            elif option in _AUDIO_ENCODING_OPTIONS:
+                continue
+        copy_params.append(option)
+        if value is not None:
+            copy_params.append(value)
+
+    return copy_params
+
+
+def video_copy_params(params):
+    """Return the params of a profile, copying the video stream.
+
+    The video options are dropped, so the params can mux a video stream
+    already encoded with them, while the other streams are encoded.
+
+    Args:
+        params (sequence): params of the conversion profile, split
+    """
+    copy_params = ['-c:v', 'copy']
+    for option, value in split_params(params):
+        if (option in _VIDEO_CODEC_OPTIONS or
+                option in _VIDEO_FILTER_OPTIONS or
+                option in _VIDEO_ENCODING_OPTIONS):
+            continue
+        copy_params.append(option)
+        if value is not None:
+            copy_params.append(value)
+
+    return copy_params
+
+
+def get_video_encoder(params):
+    """Return the video encoder set in the params of a profile, or None.
+
+    Args:
+        params (sequence): params of the conversion profile, split
+    """
+    return _get_option(split_params(params), _VIDEO_CODEC_OPTIONS)
+
+
+def split_params(params):
+    """Return the split params of a profile as a list of (option, value)."""
+    args = list(params)
+    options = []
+    i = 0
+    while i < len(args):
+        if args[i] in _FLAGS or i + 1 == len(args):
+            options.append((args[i], None))
+            i += 1
+        else:
+            options.append((args[i], args[i + 1]))
+            i += 2
+
+    return options
+
+
+def _get_option(options, names):
+    """Return the last value of any of the given options, or None."""
+    value = None
+    for option, option_value in options:
+        # ffmpeg uses the last one if there are several
+        if option in names:
+            value = option_value
+
+    return value
+
+
+def _has_option(options, names):
+    """Return True if any of the given options is present."""
+    return any(option in names for option, _ in options)
+
+
+def _codec_matches(options, codec_options, stream_info):
+    """Return True if the profile encoder produces the stream codec."""
+    encoder = _get_option(options, codec_options)
+    if encoder is None or encoder == 'copy' or stream_info.codec_name is None:
+        return False
+
+    return _ENCODER_CODECS.get(encoder, encoder) == stream_info.codec_name
+
+
+def _bitrate_fits(options, bitrate_options, stream_info):
+    """Return True if the stream bitrate is within the profile bitrate.
+
+    The prober gives no bitrate for the streams of many containers (e.g.
+    Matroska), such a stream doesn't fit if the profile sets a bitrate.
+    """
+    for option in bitrate_options:
+        max_bitrate = _parse_bitrate(_get_option(options, {option}))
+        if max_bitrate is None:
+            continue
+        if stream_info.bit_rate is None or stream_info.bit_rate > max_bitrate:
+            return False
+
+    return True
+
+
+def _video_matches(options, video_info):
+    """Return True if the video stream can be copied."""
+    if (_has_option(options, _VIDEO_FILTER_OPTIONS) or
+            _has_option(options, _VIDEO_RATE_CONTROL_OPTIONS) or
+            not _codec_matches(options, _VIDEO_CODEC_OPTIONS, video_info)):
+        return False
+
+    size = _get_option(options, {'-s'})
+    if size is not None:
+        match = _SIZE_REGEX.match(size)
+        if match is None or (video_info.width, video_info.height) != (
+                int(match.group(1)), int(match.group(2))):
+            return False
+
+    return _bitrate_fits(options, _VIDEO_BITRATE_OPTIONS, video_info)
+
+
+def _audio_matches(options, audio_info):
+    """Return True if the audio stream can be copied."""
+    if (_has_option(options, _AUDIO_FILTER_OPTIONS) or
+            _has_option(options, _AUDIO_RATE_CONTROL_OPTIONS) or
+            not _codec_matches(options, _AUDIO_CODEC_OPTIONS, audio_info)):
+        return False
+
+    for option, stream_value in (('-ar', audio_info.sample_rate),
+                                 ('-ac', audio_info.channels)):
+        value = _get_option(options, {option})
+        if value is not None and (not value.isdigit() or
+                                  int(value) != stream_value):
+            return False
+
+    return _bitrate_fits(options, _AUDIO_BITRATE_OPTIONS, audio_info)
+
+
+def _parse_bitrate(value):
+    """Return a bitrate option value in bits/s, or None."""
+    match = _BITRATE_REGEX.match(value or '')
+    if match is None:
+        return None
+
+    return float(match.group(1)) * _BITRATE_UNITS[match.group(2)]
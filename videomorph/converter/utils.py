@@ -24,6 +24,8 @@ from os.path import exists
 from os.path import pathsep
 from os.path import join as join_path
 from locale import getdefaultlocale
+from threading import Lock
+from time import perf_counter
 
 
 def get_locale():
@@ -33,16 +35,79 @@ def get_locale():
     # return 'es_ES'
 
 
+class ExecutableResolver:
+    """Find executables in the PATH, caching the results per name.
+
+    The cache is cleared when the PATH changes, and a cached executable
+    is looked up again if it doesn't exist anymore. Missing executables
+    are not cached, so the ones installed later are found.
+    """
+
+    def __init__(self):
+        """Class initializer."""
+        self._cache = {}
+        self._sys_path_var = None
+        # Executables are resolved from several threads
+        self._lock = Lock()
+
+    def which(self, app):
+        """Return the path to an executable, or None if not found."""
+        if app == '':
+            raise ValueError('Invalid app name')
+
+        sys_path_var = os.environ.get('PATH', os.defpath)
+        with self._lock:
+            if sys_path_var != self._sys_path_var:
+                self._cache.clear()
+                self._sys_path_var = sys_path_var
+
+            app_path = self._cache.get(app)
+            if app_path is not None and os.access(app_path, os.X_OK):
+                return app_path
+
+            app_path = self._search(app, sys_path_var)
+            if app_path is None:
+                self._cache.pop(app, None)
+            else:
+                self._cache[app] = app_path
+
+        return app_path
+
+    def clear(self):
+        """Remove all the cached executables."""
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _search(app, sys_path_var):
+        """Return the path to an executable walking the PATH entries."""
+        for path in sys_path_var.split(pathsep):
+            app_path = join_path(path, app)
+            if exists(app_path) and os.access(app_path, os.X_OK):
+                return app_path
+
+        return None
+
+
+# Executables resolver shared by the whole app
+RESOLVER = ExecutableResolver()
+
+
 def which(app):
     """Detect if an app is installed in your system."""
-    if app == '':
-        raise ValueError('Invalid app name')
+    return RESOLVER.which(app)
+
 
-    sys_path_var = os.environ.get('PATH', os.defpath)
-    for path in sys_path_var.split(pathsep):
-        app_path = join_path(path, app)
-        if exists(app_path) and os.access(app_path, os.X_OK):
-            return app_path
+def remove_file(file_path):
+    """Remove a file, waiting for it to be released if it's in use."""
+    while True:
+        try:
+            os.remove(file_path)
+            break
+        except FileNotFoundError:
+            break
+        except PermissionError:
+            continue
 
 
 def write_time(time_in_secs):
@@ -89,3 +154,36 @@ def write_size(size_in_bytes):
         return str(round(mib, 1)) + 'MiB'
     gib = mib / 1024
     return str(round(gib, 1)) + 'GiB'
+
+
+class StageTimer:
+    """Timeline of the stages of a process, e.g. the app startup.
+
+    Stages may be marked from several threads, each one is timed from
+    the timer creation.
+    """
+
+    def __init__(self):
+        """Class initializer."""
+        self._start = perf_counter()
+        self.stages = []
+
+    def mark(self, stage):
+        """Record the end of a stage."""
+        self.stages.append((stage, perf_counter() - self._start))
+
+    def report(self):
+        """Return the stages timeline as text."""
+        return '\n'.join('{0:8.1f} ms  {1}'.format(1000 * elapsed, stage) for
+                         stage, elapsed in sorted(self.stages,
+                                                  key=lambda item: item[1]))
+
+
+def mark_stage(stage_timer, stage):
+    """Record the end of a stage, if the process is timed.
+
+    Args:
+        stage_timer (StageTimer): timer of the process, None if not timed
+    """
+    if stage_timer is not None:
+        stage_timer.mark(stage)
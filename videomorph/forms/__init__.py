@@ -24,3 +24,6 @@ from collections import namedtuple
 # Conversion tasks list table columns
 TableColumns = namedtuple('TableColumns', 'NAME DURATION QUALITY PROGRESS')
 COLUMNS = TableColumns(*range(4))
+
+# Milliseconds between conversion progress updates
+PROGRESS_INTERVAL = 200
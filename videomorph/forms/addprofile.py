@@ -29,7 +29,8 @@ from videomorph.converter import VALID_VIDEO_EXT
 from videomorph.converter.profile import (ProfileBlankNameError,
                                           ProfileBlankPresetError,
                                           ProfileBlankParamsError,
-                                          ProfileExtensionError)
+                                          ProfileExtensionError,
+                                          ProfileUnsupportedParamsError)
 
 
 class AddProfileDialog(QDialog):
@@ -151,6 +152,13 @@ class AddProfileDialog(QDialog):
                 self.tr("Command Line Parameters can't be Left Blank")
             )
             self.le_params.setFocus()
+        except ProfileUnsupportedParamsError as error:
+            QMessageBox.critical(
+                self, self.tr('Error!'),
+                self.tr("Command Line Parameters not Supported by the "
+                        "Conversion Library:") + '\n' + str(error)
+            )
+            self.le_params.setFocus()
         except ProfileExtensionError:
             QMessageBox.critical(
                 self, self.tr('Error!'),
@@ -186,27 +186,33 @@ class InfoDialog(QtWidgets.QDialog):
     def _show_video_info(self, position):
         """Show video info on the Info Panel."""
         media_file = self.media_list.get_file(position)
-        file_path = media_file.format_info['filename']
-        filename = basename(file_path)
-        self.label_file_name_value.setText(filename)
+        format_info = media_file.format_info
+        video_info = media_file.video_stream_info
+        audio_info = media_file.audio_stream_info
+        self.label_file_name_value.setText(
+            _info_text(format_info.filename, basename))
         self.label_size_value.setText(
-            write_size(media_file.format_info['size']))
+            _info_text(format_info.size, write_size))
         self.label_duration_value.setText(
-            write_time(media_file.format_info['duration']))
+            _info_text(format_info.duration, write_time))
         self.label_format_name_value.setText(
-            media_file.format_info['format_name'])
+            _info_text(format_info.format_name))
         self.label_format_long_name_value.setText(
-            media_file.format_info['format_long_name'])
+            _info_text(format_info.format_long_name))
 
         self.label_codec_name_value.setText(
-            media_file.video_stream_info['codec_name'])
+            _info_text(video_info.codec_name))
         self.label_codec_long_name_value.setText(
-            media_file.video_stream_info['codec_long_name'])
-        self.label_bit_rate_value.setText(
-            media_file.video_stream_info['bit_rate'])
-        self.label_width_value.setText(media_file.video_stream_info['width'])
-        self.label_height_value.setText(media_file.video_stream_info['height'])
+            _info_text(video_info.codec_long_name))
+        self.label_bit_rate_value.setText(_info_text(video_info.bit_rate))
+        self.label_width_value.setText(_info_text(video_info.width))
+        self.label_height_value.setText(_info_text(video_info.height))
         self.label_acodec_name_value.setText(
-            media_file.audio_stream_info['codec_name'])
+            _info_text(audio_info.codec_name))
         self.label_acodec_long_name_value.setText(
-            media_file.audio_stream_info['codec_long_name'])
+            _info_text(audio_info.codec_long_name))
+
+
+def _info_text(value, format_value=str):
+    """Return the text to show for a probe info value."""
+    return '' if value is None else format_value(value)
@@ -32,7 +32,9 @@ from PyQt5.QtCore import (QSize,
                           QSettings,
                           QDir,
                           QPoint,
-                          QProcess)
+                          QProcess,
+                          QTimer,
+                          pyqtSignal)
 from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtWidgets import (QMainWindow,
                              QWidget,
@@ -54,13 +56,13 @@ from PyQt5.QtWidgets import (QMainWindow,
                              QAbstractItemView,
                              QFileDialog,
                              QMessageBox,
-                             QProgressDialog,
                              QToolButton,
                              qApp)
 
 
 from videomorph.converter import APP_NAME
 from videomorph.converter import BASE_DIR
+from videomorph.converter import CONVERSION_JOBS
 from videomorph.converter import LOCALE
 from videomorph.converter import STATUS
 from videomorph.converter import SYS_PATHS
@@ -68,29 +70,55 @@ from videomorph.converter import VERSION
 from videomorph.converter import VIDEO_FILTERS
 from videomorph.converter import VM_PATHS
 from videomorph.converter.console import search_directory_recursively
-from videomorph.converter.conversionlib import ConversionLib
+from videomorph.converter.media import InvalidMetadataError
 from videomorph.converter.media import MediaList
 from videomorph.converter.platformdeps import PlayerNotFoundError
 from videomorph.converter.platformdeps import launcher_factory
-from videomorph.converter.profile import ConversionProfile
+from videomorph.converter.utils import mark_stage
+from videomorph.converter.utils import remove_file
 from videomorph.converter.utils import write_time
 from . import COLUMNS
-from . import videomorph_qrc
+from . import PROGRESS_INTERVAL
 from .vmwidgets import TasksListTable
 from .about import AboutVMDialog
 from .addprofile import AddProfileDialog
 from .changelog import ChangelogDialog
 from .info import InfoDialog
+from .workers import MediaProber
+from .workers import StartupLoader
+from .workers import StreamsProber
 
 
 class VideoMorphMW(QMainWindow):
-    """VideoMorph Main Window class."""
+    """VideoMorph Main Window class.
 
-    def __init__(self):
+    The conversion library and profiles are loaded in background, once
+    loaded the startup_finished signal is emitted.
+    """
+
+    startup_finished = pyqtSignal()
+
+    def __init__(self, stage_timer=None):
         """Class initializer."""
         super(VideoMorphMW, self).__init__()
 
+        # StageTimer to time the startup, if any
+        self._stage_timer = stage_timer
+
         self.media_list_duration = 0.0
+        # Number of conversion jobs to run at once, 0 means automatic
+        self.conversion_jobs = 0
+
+        # Video files are probed in a background thread
+        self.media_prober = None
+        self._files_to_probe = []
+        self._probing_paths = set()
+        self._probed_files_count = 0
+
+        # The streams info of the files to convert is probed in a
+        # background thread too, the jobs wait for it
+        self.streams_prober = None
+        self._waiting_streams = False
 
         # Window size
         self.resize(680, 576)
@@ -126,27 +154,25 @@ class VideoMorphMW(QMainWindow):
         # Tray Icon
         self._create_sys_tray_icon(icon)
 
-        # Conversion library
+        # Conversion library, profiles and media list, set when the
+        # startup is finished
         self.no_library_msg = self.tr('Ffmpeg Library not Found'
                                       ' in your System')
-        self.conversion_lib = ConversionLib()
-        self.conversion_lib.setup_converter(
-            reader=self._ready_read,
-            finisher=self._finish_file_encoding,
-            process_channel=QProcess.MergedChannels)
-        self.reader = self.conversion_lib.reader
-        self.timer = self.conversion_lib.timer
+        self.conversion_lib = None
+        self.timer = None
+        self.profile = None
+        self.media_list = None
+
+        # The conversion progress is shown periodically, for the jobs
+        # updated since the last time
+        self._updated_jobs = set()
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(PROGRESS_INTERVAL)
+        self._progress_timer.timeout.connect(self._show_conversion_progress)
 
         self._create_initial_settings()
 
-        self.profile = ConversionProfile(
-            prober=self.conversion_lib.prober_path)
-
-        self.media_list = MediaList(profile=self.profile)
-
-        self.populate_profiles_combo()
-
-        self._read_app_settings()
+        self._read_window_settings()
 
         self._create_main_menu()
 
@@ -160,6 +186,50 @@ class VideoMorphMW(QMainWindow):
 
         self._update_ui_when_no_file()
 
+        # Finish the startup in background, the window can be shown
+        self._update_ui_when_loading(loading=True)
+        self.startup_loader = StartupLoader(stage_timer=stage_timer,
+                                            parent=self)
+        self.startup_loader.loaded.connect(self._finish_startup)
+        self.startup_loader.start()
+        mark_stage(self._stage_timer, 'main window created')
+
+    def _finish_startup(self, conversion_lib, profile, probe_cache):
+        """Set up the objects loaded in background."""
+        self.conversion_lib = conversion_lib
+        self.conversion_lib.setup_converter(
+            reader=self._ready_read,
+            finisher=self._finish_file_encoding,
+            process_channel=QProcess.SeparateChannels)
+        self.timer = self.conversion_lib.timer
+
+        self.profile = profile
+        self.media_list = MediaList(profile=self.profile,
+                                    probe_cache=probe_cache)
+
+        self.populate_profiles_combo()
+
+        self._read_app_settings()
+
+        self._update_ui_when_loading(loading=False)
+        mark_stage(self._stage_timer, 'main window ready')
+        self.startup_finished.emit()
+
+    @property
+    def is_loading(self):
+        """Return True if the startup is not finished yet."""
+        return self.conversion_lib is None
+
+    @property
+    def is_converting(self):
+        """Return True if the encoding process is running.
+
+        No job may be running yet while the streams info of the next file
+        to convert is probed.
+        """
+        return (self.conversion_lib.converter_is_running or
+                self._waiting_streams)
+
     def _create_sys_tray_icon(self, icon):
         self.tray_icon_menu = QMenu(self)
         self.tray_icon_menu.addAction(self.open_media_file_action)
@@ -559,22 +629,6 @@ class VideoMorphMW(QMainWindow):
         """Create app status bar."""
         self.statusBar().showMessage(self.tr('Ready'))
 
-    def _create_progress_dialog(self):
-        label = QLabel()
-        label.setAlignment(Qt.AlignLeft)
-        progress_dlg = QProgressDialog(parent=self)
-        progress_dlg.setFixedSize(500, 100)
-        progress_dlg.setWindowTitle(self.tr('Adding Video Files...'))
-        progress_dlg.setCancelButtonText(self.tr('Cancel'))
-        progress_dlg.setLabel(label)
-        progress_dlg.setModal(True)
-        progress_dlg.setMinimum(0)
-        progress_dlg.setMinimumDuration(0)
-        progress_dlg.setMaximum(0)
-        progress_dlg.setValue(0)
-
-        return progress_dlg
-
     def _fix_layout(self):
         """Fix widgets layout."""
         spacer_item = QSpacerItem(20,
@@ -587,7 +641,7 @@ class VideoMorphMW(QMainWindow):
     def _update_edit_triggers(self):
         """Toggle Edit triggers on task table."""
         if (int(self.tb_tasks.currentColumn()) == COLUMNS.QUALITY and not
-                self.conversion_lib.converter_is_running):
+                self.is_converting):
             self.tb_tasks.setEditTriggers(QAbstractItemView.AllEditTriggers)
         else:
             self.tb_tasks.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -595,7 +649,7 @@ class VideoMorphMW(QMainWindow):
                 self.play_input_media_file()
 
         row = self.tb_tasks.currentIndex().row()
-        if self.conversion_lib.converter_is_running:
+        if self.is_converting:
             self._update_ui_when_converter_running()
         elif self.media_list.get_file_status(row) == STATUS.todo:
             self.update_ui_when_ready()
@@ -615,13 +669,17 @@ class VideoMorphMW(QMainWindow):
                                      profile_index=0,
                                      preset_index=0)
 
-    def _read_app_settings(self):
-        """Read the app settings."""
+    def _read_window_settings(self):
+        """Read the main window geometry settings."""
         settings = self._get_settings_file()
         pos = settings.value("pos", QPoint(600, 200), type=QPoint)
         size = settings.value("size", QSize(1096, 510), type=QSize)
         self.resize(size)
         self.move(pos)
+
+    def _read_app_settings(self):
+        """Read the app settings."""
+        settings = self._get_settings_file()
         if 'profile_index' and 'preset_index' in settings.allKeys():
             profile = settings.value('profile_index')
             preset = settings.value('preset_index')
@@ -633,6 +691,12 @@ class VideoMorphMW(QMainWindow):
             self.le_output.setText(output_dir)
         if 'source_dir' in settings.allKeys():
             self.source_dir = str(settings.value('source_dir'))
+        if 'conversion_jobs' in settings.allKeys():
+            # 0 means the number of jobs is set automatically
+            self.conversion_jobs = max(
+                0, int(settings.value('conversion_jobs')))
+            self.conversion_lib.max_jobs = (self.conversion_jobs or
+                                            CONVERSION_JOBS)
 
     def _write_app_settings(self, **app_settings):
         """Write app settings on exit.
@@ -648,7 +712,8 @@ class VideoMorphMW(QMainWindow):
             profile_index=self.cb_profiles.currentIndex(),
             preset_index=self.cb_quality.currentIndex(),
             source_dir=self.source_dir,
-            output_dir=self.le_output.text())
+            output_dir=self.le_output.text(),
+            conversion_jobs=self.conversion_jobs)
 
         if app_settings:
             settings.update(app_settings)
@@ -752,6 +817,13 @@ class VideoMorphMW(QMainWindow):
             combo.addItems(
                 self.profile.get_xml_profile_qualities(
                     LOCALE)[current_profile])
+            # Disable the qualities the conversion library can't convert to
+            unsupported = self.profile.get_unsupported_qualities()
+            for i in range(combo.count()):
+                missing = unsupported.get(combo.itemText(i))
+                if missing:
+                    combo.model().item(i).setEnabled(False)
+                    combo.setItemData(i, '\n'.join(missing), Qt.ToolTipRole)
 
             if self.tb_tasks.rowCount():
                 self._update_media_files_status()
@@ -769,8 +841,12 @@ class VideoMorphMW(QMainWindow):
 
     def closeEvent(self, event):
         """Things to do on close."""
+        if self.is_loading:
+            # Wait for the startup, there is nothing to save yet
+            self.startup_loader.wait()
+            event.accept()
         # Close communication and kill the encoding process
-        if self.conversion_lib.converter_is_running:
+        elif self.is_converting:
             # ask for confirmation
             user_answer = QMessageBox.question(
                 self,
@@ -780,39 +856,110 @@ class VideoMorphMW(QMainWindow):
                 QMessageBox.Yes | QMessageBox.No)
 
             if user_answer == QMessageBox.Yes:
-                # Disconnect the finished signal
-                self.conversion_lib.converter_finished_disconnect(
-                    connected=self._finish_file_encoding)
-                self.conversion_lib.kill_converter()
-                self.conversion_lib.close_converter()
-                self.media_list.delete_running_file_output(
-                    output_dir=self.le_output.text(),
-                    tagged_output=self.chb_tag.checkState())
+                # Kill the conversion jobs and delete their output
+                self._abort_conversion_jobs()
+                self._stop_streams_prober(wait=True)
+                # Stop probing video files
+                self._stop_media_prober(wait=True)
                 # Save settings
                 self._write_app_settings()
                 event.accept()
             else:
                 event.ignore()
         else:
+            # Stop probing video files
+            self._stop_streams_prober(wait=True)
+            self._stop_media_prober(wait=True)
             # Save settings
             self._write_app_settings()
             event.accept()
 
     def _fill_media_list(self, files_paths):
-        """Fill MediaList object with _MediaFile objects."""
-        progress_dlg = self._create_progress_dialog()
+        """Fill MediaList object with _MediaFile objects.
+
+        The files are probed in a background thread and added to the list
+        of conversion tasks as soon as their metadata is ready.
+        """
+        files_paths = self.media_list.filter_by_path(
+            files_paths, pending=self._probing_paths)
+
+        if not files_paths:
+            return
+
+        self._files_to_probe.extend(files_paths)
+
+        # Files added while probing will be probed in the next run
+        if self.media_prober is None:
+            self._start_media_prober()
+
+    def _start_media_prober(self):
+        """Start probing the video files in a background thread."""
+        self.media_prober = MediaProber(media_list=self.media_list,
+                                        files_paths=self._files_to_probe,
+                                        parent=self)
+        self._files_to_probe = []
+        self.media_prober.file_probed.connect(self._add_probed_file)
+        self.media_prober.finished.connect(self._finish_media_probing)
+        self.media_prober.finished.connect(self.media_prober.deleteLater)
+        self.media_prober.start()
+
+    def _stop_media_prober(self, wait=False):
+        """Stop probing video files."""
+        if self.media_prober is not None:
+            self.media_prober.requestInterruption()
+            # Kill the probes in flight instead of waiting for them
+            self.media_list.cancel_probing()
+            if wait:
+                self.media_prober.wait()
+            self.media_prober = None
+
+        self._files_to_probe = []
+        self._probing_paths.clear()
+        self._probed_files_count = 0
+        self.media_list.not_added_files.clear()
+
+    def _add_probed_file(self, media_file):
+        """Add a probed video file to the list of conversion tasks."""
+        # Ignore files from a stopped prober
+        if self.sender() is not self.media_prober:
+            return
 
-        for i, element in enumerate(self.media_list.populate(files_paths)):
-            if not i:  # First element yielded
-                progress_dlg.setMaximum(element)
-            else:  # Second and on...
-                progress_dlg.setLabelText(self.tr('Adding File: ') + element)
-                progress_dlg.setValue(i)
+        self._probed_files_count += 1
 
-            if progress_dlg.wasCanceled():
-                break
+        try:
+            self.media_list.add_file(media_file)
+        except InvalidMetadataError:
+            self.media_list.not_added_files.append(
+                media_file.get_name(with_extension=True))
+        else:
+            self._insert_table_row(row=self.media_list.length - 1)
+            self.media_list_duration = self.media_list.duration
+
+            # The user can start converting the files already added
+            if (not self.is_converting and
+                    not self.convert_action.isEnabled()):
+                self.update_ui_when_ready()
 
-        progress_dlg.close()
+        if not self.is_converting:
+            self.statusBar().showMessage(
+                self.tr('Adding File: ') +
+                media_file.get_name(with_extension=True) +
+                ' ({0}/{1})'.format(self._probed_files_count,
+                                    len(self._probing_paths)))
+
+    def _finish_media_probing(self):
+        """Finish probing video files."""
+        if self.sender() is not self.media_prober:
+            return
+
+        self.media_prober = None
+
+        if self._files_to_probe:
+            self._start_media_prober()
+            return
+
+        if not self.is_converting:
+            self.statusBar().showMessage(self.tr('Ready'))
 
         if self.media_list.not_added_files:
             msg = self.tr('Invalid Video File Information for:') + ' \n - ' + \
@@ -823,11 +970,15 @@ class VideoMorphMW(QMainWindow):
                 title=self.tr('Error!'),
                 msg=msg)
 
-            if not self.media_list.length:
+            if self.is_converting:
+                self._update_ui_when_converter_running()
+            elif not self.media_list.length:
                 self._update_ui_when_no_file()
             else:
                 self.update_ui_when_ready()
 
+        self._stop_media_prober()
+
     def _load_files(self, source_dir=QDir.homePath()):
         """Load video files."""
         files_paths = self._select_files(
@@ -845,34 +996,28 @@ class VideoMorphMW(QMainWindow):
             item.setIcon(QIcon(':/icons/video-in-list.png'))
         self.tb_tasks.setItem(row, column, item)
 
-    def _create_table(self):
-        self.tb_tasks.setRowCount(self.media_list.length)
-        # Call converter_is_running only once
-        converter_is_running = self.conversion_lib.converter_is_running
-        for row in range(self.tb_tasks.rowCount()):
-            self._insert_table_item(
-                item_text=self.media_list.get_file_name(position=row,
-                                                        with_extension=True),
-                row=row, column=COLUMNS.NAME)
-
-            self._insert_table_item(
-                item_text=str(write_time(
-                    self.media_list.get_file_info(
-                        position=row,
-                        info_param='duration'))),
-                row=row, column=COLUMNS.DURATION)
-
-            self._insert_table_item(
-                item_text=str(self.cb_quality.currentText()),
-                row=row, column=COLUMNS.QUALITY)
-
-            if converter_is_running:
-                if row > self.media_list.position:
-                    self._insert_table_item(item_text=self.tr('To Convert'),
-                                            row=row, column=COLUMNS.PROGRESS)
-            else:
-                self._insert_table_item(item_text=self.tr('To Convert'),
-                                        row=row, column=COLUMNS.PROGRESS)
+    def _insert_table_row(self, row):
+        """Insert a video file in the list of conversion tasks."""
+        self.tb_tasks.insertRow(row)
+
+        self._insert_table_item(
+            item_text=self.media_list.get_file_name(position=row,
+                                                    with_extension=True),
+            row=row, column=COLUMNS.NAME)
+
+        self._insert_table_item(
+            item_text=str(write_time(
+                self.media_list.get_file_info(
+                    position=row,
+                    info_param='duration'))),
+            row=row, column=COLUMNS.DURATION)
+
+        self._insert_table_item(
+            item_text=str(self.cb_quality.currentText()),
+            row=row, column=COLUMNS.QUALITY)
+
+        self._insert_table_item(item_text=self.tr('To Convert'),
+                                row=row, column=COLUMNS.PROGRESS)
 
     def add_media_files(self, *files):
         """Add video files to conversion list.
@@ -882,9 +1027,9 @@ class VideoMorphMW(QMainWindow):
         """
         # Update tool buttons so you can convert, or add_file, or clear...
         # only if there is not a conversion process running
-        if self.conversion_lib.converter_is_running:
+        if self.is_converting:
             self._update_ui_when_converter_running()
-        else:
+        elif self.media_list.length:
             # Update the files status
             self._set_media_status()
             # Update ui
@@ -892,8 +1037,6 @@ class VideoMorphMW(QMainWindow):
 
         self._fill_media_list(files)
 
-        self._create_table()
-
         # After adding files to the list, recalculate the list duration
         self.media_list_duration = self.media_list.duration
 
@@ -1085,6 +1228,8 @@ class VideoMorphMW(QMainWindow):
         msg_box.addButton(self.tr("&No"), QMessageBox.RejectRole)
 
         if msg_box.exec_() == QMessageBox.AcceptRole:
+            # Stop adding files to the list
+            self._stop_media_prober()
             # If user says YES clear table of conversion tasks
             self.tb_tasks.clearContents()
             self.tb_tasks.setRowCount(0)
@@ -1097,153 +1242,301 @@ class VideoMorphMW(QMainWindow):
     def start_encoding(self):
         """Start the encoding process."""
         self._update_ui_when_converter_running()
+        self.timer.init_process_start_time()
+        self._progress_timer.start()
+        self._start_conversion_jobs()
 
-        self.media_list.position += 1
-        self.timer.operation_start_time = 0.0
-
-        if self.media_list.running_file_status == STATUS.todo:
-            try:
-                # Fist build the conversion command
-                conversion_cmd = self.media_list.running_file_conversion_cmd(
-                    target_quality=self.tb_tasks.item(
-                        self.media_list.position,
-                        COLUMNS.QUALITY).text(),
-                    output_dir=self.le_output.text(),
-                    tagged_output=self.chb_tag.checkState(),
-                    subtitle=bool(self.chb_subtitle.checkState()))
-                # Then pass it to the _converter
-                self.conversion_lib.start_converter(cmd=conversion_cmd)
-            except PermissionError:
-                self._show_message_box(
-                    type_=QMessageBox.Critical,
-                    title=self.tr('Error!'),
-                    msg=self.tr('Can not Write to Selected Directory'))
-                self._update_ui_when_error_on_conversion()
-            except FileNotFoundError:
-                self._show_message_box(
-                    type_=QMessageBox.Critical,
-                    title=self.tr('Error!'),
-                    msg=(self.tr('Input Video File:') + ' ' +
-                         self.media_list.running_file_name(
-                             with_extension=True) + ' ' +
-                         self.tr('not Found')))
-                self._update_ui_when_error_on_conversion()
-            except FileExistsError:
-                self._show_message_box(
-                    type_=QMessageBox.Critical,
-                    title=self.tr('Error!'),
-                    msg=(self.tr('Video File:') + ' ' +
-                         self.media_list.running_file_output_name(
-                             output_dir=self.le_output.text(),
-                             tagged_output=self.chb_tag.checkState()) + ' ' +
-                         self.tr('Already Exists in '
-                                 'Output Directory. Please, Change the '
-                                 'Output Directory')))
-                self._update_ui_when_error_on_conversion()
-        else:
+    def _start_conversion_jobs(self):
+        """Start converting the files todo while there are free job slots.
+
+        The files are started in order, once their streams info is probed.
+        """
+        self._waiting_streams = False
+        while (self.conversion_lib.has_free_slot and
+               not self.media_list.is_exhausted):
+            media_file = self.media_list.get_file(self.media_list.position + 1)
+            if (media_file.status == STATUS.todo and
+                    not media_file.has_streams_info):
+                # Go on when the streams prober has probed the file
+                self._waiting_streams = True
+                if self.streams_prober is None:
+                    self._start_streams_prober()
+                return
+            self.media_list.position += 1
+            if self.media_list.running_file_status != STATUS.todo:
+                continue
+            self._start_conversion_job(self.media_list.position)
+
+        if not self.conversion_lib.running_jobs:
             self._end_encoding_process()
 
+    def _start_streams_prober(self):
+        """Probe the streams info of the files todo in a background thread."""
+        self.streams_prober = StreamsProber(
+            media_list=self.media_list,
+            media_files=[media_file for media_file in self.media_list if
+                         media_file.status == STATUS.todo and
+                         not media_file.has_streams_info],
+            parent=self)
+        self.streams_prober.file_probed.connect(self._resume_conversion_jobs)
+        self.streams_prober.finished.connect(self._finish_streams_probing)
+        self.streams_prober.finished.connect(self.streams_prober.deleteLater)
+        self.streams_prober.start()
+
+    def _stop_streams_prober(self, wait=False):
+        """Stop probing the streams info of the files."""
+        if self.streams_prober is not None:
+            self.streams_prober.requestInterruption()
+            if wait:
+                # Kill the probes in flight instead of waiting for them
+                self.media_list.cancel_probing()
+                self.streams_prober.wait()
+            self.streams_prober = None
+
+    def _resume_conversion_jobs(self, media_file):
+        """Start the jobs waiting for the streams info of a file."""
+        # Ignore files from a stopped prober
+        if self.sender() is not self.streams_prober:
+            return
+
+        if self._waiting_streams:
+            self._start_conversion_jobs()
+
+    def _finish_streams_probing(self):
+        """Finish probing the streams info of the files."""
+        if self.sender() is not self.streams_prober:
+            return
+
+        media_files = set(self.streams_prober.media_files)
+        self.streams_prober = None
+        if not self._waiting_streams:
+            return
+
+        # Fail the files the prober couldn't probe instead of probing them
+        # again and again
+        for position, media_file in enumerate(self.media_list):
+            if (media_file in media_files and
+                    media_file.status == STATUS.todo and
+                    not media_file.has_streams_info):
+                self._fail_conversion_job(
+                    position,
+                    error=(self.tr('Invalid Video File Information for:') +
+                           ' ' + media_file.get_name(with_extension=True)))
+        # Files set todo while probing need another run
+        self._start_conversion_jobs()
+
+    def _start_conversion_job(self, position):
+        """Start a conversion job for the file at position.
+
+        If the job can't start, the file is marked as failed and the other
+        jobs keep running.
+        """
+        media_file = self.media_list.get_file(position)
+        output_dir = self.le_output.text()
+        tagged_output = self.chb_tag.checkState()
+        target_quality = self.tb_tasks.item(position, COLUMNS.QUALITY).text()
+        self.profile.update(new_quality=target_quality)
+        # Don't take a job slot for a doomed conversion
+        missing = self.profile.missing_features
+        if missing:
+            self._fail_conversion_job(
+                position,
+                error=(self.tr('Target Quality:') + ' ' + target_quality +
+                       ' ' +
+                       self.tr('is not Supported by the Conversion Library') +
+                       '\n' + '\n'.join(missing)))
+            return
+        # Share the cores among the jobs, according to the video encoder
+        threads = self.conversion_lib.allocate_threads(
+            job_id=position,
+            encoder=self.profile.video_encoder,
+            pending_files=self.media_list.length - position)
+        try:
+            # Fist build the conversion command
+            conversion_cmd = media_file.build_conversion_cmd(
+                target_quality=target_quality,
+                output_dir=output_dir,
+                tagged_output=tagged_output,
+                subtitle=bool(self.chb_subtitle.checkState()),
+                threads=threads)
+            # Then start a new conversion job with it. The output path
+            # depends on the quality, so store it while it's up to date
+            self.conversion_lib.start_converter(
+                cmd=conversion_cmd,
+                job_id=position,
+                output_path=media_file.get_output_path(output_dir,
+                                                       tagged_output),
+                duration=media_file.duration)
+            self.timer.init_operation_start_time(job_id=position)
+        except PermissionError:
+            self._fail_conversion_job(
+                position,
+                error=self.tr('Can not Write to Selected Directory'))
+        except FileNotFoundError:
+            self._fail_conversion_job(
+                position,
+                error=(self.tr('Input Video File:') + ' ' +
+                       media_file.get_name(with_extension=True) + ' ' +
+                       self.tr('not Found')))
+        except FileExistsError:
+            self._fail_conversion_job(
+                position,
+                error=(self.tr('Video File:') + ' ' +
+                       media_file.get_output_file_name(
+                           output_dir=output_dir,
+                           tagged_output=tagged_output) + ' ' +
+                       self.tr('Already Exists in '
+                               'Output Directory. Please, Change the '
+                               'Output Directory')))
+
+    def _fail_conversion_job(self, position, error):
+        """Mark the file at position as failed to start converting.
+
+        The error is reported along with the library errors at the end of
+        the encoding process.
+        """
+        self.conversion_lib.release_threads(job_id=position)
+        self.conversion_lib.errors[position] = error
+        # Don't convert the file again in this process
+        self.media_list.set_file_status(position, STATUS.stopped)
+        self.tb_tasks.item(position, COLUMNS.PROGRESS).setText(
+            self.tr('Error!'))
+        # Update the list duration and partial time for total progress bar
+        self.timer.reset_progress_times()
+        self.media_list_duration = self.media_list.duration
+
+    def _abort_conversion_jobs(self):
+        """Kill the running conversion jobs and delete their output."""
+        self._stop_progress_timer()
+        for job in self.conversion_lib.abort_converter():
+            remove_file(job.output_path)
+            self.timer.finish_operation(job_id=job.job_id, op_time=0.0)
+            self.tb_tasks.item(job.job_id, COLUMNS.PROGRESS).setText(
+                self.tr('To Convert'))
+
+    def _selected_job(self):
+        """Return the job of the selected file, or the first running job."""
+        running_jobs = self.conversion_lib.running_jobs
+        row = self.tb_tasks.currentIndex().row()
+        if row in running_jobs:
+            return row
+
+        return running_jobs[0]
+
     def stop_file_encoding(self):
         """Stop file encoding process and continue with the list."""
+        if not self.conversion_lib.running_jobs:
+            return
+
+        job_id = self._selected_job()
         # Terminate the file encoding
-        self.conversion_lib.stop_converter()
+        self.conversion_lib.stop_converter(job_id=job_id)
         # Set _MediaFile.status attribute
-        self.media_list.running_file_status = STATUS.stopped
+        self.media_list.set_file_status(job_id, STATUS.stopped)
         # Delete the file when conversion is stopped by the user
-        self.media_list.delete_running_file_output(
-            output_dir=self.le_output.text(),
-            tagged_output=self.chb_tag.checkState())
+        remove_file(self.conversion_lib.get_job(job_id).output_path)
         # Update the list duration and partial time for total progress bar
         self.timer.reset_progress_times()
         self.media_list_duration = self.media_list.duration
 
     def stop_all_files_encoding(self):
         """Stop the conversion process for all the files in list."""
-        # Delete the file when conversion is stopped by the user
+        # Delete the files when conversion is stopped by the user
         self.conversion_lib.stop_converter()
-        self.media_list.delete_running_file_output(
-            output_dir=self.le_output.text(),
-            tagged_output=self.chb_tag.checkState())
-        for media_file in self.media_list:
+        self._stop_streams_prober()
+        for job_id in self.conversion_lib.running_jobs:
+            remove_file(self.conversion_lib.get_job(job_id).output_path)
+        for position in range(self.media_list.length):
             # Set _MediaFile.status attribute
-            if media_file.status != STATUS.done:
-                media_file.status = STATUS.stopped
-                self.media_list.position = self.media_list.index(media_file)
+            if self.media_list.get_file_status(position) != STATUS.done:
+                self.media_list.set_file_status(position, STATUS.stopped)
                 self.tb_tasks.item(
-                    self.media_list.position,
+                    position,
                     COLUMNS.PROGRESS).setText(self.tr('Stopped!'))
 
         # Update the list duration and partial time for total progress bar
         self.timer.reset_progress_times()
         self.media_list_duration = self.media_list.duration
 
-    def _finish_file_encoding(self):
-        """Finish the file encoding process."""
-        if self.media_list.running_file_status != STATUS.stopped:
-            file_name = self.media_list.running_file_name(with_extension=True)
+        # No job will finish to end the encoding process
+        if self._waiting_streams and not self.conversion_lib.running_jobs:
+            self._start_conversion_jobs()
+
+    def _finish_file_encoding(self, job_id):
+        """Finish a file encoding job."""
+        shown_job = job_id == self._progress_job
+        # Close and remove the conversion job
+        job = self.conversion_lib.remove_job(job_id)
+        media_file = self.media_list.get_file(job_id)
+        if media_file.status != STATUS.stopped:
+            file_name = media_file.get_name(with_extension=True)
             self.notify(file_name)
-            # Close and kill the converterprocess
-            self.conversion_lib.close_converter()
             # Check if the process finished OK
-            if (self.conversion_lib.converter_exit_status() ==
-                    QProcess.NormalExit):
+            if job.converter_exit_status() == QProcess.NormalExit:
                 # When finished a file conversion...
-                self.tb_tasks.item(self.media_list.position,
+                self.tb_tasks.item(job_id,
                                    COLUMNS.PROGRESS).setText(self.tr('Done!'))
-                self.media_list.running_file_status = STATUS.done
-                self.pb_progress.setProperty("value", 0)
+                self.media_list.set_file_status(job_id, STATUS.done)
+                self.timer.finish_operation(job_id=job_id,
+                                            op_time=media_file.duration)
                 if self.chb_delete.checkState():
-                    self.media_list.delete_running_file_input()
+                    media_file.delete_input()
+            else:
+                self.timer.finish_operation(job_id=job_id)
         else:
             # If the process was stopped
-            if not self.conversion_lib.converter_is_running:
-                self.tb_tasks.item(
-                    self.media_list.position,
-                    COLUMNS.PROGRESS).setText(self.tr('Stopped!'))
-        # Attempt to end the conversion process
-        self._end_encoding_process()
+            self.tb_tasks.item(
+                job_id,
+                COLUMNS.PROGRESS).setText(self.tr('Stopped!'))
+            self.timer.finish_operation(job_id=job_id, op_time=0.0)
+
+        if shown_job:
+            self.pb_progress.setProperty("value", 0)
+        # Refill the free job slot, or end the conversion process
+        self._start_conversion_jobs()
 
     def _end_encoding_process(self):
         """End up the encoding process."""
-        # Test if encoding process is finished
-        if self.media_list.is_exhausted:
-
-            if self.conversion_lib.error is not None:
-                self._show_message_box(
-                    type_=QMessageBox.Critical,
-                    title='Error!',
-                    msg=self.tr('The Conversion Library has '
-                                'Failed with Error:') + ' ' +
-                    self.conversion_lib.error)
-                self.conversion_lib.error = None
-            elif not self.media_list.all_stopped:
-                if self.chb_shutdown.checkState():
-                    self.shutdown_machine()
-                    return
-                self._show_message_box(
-                    type_=QMessageBox.Information,
-                    title=self.tr('Information!'),
-                    msg=self.tr('Encoding Process Successfully Finished!'))
-            else:
-                self._show_message_box(
-                    type_=QMessageBox.Information,
-                    title=self.tr('Information!'),
-                    msg=self.tr('Encoding Process Stopped by the User!'))
-
-            self._set_window_title()
-            self.statusBar().showMessage(self.tr('Ready'))
-            self._reset_options_check_boxes()
-            # Reset all progress related variables
-            self._reset_progress_bars()
-            self.timer.reset_progress_times()
-            self.media_list_duration = self.media_list.duration
-            self.timer.process_start_time = 0.0
-            # Reset the position
-            self.media_list.position = None
-            # Update tool buttons
-            self._update_ui_when_problem()
+        if self.conversion_lib.errors:
+            errors = '\n'.join(
+                '{0}: {1}'.format(
+                    self.media_list.get_file_name(position=job_id,
+                                                  with_extension=True),
+                    error) for
+                job_id, error in self.conversion_lib.errors.items())
+            self._show_message_box(
+                type_=QMessageBox.Critical,
+                title='Error!',
+                msg=self.tr('The Conversion Library has '
+                            'Failed with Error:') + '\n' + errors)
+            self.conversion_lib.errors.clear()
+        elif not self.media_list.all_stopped:
+            if self.chb_shutdown.checkState():
+                self.shutdown_machine()
+                return
+            self._show_message_box(
+                type_=QMessageBox.Information,
+                title=self.tr('Information!'),
+                msg=self.tr('Encoding Process Successfully Finished!'))
         else:
-            self.start_encoding()
+            self._show_message_box(
+                type_=QMessageBox.Information,
+                title=self.tr('Information!'),
+                msg=self.tr('Encoding Process Stopped by the User!'))
+
+        self._stop_progress_timer()
+        self._set_window_title()
+        self.statusBar().showMessage(self.tr('Ready'))
+        self._reset_options_check_boxes()
+        # Reset all progress related variables
+        self._reset_progress_bars()
+        self.timer.reset_progress_times()
+        self.media_list_duration = self.media_list.duration
+        self.timer.process_start_time = 0.0
+        # Reset the position
+        self.media_list.position = None
+        # Update tool buttons
+        self._update_ui_when_problem()
 
     def _set_window_title(self):
         """Set window title."""
@@ -1254,80 +1547,102 @@ class VideoMorphMW(QMainWindow):
         self.pb_progress.setProperty("value", 0)
         self.pb_total_progress.setProperty("value", 0)
 
-    def _ready_read(self):
-        """Is called when the conversion process emit a new output."""
-        self.reader.update_read(
-            process_output=self.conversion_lib.read_converter_output())
-
-        self._update_conversion_progress()
-
-    def _update_conversion_progress(self):
-        """Read the encoding output from the converter stdout."""
-        # Initialize the process time
-        if not self.timer.process_start_time:
-            self.timer.init_process_start_time()
-
-        # Initialize the operation time
-        if not self.timer.operation_start_time:
-            self.timer.init_operation_start_time()
+    def _ready_read(self, job_id):
+        """Is called when a conversion job emit a new output."""
+        reader = self.conversion_lib.get_job(job_id).reader
+        # Progress and log are read from separate channels
+        updated = reader.update_read(
+            process_output=self.conversion_lib.read_converter_output(job_id))
+        reader.update_log(
+            process_log=self.conversion_lib.read_converter_log(job_id))
 
-        # Return if no time read
-        if not self.reader.has_time_read:
+        if not reader.has_time_read:
             # Catch the library errors only before time_read
-            self.conversion_lib.catch_errors()
+            self.conversion_lib.catch_errors(job_id)
+        elif updated:
+            # Show the progress on the next progress timer timeout
+            self._updated_jobs.add(job_id)
+
+    def _stop_progress_timer(self):
+        """Stop showing the conversion progress."""
+        self._progress_timer.stop()
+        self._updated_jobs.clear()
+
+    @property
+    def _progress_job(self):
+        """Return the job shown in the operation progress bar."""
+        running_jobs = self.conversion_lib.running_jobs
+        return running_jobs[0] if running_jobs else None
+
+    def _show_conversion_progress(self):
+        """Show the latest progress of the updated conversion jobs."""
+        running_jobs = self.conversion_lib.running_jobs
+        updated_jobs = [job_id for job_id in self._updated_jobs if
+                        job_id in running_jobs]
+        self._updated_jobs.clear()
+        if not updated_jobs:
             return
 
-        self.timer.update_time(op_time_read_sec=self.reader.time)
-
         self.timer.update_cum_times()
 
-        file_duration = float(self.media_list.running_file_info('duration'))
+        for job_id in updated_jobs:
+            self._update_conversion_progress(job_id)
 
-        operation_progress = self.timer.operation_progress(
-            file_duration=file_duration)
+        self.pb_total_progress.setProperty(
+            "value",
+            self.timer.process_progress(
+                list_duration=self.media_list_duration))
+
+    def _update_conversion_progress(self, job_id):
+        """Show the progress of a conversion job."""
+        job = self.conversion_lib.get_job(job_id)
 
-        process_progress = self.timer.process_progress(
-            list_duration=self.media_list_duration)
+        self.timer.update_time(op_time_read_sec=job.reader.time, job_id=job_id)
+
+        operation_progress = self.timer.operation_progress(
+            file_duration=job.duration, job_id=job_id)
 
-        self._update_progress(op_progress=operation_progress,
-                              pr_progress=process_progress)
+        self._update_progress(job_id=job_id, op_progress=operation_progress)
 
-        self._update_status_bar()
+        # Only the first running job is shown in the status bar and title
+        if job_id == self._progress_job:
+            self._update_status_bar(job_id=job_id,
+                                    file_duration=job.duration)
 
-        self._update_main_window_title(op_progress=operation_progress)
+            self._update_main_window_title(job_id=job_id,
+                                           op_progress=operation_progress)
 
-    def _update_progress(self, op_progress, pr_progress):
+    def _update_progress(self, job_id, op_progress):
         """Update operation progress in tasks list & operation progress bar."""
         # Update operation progress bar
-        self.pb_progress.setProperty("value", op_progress)
+        if job_id == self._progress_job:
+            self.pb_progress.setProperty("value", op_progress)
         # Update operation progress in tasks list
-        self.tb_tasks.item(self.media_list.position, 3).setText(
+        self.tb_tasks.item(job_id, COLUMNS.PROGRESS).setText(
             str(op_progress) + "%")
-        self.pb_total_progress.setProperty("value", pr_progress)
 
-    def _update_main_window_title(self, op_progress):
+    def _update_main_window_title(self, job_id, op_progress):
         """Update the main window title."""
-        running_file_name = self.media_list.running_file_name(
-            with_extension=True)
+        running_file_name = self.media_list.get_file_name(
+            position=job_id, with_extension=True)
 
         self.setWindowTitle(str(op_progress) + '%' + '-' +
                             '[' + running_file_name + ']' +
                             ' - ' + APP_NAME + ' ' + VERSION)
 
-    def _update_status_bar(self):
+    def _update_status_bar(self, job_id, file_duration):
         """Update the status bar while converting."""
-        file_duration = float(self.media_list.running_file_info('duration'))
-
         self.statusBar().showMessage(
             self.tr('Converting: {m}\t\t\t '
                     'At: {br}\t\t\t '
                     'Operation Remaining Time: {ort}\t\t\t '
                     'Total Elapsed Time: {tet}').format(
-                        m=self.media_list.running_file_name(
-                            with_extension=True),
-                        br=self.reader.bitrate,
+                        m=self.media_list.get_file_name(
+                            position=job_id, with_extension=True),
+                        br=self.conversion_lib.get_job(
+                            job_id).reader.bitrate or 'N/A',
                         ort=self.timer.operation_remaining_time(
-                            file_duration=file_duration),
+                            file_duration=file_duration, job_id=job_id),
                         tet=write_time(self.timer.process_cum_time)))
 
     def _update_media_files_status(self):
@@ -1380,8 +1695,8 @@ class VideoMorphMW(QMainWindow):
 
     def _set_media_status(self):
         """Update media files state of conversion."""
-        for media_file in self.media_list:
-            media_file.status = STATUS.todo
+        for position in range(self.media_list.length):
+            self.media_list.set_file_status(position, STATUS.todo)
         self.media_list.position = None
 
     def _on_modify_conversion_option(self):
@@ -1457,6 +1772,22 @@ class VideoMorphMW(QMainWindow):
                         play_output=False,
                         info=False)
 
+    def _update_ui_when_loading(self, loading):
+        """User cannot perform any action while the startup finishes."""
+        self.central_widget.setEnabled(not loading)
+        for action in (self.open_media_file_action,
+                       self.open_media_dir_action,
+                       self.add_profile_action,
+                       self.export_profile_action,
+                       self.import_profile_action,
+                       self.restore_profile_action):
+            action.setEnabled(not loading)
+
+        if loading:
+            self.statusBar().showMessage(self.tr('Loading...'))
+        else:
+            self.statusBar().showMessage(self.tr('Ready'))
+
     def update_ui_when_ready(self):
         """Update UI when app is ready to start conversion."""
         self._update_ui(stop=False,
@@ -1467,7 +1798,7 @@ class VideoMorphMW(QMainWindow):
                         info=False)
 
     def _update_ui_when_playing(self, row):
-        if self.conversion_lib.converter_is_running:
+        if self.is_converting:
             self._update_ui_when_converter_running()
         elif self.media_list.get_file_status(row) == STATUS.todo:
             self.update_ui_when_ready()
@@ -1500,17 +1831,8 @@ class VideoMorphMW(QMainWindow):
                         play_output=False,
                         info=False)
 
-    def _update_ui_when_error_on_conversion(self):
-        self.timer.reset_progress_times()
-        self.media_list_duration = self.media_list.duration
-        self.media_list.position = None
-        self._reset_progress_bars()
-        self._set_window_title()
-        self._reset_options_check_boxes()
-        self.update_ui_when_ready()
-
     def _enable_context_menu_action(self):
-        if not self.conversion_lib.converter_is_running:
+        if not self.is_converting:
             self.remove_media_file_action.setEnabled(True)
 
         self.play_input_media_file_action.setEnabled(True)
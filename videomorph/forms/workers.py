@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# File name: workers.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module provides background workers for VideoMorph."""
+
+import asyncio
+import sys
+
+from PyQt5.QtCore import QThread
+from PyQt5.QtCore import pyqtSignal
+
+from videomorph.converter.capabilities import LibraryCapabilities
+from videomorph.converter.conversionlib import ConversionLib
+from videomorph.converter.probecache import ProbeCache
+from videomorph.converter.profile import ConversionProfile
+from videomorph.converter.utils import mark_stage
+
+
+class MediaProber(QThread):
+    """Thread to probe video files out of the GUI thread.
+
+    The probed files are not added to the MediaList here. They are sent
+    through the file_probed signal to be added from the GUI thread.
+    """
+
+    file_probed = pyqtSignal(object)
+
+    def __init__(self, media_list, files_paths, parent=None):
+        """Class initializer."""
+        super(MediaProber, self).__init__(parent)
+        self._media_list = media_list
+        self._files_paths = files_paths
+
+    def run(self):
+        """Probe the video files."""
+        for media_file in self._media_list.probe_files(self._files_paths):
+            if self.isInterruptionRequested():
+                break
+            self.file_probed.emit(media_file)
+
+
+class StreamsProber(QThread):
+    """Thread to probe the streams info of the files to convert.
+
+    The conversion commands need it, so it's probed here instead of on
+    the GUI thread when the jobs start. The files are sent through the
+    file_probed signal as soon as their streams info is ready.
+    """
+
+    file_probed = pyqtSignal(object)
+
+    def __init__(self, media_list, media_files, parent=None):
+        """Class initializer."""
+        super(StreamsProber, self).__init__(parent)
+        self._media_list = media_list
+        self.media_files = media_files
+
+    def run(self):
+        """Probe the streams info of the video files."""
+        for media_file in self._media_list.probe_streams(self.media_files):
+            if self.isInterruptionRequested():
+                break
+            self.file_probed.emit(media_file)
+
+
+class StartupLoader(QThread):
+    """Thread to finish the app startup out of the GUI thread.
+
+    It detects the conversion library and loads the conversion profiles,
+    so the main window can be shown before. The loaded objects are sent
+    through the loaded signal.
+    """
+
+    # conversion_lib, profile, probe_cache
+    loaded = pyqtSignal(object, object, object)
+
+    def __init__(self, stage_timer=None, parent=None):
+        """Class initializer."""
+        super(StartupLoader, self).__init__(parent)
+        self._stage_timer = stage_timer
+
+    def run(self):
+        """Load the conversion library and profiles."""
+        conversion_lib = ConversionLib()
+        mark_stage(self._stage_timer, 'conversion library detected')
+        profile = ConversionProfile(
+            prober=conversion_lib.prober_path,
+            capabilities=LibraryCapabilities(
+                library_path=conversion_lib.library_path))
+        # Build the profiles index and read the library capabilities now,
+        # the quality combo box needs them
+        profile.get_unsupported_qualities()
+        mark_stage(self._stage_timer, 'conversion profiles loaded')
+        probe_cache = ProbeCache()
+        mark_stage(self._stage_timer, 'probe cache opened')
+        self.loaded.emit(conversion_lib, profile, probe_cache)
+
+
+class ConversionWorker(QThread):
+    """Thread running a ConversionEngine event loop for the GUI.
+
+    The progress and end of the jobs are sent through Qt signals. Jobs
+    commands are built in this thread.
+    """
+
+    # job_id, time (seconds), bitrate
+    job_progress = pyqtSignal(object, float, object)
+    # job_id, return code, error
+    job_finished = pyqtSignal(object, object, object)
+
+    def __init__(self, engine, parent=None):
+        """Class initializer."""
+        super(ConversionWorker, self).__init__(parent)
+        self.engine = engine
+        self._loop = asyncio.new_event_loop()
+        self._jobs = {}
+        if sys.platform != 'win32' and sys.version_info < (3, 8):
+            # Before Python 3.8, the subprocesses of an event loop running
+            # out of the main thread need a child watcher attached from it
+            watcher = asyncio.SafeChildWatcher()
+            watcher.attach_loop(self._loop)
+            asyncio.set_child_watcher(watcher)
+
+    def run(self):
+        """Run the engine event loop."""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, build_cmd, job_id, encoder=None, output_path=None):
+        """Submit a conversion job to the engine."""
+        self._loop.call_soon_threadsafe(self._submit, build_cmd, job_id,
+                                        encoder, output_path)
+
+    def cancel(self, job_id=None):
+        """Cancel a conversion job, or all of them if job_id is None."""
+        self._loop.call_soon_threadsafe(self._cancel, job_id)
+
+    def stop(self):
+        """Kill the conversion jobs and stop the event loop."""
+        self._loop.call_soon_threadsafe(self._stop)
+
+    def _submit(self, build_cmd, job_id, encoder, output_path):
+        """Submit a job from the event loop thread."""
+        job = self.engine.submit(build_cmd=build_cmd,
+                                 job_id=job_id,
+                                 encoder=encoder,
+                                 output_path=output_path)
+        self._jobs[job_id] = job
+        asyncio.ensure_future(self._watch_job(job))
+
+    async def _watch_job(self, job):
+        """Emit the signals for a job progress and end."""
+        async for progress in job:
+            self.job_progress.emit(job.job_id, progress.time,
+                                   progress.bitrate)
+        await job.wait()
+        self._jobs.pop(job.job_id, None)
+        self.job_finished.emit(job.job_id, job.returncode, job.error)
+
+    def _cancel(self, job_id):
+        """Cancel jobs from the event loop thread."""
+        if job_id is None:
+            self.engine.cancel_all()
+        elif job_id in self._jobs:
+            self._jobs[job_id].cancel()
+
+    def _stop(self):
+        """Stop the event loop once the killed jobs are done."""
+        self.engine.kill_all()
+        asyncio.ensure_future(self.engine.join()).add_done_callback(
+            lambda future: self._loop.stop())
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# File name: gui.py
+#
+#   VideoMorph - A PyQt5 frontend to ffmpeg.
+#   Copyright 2016-2018 VideoMorph Development Team
+
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+
+#       http://www.apache.org/licenses/LICENSE-2.0
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""This module runs the VideoMorph GUI."""
+
+import sys
+from functools import partial
+from os.path import exists
+from os.path import join as join_path
+
+from PyQt5.QtCore import QLibraryInfo
+from PyQt5.QtCore import QResource
+from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QTranslator
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtWidgets import qApp
+
+from .converter import BASE_DIR
+from .converter import LOCALE
+from .converter import SYS_PATHS
+from .converter import VM_PATHS
+from .converter.console import run_on_console
+from .converter.utils import StageTimer
+from .forms.videomorph import VideoMorphMW
+
+
+def run_gui():
+    """Create the app and run it."""
+    # Time the startup stages if asked for
+    stage_timer = StageTimer() if '--startup-timing' in sys.argv else None
+
+    # Create the app
+    app = QApplication(sys.argv)
+
+    # Setup app translator
+    app_translator = QTranslator()
+
+    if exists(join_path(BASE_DIR, VM_PATHS.i18n)):
+        app_translator.load(join_path(
+            BASE_DIR, VM_PATHS.i18n, 'videomorph_{0}'.format(LOCALE)))
+    else:
+        app_translator.load(join_path(
+            SYS_PATHS.i18n, 'videomorph_{0}'.format(LOCALE)))
+
+    app.installTranslator(app_translator)
+    qt_translator = QTranslator()
+    qt_translator.load("qt_" + LOCALE,
+                       QLibraryInfo.location(QLibraryInfo.TranslationsPath))
+    app.installTranslator(qt_translator)
+
+    # Register the app resources (icons). Qt maps the file into memory,
+    # instead of loading them from a Python module
+    if not register_resources():
+        print('App resources file not found, the icons will be missing',
+              file=sys.stderr)
+
+    if stage_timer is not None:
+        stage_timer.mark('application created')
+
+    # Run the app
+    run_app(app=app, stage_timer=stage_timer)
+
+
+def register_resources():
+    """Register the app resources file, return False if it fails.
+
+    The file is looked for in the source or frozen app directory first,
+    and then where the app is installed.
+    """
+    for resources_dir in (join_path(BASE_DIR, VM_PATHS.resources),
+                          SYS_PATHS.resources):
+        if QResource.registerResource(join_path(resources_dir,
+                                                'videomorph.rcc')):
+            return True
+
+    return False
+
+
+def run_app(app, stage_timer=None):
+    """Run the app.
+
+    The main window is shown first, the conversion library and profiles
+    are loaded after it.
+    """
+    # Create the Main Window
+    main_win = VideoMorphMW(stage_timer=stage_timer)
+    main_win.startup_finished.connect(partial(finish_startup, main_win,
+                                              stage_timer))
+    main_win.show()
+    if stage_timer is not None:
+        stage_timer.mark('main window shown')
+        QTimer.singleShot(0, partial(stage_timer.mark, 'event loop started'))
+    sys.exit(app.exec_())
+
+
+def finish_startup(main_win, stage_timer=None):
+    """Check for conversion library and run."""
+    if stage_timer is not None:
+        print('Startup timing:', stage_timer.report(), sep='\n',
+              file=sys.stderr)
+
+    if main_win.conversion_lib.library_path:
+        if len(sys.argv) > 1:  # If it is running from console
+            run_on_console(main_win)
+    else:
+        msg_box = QMessageBox(
+            QMessageBox.Critical,
+            main_win.tr('Error!'),
+            main_win.no_library_msg,
+            QMessageBox.NoButton, main_win)
+        msg_box.addButton("&Ok", QMessageBox.AcceptRole)
+        if msg_box.exec_() == QMessageBox.AcceptRole:
+            qApp.closeAllWindows()